@@ -0,0 +1,185 @@
+"""
+Rerun and Generation Benchmarks for AI Code Generator
+Use (from the "My App" folder):
+    python benchmarks/bench_app.py --runs 30 -o bench_results.json
+    python benchmarks/bench_app.py --compare bench_results.json   # against an older run
+
+Drives main.py through Streamlit's AppTest harness with the offline stub
+backend, so no API key or network is needed. Reports p50/p95 rerun time per
+page, a full generate cycle, and the bytes of UI deltas each run emits.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+# Timed generate cycles must reach the model: no template warm-up calls in
+# the background and no answers reused from similarly worded earlier prompts
+os.environ["CODEGEN_WARMUP"] = "0"
+os.environ["CODEGEN_SIMILAR"] = "0"
+
+import streamlit
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1 import local_script_runner
+
+from codegen import backends, cache
+
+MAIN_SCRIPT = os.path.join(APP_DIR, "main.py")
+PAGES = ["Home", "About", "Careers", "Contact", "Login", "Analytics"]
+
+# Bytes of ForwardMsgs produced by the most recent run (see _capture_deltas)
+_last_run = {'bytes': 0, 'messages': 0}
+
+
+def _capture_deltas():
+    """Record the size of every message AppTest parses into its element tree"""
+    parse_tree = local_script_runner.parse_tree_from_messages
+
+    def measured(messages):
+        _last_run['bytes'] = sum(msg.ByteSize() for msg in messages)
+        _last_run['messages'] = len(messages)
+        return parse_tree(messages)
+
+    local_script_runner.parse_tree_from_messages = measured
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize(times, delta_bytes, messages):
+    """Collapse raw timings (seconds) into the reported statistics"""
+    return {
+        'runs': len(times),
+        'p50_ms': round(percentile(times, 50) * 1000, 3),
+        'p95_ms': round(percentile(times, 95) * 1000, 3),
+        'mean_ms': round(sum(times) / len(times) * 1000, 3),
+        'delta_bytes': delta_bytes,
+        'messages': messages
+    }
+
+
+def new_app(timeout):
+    at = AppTest.from_file(MAIN_SCRIPT, default_timeout=timeout)
+    at.secrets["GOOGLE_API_KEY"] = "benchmark-offline-key"
+    return at
+
+
+def bench_page(page, runs, warmup, timeout):
+    """Time reruns of main.py with the given page selected"""
+    at = new_app(timeout)
+    at.session_state["current_page"] = page
+    for _ in range(warmup):
+        at.run()
+
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - start)
+        if at.exception:
+            raise RuntimeError(f"{page} page raised: {at.exception[0].message}")
+    return summarize(times, _last_run['bytes'], _last_run['messages'])
+
+
+def bench_generate(runs, warmup, timeout):
+    """Time the full cycle: type a requirement, click Generate, render the result"""
+    at = new_app(timeout)
+    at.run()
+    times = []
+    for i in range(warmup + runs):
+        # A fresh requirement each time so the response cache never answers
+        at.text_area[0].input(f"Write a function that sorts list number {i} in place")
+        button = next(b for b in at.button if b.label == "🚀 Generate Code")
+        start = time.perf_counter()
+        button.click().run()
+        elapsed = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(f"Generate cycle raised: {at.exception[0].message}")
+        if i >= warmup:
+            times.append(elapsed)
+    return summarize(times, _last_run['bytes'], _last_run['messages'])
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=APP_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline):
+    """Print the change of every p50/p95/bytes figure against an older report"""
+    print(f"\nCompared with commit {baseline.get('commit')} ({baseline.get('timestamp')}):")
+    for name, stats in current['results'].items():
+        old = baseline.get('results', {}).get(name)
+        if not old:
+            continue
+        changes = []
+        for metric in ("p50_ms", "p95_ms", "delta_bytes"):
+            if old.get(metric):
+                changes.append(f"{metric} {(stats[metric] - old[metric]) / old[metric]:+.1%}")
+        print(f"  {name:<10} " + ", ".join(changes))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark main.py reruns and generation")
+    parser.add_argument("--runs", type=int, default=30, help="measured runs per scenario (default: 30)")
+    parser.add_argument("--warmup", type=int, default=3, help="unmeasured runs first (default: 3)")
+    parser.add_argument("--latency", type=float, default=0.0, help="stub model latency in seconds")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds allowed per run")
+    parser.add_argument("-o", "--output", default="bench_results.json", help="results file")
+    parser.add_argument("--compare", help="older results file to compare against")
+    args = parser.parse_args(argv)
+
+    # Read the baseline first: it may be the file this run overwrites
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    backends.set_backend(backends.StubBackend(latency=args.latency))
+    _capture_deltas()
+
+    results = {}
+    for page in PAGES:
+        results[page] = bench_page(page, args.runs, args.warmup, args.timeout)
+        print(f"{page:<10} p50 {results[page]['p50_ms']:8.2f} ms  p95 {results[page]['p95_ms']:8.2f} ms  "
+              f"{results[page]['delta_bytes']:>8} bytes")
+
+    cache.get_cache().clear()
+    results['Generate'] = bench_generate(args.runs, args.warmup, args.timeout)
+    print(f"{'Generate':<10} p50 {results['Generate']['p50_ms']:8.2f} ms  "
+          f"p95 {results['Generate']['p95_ms']:8.2f} ms  {results['Generate']['delta_bytes']:>8} bytes")
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'python': platform.python_version(),
+        'streamlit': streamlit.__version__,
+        'stub_latency': args.latency,
+        'results': results
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved {args.output}")
+
+    if baseline:
+        compare(report, baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
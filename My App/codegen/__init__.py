@@ -0,0 +1,5 @@
+"""
+Generation Engine for AI Code Generator
+Non-UI helpers shared by the Streamlit app (main.py) and headless tools.
+Import in your main file: from codegen import streaming
+"""
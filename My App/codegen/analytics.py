@@ -0,0 +1,184 @@
+"""
+Usage Analytics Module for AI Code Generator
+Import in your main file: from codegen import analytics
+Use: analytics.get_analytics().record(language, code_type, model, latency)
+     snapshot = analytics.get_analytics().snapshot()
+
+Everything is a running counter updated once per generation, so reading
+the numbers costs the same whether there were ten generations or ten million.
+Recent activity lives in fixed-size, array-backed per-minute buckets.
+Cache hits count as generations but stay out of the latency figures, since
+their near-zero times would drag every percentile down.
+"""
+
+import threading
+import time
+from array import array
+from collections import Counter
+
+# Upper bounds (seconds) of the latency histogram buckets; the last is open
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, float("inf"))
+
+# Minutes of per-minute activity kept for the dashboard
+WINDOW_MINUTES = 60
+
+
+def new_session_counters():
+    """Returns empty per-session counters for st.session_state"""
+    return {
+        'generations': 0,
+        'last_language': None,
+        'languages': Counter(),
+        'code_types': Counter()
+    }
+
+
+def update_session_counters(counters, language, code_type):
+    """Counts one generation in a session's counters"""
+    counters['generations'] += 1
+    counters['last_language'] = language
+    counters['languages'][language] += 1
+    counters['code_types'][code_type] += 1
+
+
+def bucket_upper_bound(index):
+    """Returns the latency (seconds) at the top of a histogram bucket"""
+    return LATENCY_BUCKETS[index]
+
+
+class Analytics:
+    """Thread-safe, process-wide usage counters for all sessions"""
+
+    def __init__(self, window_minutes=WINDOW_MINUTES):
+        self.window = window_minutes
+        self.started = time.time()
+        self.total = 0
+        self.cached = 0
+        self.errors = 0
+        self.timed = 0
+        self.latency_sum = 0.0
+        self.languages = Counter()
+        self.code_types = Counter()
+        self.models = Counter()
+        self.latency_histogram = array("Q", [0] * len(LATENCY_BUCKETS))
+        # Ring buffers indexed by minute % window; the stamp says which minute a slot holds
+        self._minute_stamp = array("q", [-1] * window_minutes)
+        self._minute_count = array("Q", [0] * window_minutes)
+        self._minute_timed = array("Q", [0] * window_minutes)
+        self._minute_latency = array("d", [0.0] * window_minutes)
+        self._lock = threading.Lock()
+
+    def _slot(self, minute):
+        # Caller holds the lock; recycles a slot left over from an older minute.
+        # Returns None for a minute that has already scrolled out of the window.
+        index = minute % self.window
+        if self._minute_stamp[index] > minute:
+            return None
+        if self._minute_stamp[index] != minute:
+            self._minute_stamp[index] = minute
+            self._minute_count[index] = 0
+            self._minute_timed[index] = 0
+            self._minute_latency[index] = 0.0
+        return index
+
+    def record(self, language, code_type, model, latency, cached=False, now=None):
+        """
+        Count one generation
+
+        Args:
+            language: Programming language
+            code_type: Type of code generated
+            model: Model name that served it
+            latency: Seconds until the response was complete
+            cached: Whether the response cache answered it (latency is not recorded)
+            now: Timestamp (default: now)
+        """
+        latency = max(0.0, float(latency or 0.0))
+        minute = int((now or time.time()) // 60)
+        bucket = next(i for i, bound in enumerate(LATENCY_BUCKETS) if latency <= bound)
+        with self._lock:
+            self.total += 1
+            self.cached += 1 if cached else 0
+            self.languages[language] += 1
+            self.code_types[code_type] += 1
+            self.models[model] += 1
+            if not cached:
+                self.timed += 1
+                self.latency_sum += latency
+                self.latency_histogram[bucket] += 1
+            index = self._slot(minute)
+            if index is not None:
+                self._minute_count[index] += 1
+                if not cached:
+                    self._minute_timed[index] += 1
+                    self._minute_latency[index] += latency
+
+    def record_error(self):
+        """Count one failed generation"""
+        with self._lock:
+            self.errors += 1
+
+    def percentile(self, pct):
+        """Approximate latency percentile (upper bound of the matching bucket)"""
+        with self._lock:
+            histogram = list(self.latency_histogram)
+        total = sum(histogram)
+        if not total:
+            return None
+        rank = pct / 100 * total
+        seen = 0
+        for index, count in enumerate(histogram):
+            seen += count
+            if seen >= rank:
+                return bucket_upper_bound(index)
+        return bucket_upper_bound(len(histogram) - 1)
+
+    def per_minute(self, now=None):
+        """
+        Returns activity for each minute of the window, oldest first
+
+        Returns:
+            Tuple of (generations per minute, mean uncached latency per minute or None)
+        """
+        minute = int((now or time.time()) // 60)
+        counts = []
+        latencies = []
+        with self._lock:
+            for offset in range(self.window - 1, -1, -1):
+                wanted = minute - offset
+                index = wanted % self.window
+                if self._minute_stamp[index] != wanted:
+                    counts.append(0)
+                    latencies.append(None)
+                    continue
+                counts.append(self._minute_count[index])
+                timed = self._minute_timed[index]
+                latencies.append(self._minute_latency[index] / timed if timed else None)
+        return counts, latencies
+
+    def snapshot(self):
+        """Returns every aggregate the dashboard shows"""
+        with self._lock:
+            data = {
+                'total': self.total,
+                'cached': self.cached,
+                'errors': self.errors,
+                'mean_latency': self.latency_sum / self.timed if self.timed else None,
+                'languages': dict(self.languages.most_common()),
+                'code_types': dict(self.code_types.most_common()),
+                'models': dict(self.models.most_common()),
+                'uptime': time.time() - self.started
+            }
+        data['per_minute'], data['latency_per_minute'] = self.per_minute()
+        data['p50'] = self.percentile(50)
+        data['p95'] = self.percentile(95)
+        data['p99'] = self.percentile(99)
+        return data
+
+
+_analytics = Analytics()
+
+
+def get_analytics():
+    """Return the process-wide analytics counters"""
+    return _analytics
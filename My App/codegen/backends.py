@@ -0,0 +1,338 @@
+"""
+LLM Backend Module for AI Code Generator
+Import in your main file: from codegen import backends
+Use: backend = backends.get_backend(api_key)
+     text = backend.generate(prompt, model_name, generation_config)
+     for piece in backend.stream(prompt, model_name, generation_config): ...
+
+Backends:
+    gemini  - Google Gemini through the shared client registry (default)
+    stub    - deterministic local responses with configurable latency,
+              chunking and failure injection; no network or key needed
+    replay  - serves responses captured in a JSON fixture file
+    record  - calls Gemini and captures every response into the fixture file
+
+Configuration (environment variables):
+    CODEGEN_BACKEND            - gemini | stub | replay | record
+    CODEGEN_FIXTURES           - fixture file for replay/record
+                                 (default fixtures/responses.json)
+    CODEGEN_STUB_LATENCY       - stub seconds before the first chunk (default 0)
+    CODEGEN_STUB_CHUNK_DELAY   - stub seconds between chunks (default 0)
+    CODEGEN_STUB_FAILURE_RATE  - stub probability of an injected failure (default 0)
+"""
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+
+from codegen import cache
+
+
+class BackendError(Exception):
+    """Raised when a backend cannot produce a response"""
+
+
+class TransientBackendError(BackendError):
+    """A failure that is worth retrying (timeouts, overload, injected faults)"""
+
+
+def response_text(response):
+    """
+    Safely extract the text from a Gemini response or stream chunk
+
+    Args:
+        response: A response (or chunk) returned by generate_content
+
+    Returns:
+        The text of the response, or an empty string if there is none
+    """
+    try:
+        text = response.text
+    except Exception:
+        # .text raises when the candidate was blocked or has several parts
+        text = None
+
+    if not text:
+        try:
+            text = response.candidates[0].content.parts[0].text
+        except Exception:
+            text = ""
+    return text
+
+
+_usage = threading.local()
+
+
+def response_usage(response):
+    """
+    Token usage and finish reason of a Gemini response or stream chunk
+
+    Returns:
+        Dictionary with 'prompt_tokens', 'output_tokens' and 'finish_reason'
+        (None where the SDK version does not report them)
+    """
+    usage = getattr(response, "usage_metadata", None)
+    try:
+        reason = response.candidates[0].finish_reason
+        reason = getattr(reason, "name", None) or str(reason)
+    except Exception:
+        reason = None
+    return {
+        'prompt_tokens': getattr(usage, "prompt_token_count", None) or None,
+        'output_tokens': getattr(usage, "candidates_token_count", None) or None,
+        'finish_reason': reason
+    }
+
+
+def set_usage(usage):
+    """Remember the usage of this thread's latest call (read by take_usage)"""
+    _usage.info = usage
+
+
+def take_usage():
+    """Return and forget the usage recorded by this thread's latest call"""
+    info = getattr(_usage, "info", None)
+    _usage.info = None
+    return info or {}
+
+
+class Backend:
+    """Interface every backend implements"""
+
+    name = "base"
+
+    def generate(self, prompt, model_name, generation_config=None):
+        """Return the full response text for prompt"""
+        raise NotImplementedError
+
+    def stream(self, prompt, model_name, generation_config=None):
+        """Yield the response text piece by piece"""
+        yield self.generate(prompt, model_name, generation_config)
+
+    def count_tokens(self, prompt, model_name):
+        """Return the number of tokens in prompt"""
+        return (len(prompt) + 3) // 4
+
+
+class GeminiBackend(Backend):
+    """Google Gemini, using one shared model object per model and config"""
+
+    name = "gemini"
+
+    def __init__(self, api_key):
+        if not api_key:
+            raise ValueError("GOOGLE_API_KEY is required for the Gemini backend")
+        # Imported here so offline backends work without the Gemini SDK
+        from codegen import clients
+        self._clients = clients
+        clients.configure(api_key)
+
+    def generate(self, prompt, model_name, generation_config=None):
+        model = self._clients.get_model(model_name, generation_config)
+        response = model.generate_content(prompt)
+        set_usage(response_usage(response))
+        return response_text(response)
+
+    def stream(self, prompt, model_name, generation_config=None):
+        model = self._clients.get_model(model_name, generation_config)
+        for chunk in model.generate_content(prompt, stream=True):
+            # The last chunk carries the totals and the finish reason
+            set_usage(response_usage(chunk))
+            piece = response_text(chunk)
+            if piece:
+                yield piece
+
+    def count_tokens(self, prompt, model_name):
+        model = self._clients.get_model(model_name)
+        return model.count_tokens(prompt).total_tokens
+
+
+class StubBackend(Backend):
+    """
+    Deterministic offline backend for benchmarks and load tests
+
+    The same prompt always produces the same response. Failures are drawn
+    from a seeded random generator, so a run can be reproduced exactly.
+    """
+
+    name = "stub"
+
+    def __init__(self, latency=0.0, chunk_delay=0.0, chunk_size=80, response_lines=40,
+                 failure_rate=0.0, fail_after_chunks=None, seed=0, responder=None):
+        """
+        Args:
+            latency: Seconds before the first chunk (and before a blocking reply)
+            chunk_delay: Seconds between stream chunks
+            chunk_size: Characters per stream chunk
+            response_lines: Lines of code in the generated response
+            failure_rate: Probability (0-1) that a call raises TransientBackendError
+            fail_after_chunks: Break every stream after this many chunks
+            seed: Seed for the failure generator
+            responder: Optional callable(prompt, model_name) -> text
+        """
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.chunk_size = max(1, int(chunk_size))
+        self.response_lines = response_lines
+        self.failure_rate = failure_rate
+        self.fail_after_chunks = fail_after_chunks
+        self.responder = responder
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _maybe_fail(self):
+        with self._lock:
+            self.calls += 1
+            failed = self.failure_rate and self._random.random() < self.failure_rate
+        if failed:
+            raise TransientBackendError("Injected stub failure")
+
+    def respond(self, prompt, model_name):
+        """Return the deterministic response for prompt"""
+        if self.responder:
+            return self.responder(prompt, model_name)
+        digest = hashlib.sha256(f"{model_name}\n{prompt}".encode("utf-8")).hexdigest()
+        lines = [f"# Stub response {digest[:12]} from {model_name}", "def solution(data):"]
+        for i in range(self.response_lines):
+            lines.append(f"    step_{i} = data  # {digest[i % 48:i % 48 + 16]}")
+        lines.append("    return data")
+        return "\n".join(lines) + "\n"
+
+    def generate(self, prompt, model_name, generation_config=None):
+        time.sleep(self.latency)
+        self._maybe_fail()
+        return self.respond(prompt, model_name)
+
+    def stream(self, prompt, model_name, generation_config=None):
+        time.sleep(self.latency)
+        self._maybe_fail()
+        text = self.respond(prompt, model_name)
+        for index, start in enumerate(range(0, len(text), self.chunk_size)):
+            if self.fail_after_chunks is not None and index >= self.fail_after_chunks:
+                raise TransientBackendError("Injected stub failure mid-stream")
+            if index and self.chunk_delay:
+                time.sleep(self.chunk_delay)
+            yield text[start:start + self.chunk_size]
+
+
+class ReplayBackend(Backend):
+    """
+    Serves responses captured in a fixture file; records them when given a source
+
+    The fixture is a JSON object keyed by cache.make_key(prompt, model, config).
+    With `source` set, misses are sent to that backend and written back to the
+    fixture, which is how fixtures are captured from real traffic.
+    """
+
+    def __init__(self, fixture_path, source=None):
+        self.fixture_path = fixture_path
+        self.source = source
+        self.name = "record" if source else "replay"
+        self._lock = threading.Lock()
+        self._fixtures = {}
+        if os.path.exists(fixture_path):
+            with open(fixture_path, encoding="utf-8") as f:
+                self._fixtures = json.load(f)
+
+    def _lookup(self, prompt, model_name, generation_config):
+        key = cache.make_key(prompt, model_name, generation_config)
+        with self._lock:
+            entry = self._fixtures.get(key)
+        return key, entry
+
+    def _record(self, key, prompt, model_name, chunks):
+        entry = {'model': model_name, 'prompt': prompt[:200], 'chunks': chunks}
+        with self._lock:
+            self._fixtures[key] = entry
+            directory = os.path.dirname(self.fixture_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = self.fixture_path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self._fixtures, f, indent=1, ensure_ascii=False)
+            os.replace(temp_path, self.fixture_path)
+        return entry
+
+    def _missing(self, model_name, prompt):
+        return BackendError(f"No recorded response for {model_name}: {prompt[:60]!r}")
+
+    def generate(self, prompt, model_name, generation_config=None):
+        key, entry = self._lookup(prompt, model_name, generation_config)
+        if entry is None:
+            if self.source is None:
+                raise self._missing(model_name, prompt)
+            text = self.source.generate(prompt, model_name, generation_config)
+            entry = self._record(key, prompt, model_name, [text])
+        return "".join(entry['chunks'])
+
+    def stream(self, prompt, model_name, generation_config=None):
+        key, entry = self._lookup(prompt, model_name, generation_config)
+        if entry is None:
+            if self.source is None:
+                raise self._missing(model_name, prompt)
+            chunks = []
+            for piece in self.source.stream(prompt, model_name, generation_config):
+                chunks.append(piece)
+                yield piece
+            self._record(key, prompt, model_name, chunks)
+            return
+        yield from entry['chunks']
+
+    def count_tokens(self, prompt, model_name):
+        if self.source is not None:
+            return self.source.count_tokens(prompt, model_name)
+        return super().count_tokens(prompt, model_name)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def create_backend(kind, api_key=None):
+    """
+    Build a backend from its name and the environment
+
+    Args:
+        kind: 'gemini', 'stub', 'replay' or 'record'
+        api_key: Google AI Studio API key (gemini and record only)
+
+    Returns:
+        A Backend instance
+    """
+    fixtures = os.environ.get("CODEGEN_FIXTURES", os.path.join("fixtures", "responses.json"))
+    if kind == "stub":
+        return StubBackend(
+            latency=float(os.environ.get("CODEGEN_STUB_LATENCY", 0)),
+            chunk_delay=float(os.environ.get("CODEGEN_STUB_CHUNK_DELAY", 0)),
+            failure_rate=float(os.environ.get("CODEGEN_STUB_FAILURE_RATE", 0))
+        )
+    if kind == "replay":
+        return ReplayBackend(fixtures)
+    if kind == "record":
+        return ReplayBackend(fixtures, source=GeminiBackend(api_key))
+    if kind == "gemini":
+        return GeminiBackend(api_key)
+    raise ValueError(f"Unknown backend: {kind}")
+
+
+def get_backend(api_key=None):
+    """Return the process-wide backend selected by CODEGEN_BACKEND"""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = create_backend(os.environ.get("CODEGEN_BACKEND", "gemini"), api_key)
+        elif api_key and isinstance(_backend, GeminiBackend):
+            # Picks up a rotated key; a no-op when it is unchanged
+            _backend._clients.configure(api_key)
+        return _backend
+
+
+def set_backend(backend):
+    """Replace the process-wide backend (benchmarks and tests)"""
+    global _backend
+    with _backend_lock:
+        _backend = backend
@@ -0,0 +1,205 @@
+"""
+Headless Batch Generation for AI Code Generator
+Use: python -m codegen.batch prompts.jsonl -o results.jsonl --workers 4 --rate 2
+
+Each input line is a JSON object with a "prompt" and optional "id" and
+"settings" (same keys as sidebar.create_sidebar(); top-level setting keys
+are accepted too). Results are appended to the output file as they finish,
+and a rerun with the same output file skips ids that already succeeded.
+
+The API key is read from GOOGLE_API_KEY or .streamlit/secrets.toml.
+Set CODEGEN_BACKEND=stub (or replay) to run offline; see codegen.backends.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from codegen import backends, cache, extract, prompts, ratelimit, streaming
+
+
+def load_api_key(secrets_path=".streamlit/secrets.toml"):
+    """Returns the API key from the environment or the Streamlit secrets file"""
+    api_key = os.environ.get("GOOGLE_API_KEY")
+    if api_key:
+        return api_key
+    try:
+        import tomllib
+        with open(secrets_path, "rb") as f:
+            return tomllib.load(f).get("GOOGLE_API_KEY")
+    except (ImportError, OSError, ValueError):
+        return None
+
+
+def read_jobs(path):
+    """
+    Read batch jobs from a JSONL file
+
+    Args:
+        path: Input file, one JSON object per line
+
+    Returns:
+        List of (job id, requirement, settings) tuples
+    """
+    jobs = []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            settings = {key: value for key, value in record.items() if key in prompts.DEFAULT_SETTINGS}
+            settings.update(record.get('settings') or {})
+            jobs.append((str(record.get('id', line_no)), record['prompt'], prompts.resolve_settings(settings)))
+    return jobs
+
+
+def completed_ids(path):
+    """Returns the ids already written successfully to an output file"""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A line cut short by an interrupted run
+                continue
+            if record.get('ok'):
+                done.add(record['id'])
+    return done
+
+
+def run_job(backend, job_id, requirement, settings, limiter=None):
+    """
+    Generate code for one job
+
+    Returns:
+        Output record (dictionary) ready to be written as JSON
+    """
+    record = {'id': job_id, 'prompt': requirement, 'ok': False}
+    start = time.perf_counter()
+    try:
+        built = prompts.build_prompt(requirement, settings)
+        model_name = settings['model_version']
+        record['model'] = model_name
+        record['prompt_tokens'] = built['prompt_tokens']
+
+        response_cache = cache.get_cache()
+        cache_key = cache.make_key(built['text'], model_name, built['generation_config'])
+        code = response_cache.get(cache_key)
+        record['cached'] = code is not None
+
+        if code is None:
+            if limiter:
+                limiter.acquire()
+            code = streaming.generate(backend, built['text'], model_name, built['generation_config'])['text']
+            if code:
+                response_cache.set(cache_key, code)
+
+        record['output_tokens'] = prompts.estimate_tokens(code)
+        if code:
+            code = extract.split_output(extract.extract(code), settings['language'])['code']
+        record['code'] = code
+        record['ok'] = bool(code)
+        if not code:
+            record['error'] = "No code was returned"
+    except Exception as e:
+        record['error'] = f"{type(e).__name__}: {e}"
+    record['latency'] = round(time.perf_counter() - start, 3)
+    return record
+
+
+def run_batch(backend, jobs, output_path, workers=4, rate=None):
+    """
+    Run jobs on a bounded worker pool, appending results to output_path
+
+    Args:
+        backend: Backend that answers the prompts
+        jobs: List of (job id, requirement, settings) tuples
+        output_path: JSONL file to append results to
+        workers: Maximum concurrent requests
+        rate: Maximum requests per second (None for unlimited)
+
+    Returns:
+        Summary dictionary with counts and throughput
+    """
+    limiter = ratelimit.TokenBucket(rate, capacity=workers) if rate else None
+    summary = {'total': len(jobs), 'ok': 0, 'failed': 0, 'cached': 0, 'tokens': 0}
+    write_lock = threading.Lock()
+    start = time.perf_counter()
+
+    with open(output_path, "a", encoding="utf-8") as out, ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+
+        def record_done(future):
+            record = future.result()
+            with write_lock:
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+            summary['ok' if record['ok'] else 'failed'] += 1
+            summary['cached'] += 1 if record.get('cached') else 0
+            summary['tokens'] += record.get('prompt_tokens', 0) + record.get('output_tokens', 0)
+
+        # Keep at most 2x workers jobs queued so huge inputs stay bounded in memory
+        for job in jobs:
+            pending.add(pool.submit(run_job, backend, *job, limiter=limiter))
+            if len(pending) >= workers * 2:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    record_done(future)
+        for future in pending:
+            record_done(future)
+
+    elapsed = time.perf_counter() - start
+    summary['seconds'] = elapsed
+    summary['requests_per_sec'] = summary['total'] / elapsed if elapsed else 0.0
+    summary['tokens_per_sec'] = summary['tokens'] / elapsed if elapsed else 0.0
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m codegen.batch",
+        description="Generate code for every prompt in a JSONL file"
+    )
+    parser.add_argument("input", help="JSONL file with one {\"prompt\": ...} object per line")
+    parser.add_argument("-o", "--output", help="JSONL results file (default: <input>.out.jsonl)")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="concurrent requests (default: 4)")
+    parser.add_argument("-r", "--rate", type=float, default=None, help="max requests per second")
+    parser.add_argument("--no-resume", action="store_true", help="regenerate ids already in the output file")
+    args = parser.parse_args(argv)
+
+    output_path = args.output or os.path.splitext(args.input)[0] + ".out.jsonl"
+    try:
+        backend = backends.get_backend(load_api_key())
+    except ValueError as e:
+        parser.error(str(e))
+
+    jobs = read_jobs(args.input)
+    if not args.no_resume:
+        done = completed_ids(output_path)
+        skipped = sum(1 for job in jobs if job[0] in done)
+        jobs = [job for job in jobs if job[0] not in done]
+        if skipped:
+            print(f"Resuming: {skipped} already completed in {output_path}")
+
+    summary = run_batch(backend, jobs, output_path, workers=max(1, args.workers), rate=args.rate)
+    print(
+        f"Done: {summary['ok']} ok, {summary['failed']} failed, {summary['cached']} from cache "
+        f"in {summary['seconds']:.1f}s"
+    )
+    print(
+        f"Throughput: {summary['requests_per_sec']:.2f} requests/sec, "
+        f"{summary['tokens_per_sec']:.1f} tokens/sec"
+    )
+    return 0 if summary['failed'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
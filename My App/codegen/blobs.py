@@ -0,0 +1,161 @@
+"""
+Blob Store Module for AI Code Generator
+Import in your main file: from codegen import blobs
+Use: blob_id = blobs.get_store().put(code, session=session_id)
+     code = blobs.get_store().get(blob_id)   # None once evicted
+
+Process-wide, content-addressed storage for generated code and analyses.
+Bodies are zlib-compressed and keyed by SHA-256, so identical output from
+many sessions is held once; session state keeps only the ids.
+
+Budgets (environment variables, bytes of compressed data):
+    CODEGEN_BLOB_BUDGET          - whole process (default 64 MB)
+    CODEGEN_SESSION_BLOB_BUDGET  - per session (default 4 MB)
+Past a budget, the least recently used blobs (or session references) go first;
+blobs left without any session when one is released are freed at once.
+"""
+
+import hashlib
+import os
+import threading
+import zlib
+from collections import OrderedDict
+
+COMPRESSION_LEVEL = 6
+
+
+class BlobStore:
+    """Thread-safe, compressed, content-addressed store with byte budgets"""
+
+    def __init__(self, global_budget=64 * 1024 * 1024, session_budget=4 * 1024 * 1024):
+        self.global_budget = global_budget
+        self.session_budget = session_budget
+        self.evictions = 0
+        self._blobs = OrderedDict()   # blob id -> (compressed bytes, raw size)
+        self._sessions = {}           # session -> OrderedDict(blob id -> compressed size)
+        self._session_bytes = {}      # session -> sum of its OrderedDict's sizes
+        self._owners = {}             # blob id -> set of sessions referencing it
+        self._stored_bytes = 0
+        self._lock = threading.Lock()
+
+    def put(self, text, session=None):
+        """
+        Store text and return its id; storing the same text again is free
+
+        Args:
+            text: Content to store
+            session: Session that references it (counts against its budget)
+
+        Returns:
+            Hex SHA-256 of the content
+        """
+        raw = text.encode("utf-8")
+        blob_id = hashlib.sha256(raw).hexdigest()
+        with self._lock:
+            if blob_id in self._blobs:
+                self._blobs.move_to_end(blob_id)
+            else:
+                body = zlib.compress(raw, COMPRESSION_LEVEL)
+                self._blobs[blob_id] = (body, len(raw))
+                self._owners[blob_id] = set()
+                self._stored_bytes += len(body)
+            if session is not None:
+                self._reference(session, blob_id)
+            self._enforce_global_budget()
+        return blob_id
+
+    def get(self, blob_id, session=None):
+        """Return the text for blob_id, or None if it was evicted"""
+        with self._lock:
+            entry = self._blobs.get(blob_id)
+            if entry is None:
+                return None
+            self._blobs.move_to_end(blob_id)
+            if session is not None:
+                self._reference(session, blob_id)
+        return zlib.decompress(entry[0]).decode("utf-8")
+
+    def release_session(self, session):
+        """Drop every reference held by a session, and the blobs no one else holds"""
+        with self._lock:
+            self._session_bytes.pop(session, None)
+            for blob_id in self._sessions.pop(session, {}):
+                owners = self._owners.get(blob_id)
+                if owners is not None:
+                    owners.discard(session)
+                    if not owners:
+                        self._drop(blob_id)
+
+    def stats(self):
+        """
+        Report memory use and what sharing plus compression saved
+
+        Returns:
+            Dictionary with blob count, stored (compressed) bytes, the bytes
+            sessions would hold as plain per-session copies, and the saving
+        """
+        with self._lock:
+            referenced = sum(
+                self._blobs[blob_id][1] * max(1, len(owners))
+                for blob_id, owners in self._owners.items()
+            )
+            return {
+                'blobs': len(self._blobs),
+                'sessions': len(self._sessions),
+                'stored_bytes': self._stored_bytes,
+                'referenced_bytes': referenced,
+                'saved_bytes': max(0, referenced - self._stored_bytes),
+                'evictions': self.evictions
+            }
+
+    def _reference(self, session, blob_id):
+        # Caller holds the lock
+        refs = self._sessions.setdefault(session, OrderedDict())
+        if blob_id in refs:
+            refs.move_to_end(blob_id)
+        else:
+            refs[blob_id] = len(self._blobs[blob_id][0])
+            self._session_bytes[session] = self._session_bytes.get(session, 0) + refs[blob_id]
+        self._owners[blob_id].add(session)
+        # Over the session budget: forget that session's oldest references
+        while self._session_bytes[session] > self.session_budget and len(refs) > 1:
+            old_id, size = refs.popitem(last=False)
+            self._session_bytes[session] -= size
+            owners = self._owners.get(old_id)
+            if owners is not None:
+                owners.discard(session)
+                if not owners:
+                    self._drop(old_id)
+
+    def _enforce_global_budget(self):
+        # Caller holds the lock; least recently used blobs go first
+        while self._stored_bytes > self.global_budget and len(self._blobs) > 1:
+            blob_id = next(iter(self._blobs))
+            for session in self._owners.get(blob_id, ()):
+                size = self._sessions.get(session, {}).pop(blob_id, None)
+                if size is not None:
+                    self._session_bytes[session] -= size
+            self._drop(blob_id)
+
+    def _drop(self, blob_id):
+        # Caller holds the lock
+        body, _ = self._blobs.pop(blob_id)
+        self._owners.pop(blob_id, None)
+        self._stored_bytes -= len(body)
+        self.evictions += 1
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return the process-wide blob store, creating it from the environment on first use"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = BlobStore(
+                global_budget=int(os.environ.get("CODEGEN_BLOB_BUDGET", 64 * 1024 * 1024)),
+                session_budget=int(os.environ.get("CODEGEN_SESSION_BLOB_BUDGET", 4 * 1024 * 1024))
+            )
+        return _store
@@ -0,0 +1,170 @@
+"""
+Response Cache Module for AI Code Generator
+Import in your main file: from codegen import cache
+Use: key = cache.make_key(full_prompt, model_name, generation_config)
+     text = cache.get_cache().get(key)
+
+Two tiers: a bounded in-process LRU shared by every Streamlit session,
+and an optional SQLite file that survives restarts. Both honour a TTL.
+Expired answers are skipped, not dropped: they stay until the LRU evicts
+them or a new answer replaces them, so get(key, allow_stale=True) can still
+serve one when every model call fails.
+
+Configuration (environment variables):
+    CODEGEN_CACHE_SIZE  - max entries kept in memory (default 256)
+    CODEGEN_CACHE_TTL   - seconds an answer stays valid (default 86400)
+    CODEGEN_CACHE_DB    - path of the SQLite file (disk tier off if unset)
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_prompt(prompt):
+    """Collapse insignificant whitespace so trivially different prompts share a key"""
+    lines = [re.sub(r"[ \t]+", " ", line).strip() for line in prompt.strip().splitlines()]
+    return "\n".join(lines)
+
+
+def make_key(prompt, model_name, generation_config=None):
+    """
+    Build the cache key for a request
+
+    Args:
+        prompt: The full prompt sent to the model
+        model_name: Name of the model that answers it
+        generation_config: Dictionary of generation parameters (optional)
+
+    Returns:
+        Hex SHA-256 digest identifying the request
+    """
+    payload = json.dumps(
+        {
+            'prompt': normalize_prompt(prompt),
+            'model': model_name,
+            'config': generation_config or {}
+        },
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of model answers with an optional SQLite tier"""
+
+    def __init__(self, max_entries=256, ttl=86400, db_path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+
+        if db_path:
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, text TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def get(self, key, allow_stale=False, counted=True):
+        """
+        Return the cached text for key, or None on a miss
+
+        Args:
+            key: Key from make_key()
+            allow_stale: Also return entries older than the TTL (last-resort answers)
+            counted: Count the lookup in the hit rate (off for fallbacks and warm-up)
+        """
+        now = time.time()
+        ttl = float("inf") if allow_stale else self.ttl
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                text, created = entry
+                if now - created <= ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1 if counted else 0
+                    return text
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT text, created FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row and now - row[1] <= ttl:
+                    self._remember(key, row[0], row[1])
+                    self.hits += 1 if counted else 0
+                    return row[0]
+
+            self.misses += 1 if counted else 0
+            return None
+
+    def set(self, key, text):
+        """Store text under key in every enabled tier"""
+        created = time.time()
+        with self._lock:
+            self._remember(key, text, created)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, text, created) VALUES (?, ?, ?)",
+                    (key, text, created)
+                )
+                self._db.commit()
+
+    def clear(self):
+        """Drop every cached answer and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def stats(self):
+        """Return hit/miss counters and the current in-memory size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'persistent': self._db is not None
+            }
+
+    def _remember(self, key, text, created):
+        # Caller holds the lock
+        self._entries[key] = (text, created)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Return the process-wide cache, creating it from the environment on first use"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(
+                max_entries=int(os.environ.get("CODEGEN_CACHE_SIZE", 256)),
+                ttl=float(os.environ.get("CODEGEN_CACHE_TTL", 86400)),
+                db_path=os.environ.get("CODEGEN_CACHE_DB") or None
+            )
+        return _cache
@@ -0,0 +1,64 @@
+"""
+Gemini Client Registry for AI Code Generator
+Import in your main file: from codegen import clients
+Use: clients.configure(api_key)
+     model = clients.get_model(settings['model_version'], generation_config)
+
+The API is configured once per process and one GenerativeModel is kept per
+(model name, generation config), so Streamlit reruns and button clicks
+reuse the same objects and the same underlying transport channel.
+"""
+
+import json
+import threading
+
+import google.generativeai as genai
+
+_lock = threading.Lock()
+_api_key = None
+_models = {}
+
+
+def configure(api_key):
+    """
+    Configure the Gemini API for this process
+
+    Calling it again with the same key is a no-op, so it is safe to call on
+    every rerun. A different key rebuilds the transport and drops cached models.
+
+    Args:
+        api_key: Google AI Studio API key
+    """
+    global _api_key
+    with _lock:
+        if api_key == _api_key:
+            return
+        genai.configure(api_key=api_key)
+        _api_key = api_key
+        _models.clear()
+
+
+def get_model(model_name, generation_config=None):
+    """
+    Return the shared model object for a model name and generation config
+
+    Args:
+        model_name: Gemini model name, e.g. "gemini-1.5-flash"
+        generation_config: Dictionary of generation parameters (optional)
+
+    Returns:
+        A configured genai.GenerativeModel
+    """
+    key = (model_name, json.dumps(generation_config or {}, sort_keys=True))
+    with _lock:
+        model = _models.get(key)
+        if model is None:
+            model = genai.GenerativeModel(model_name, generation_config=generation_config)
+            _models[key] = model
+        return model
+
+
+def loaded_models():
+    """Return the (model name, config) pairs currently held by the registry"""
+    with _lock:
+        return list(_models)
@@ -0,0 +1,314 @@
+"""
+Export Module for AI Code Generator
+Import in your main file: from codegen import exporters
+Use: artifact = exporters.get_artifact(result, code, "ZIP with Tests", extension="py")
+     st.download_button(data=artifact['data'], file_name=artifact['file_name'], mime=artifact['mime'])
+
+Builds the sidebar's export formats into in-memory buffers:
+    Single File        - the code as-is
+    Markdown Document  - prompt, fenced code and any stored analyses
+    ZIP with Tests     - code, a tests/ folder and optional README, zipped entry by entry
+    Jupyter Notebook   - nbformat 4 JSON built cell by cell
+    GitHub Gist Format - the JSON body of a Gist API create request
+Multi-file project results (codegen.project) export every file at its path.
+
+Artifacts are cached by (code id, result identity, format, options), so a
+rerun never rebuilds one; callers build them only when a download is asked for.
+"""
+
+import ast
+import hashlib
+import io
+import json
+import re
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+
+from codegen import results
+
+FORMATS = ["Single File", "Markdown Document", "ZIP with Tests", "Jupyter Notebook", "GitHub Gist Format"]
+
+# Total bytes of built artifacts kept in memory
+MAX_CACHE_BYTES = 32 * 1024 * 1024
+
+_artifacts = OrderedDict()
+_artifacts_bytes = 0
+_artifacts_lock = threading.Lock()
+
+
+# ========== HELPERS ==========
+
+def fence(code, language=""):
+    """Wraps code in a Markdown fence longer than any backtick run inside it"""
+    longest = max((len(run) for run in re.findall(r"`+", code)), default=0)
+    marker = "`" * max(3, longest + 1)
+    return f"{marker}{language}\n{code.rstrip()}\n{marker}"
+
+
+def title_of(prompt, limit=60):
+    """Short one-line title from the user's requirement"""
+    text = (prompt or "").strip()
+    line = text.splitlines()[0] if text else "Generated code"
+    return line if len(line) <= limit else line[:limit - 3].rstrip() + "..."
+
+
+def project_files(result, code, extension):
+    """(path, code) pairs to export: the project's files, or one code file"""
+    return results.get_files(result) or [(f"code.{extension}", code)]
+
+
+def readme(result, files):
+    """README.md text for an exported result"""
+    settings = result['settings']
+    created = time.strftime("%Y-%m-%d %H:%M", time.localtime(result['created']))
+    return "\n".join([
+        f"# {title_of(result['prompt'])}",
+        "",
+        f"{settings.get('code_type', 'Code')} in {settings.get('language', 'an unknown language')}, "
+        f"generated with AI Code Generator on {created}.",
+        "",
+        "## Requirement",
+        "",
+        (result['prompt'] or "").strip(),
+        "",
+        "## Files",
+        ""
+    ] + [f"- `{path}`" for path, _ in files] + [""])
+
+
+def module_name(path):
+    """Python import name of a .py path ('pkg/util.py' -> 'pkg.util')"""
+    return path[:-3].replace("/", ".")
+
+
+def python_tests(code, path):
+    """Pytest smoke tests for the top-level functions and classes of Python code"""
+    try:
+        tree = ast.parse(code)
+        names = [
+            node.name for node in tree.body
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+            and not node.name.startswith("_")
+        ]
+    except SyntaxError:
+        names = []
+
+    # Loaded from its file under a name of its own: a top-level code.py or json.py
+    # imported by name would resolve to the standard library module instead
+    module = module_name(path)
+    if "." not in module:
+        module = f"exported_{module}"
+    lines = [
+        "import importlib.util",
+        "import os",
+        "import sys",
+        "",
+        "ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)",
+        "sys.path.insert(0, ROOT)",
+        "",
+        "",
+        "def load_module():",
+        f"    spec = importlib.util.spec_from_file_location({module!r}, os.path.join(ROOT, {path!r}))",
+        "    module = importlib.util.module_from_spec(spec)",
+        "    spec.loader.exec_module(module)",
+        "    return module",
+        "",
+        "",
+        "def test_module_imports():",
+        "    load_module()",
+    ]
+    for name in names:
+        lines += [
+            "",
+            "",
+            f"def test_{name.lower()}_is_defined():",
+            f"    assert callable(getattr(load_module(), {name!r}))",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def notebook_cells(code, language):
+    """Split code into notebook cells (Python: one per top-level statement group)"""
+    if language != "python":
+        return [code]
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return [code]
+
+    lines = code.splitlines()
+    starts = []
+    for node in tree.body:
+        # Imports and simple statements stay with whatever precedes them
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)) or not starts:
+            first = min([node.lineno] + [d.lineno for d in getattr(node, 'decorator_list', [])])
+            starts.append(first - 1)
+    if not starts:
+        return [code]
+    starts[0] = 0
+    bounds = starts + [len(lines)]
+    cells = ["\n".join(lines[a:b]).strip("\n") for a, b in zip(bounds, bounds[1:])]
+    return [cell for cell in cells if cell.strip()] or [code]
+
+
+def _source(text):
+    """nbformat keeps cell source as a list of lines"""
+    return text.splitlines(keepends=True)
+
+
+# ========== BUILDERS ==========
+
+def build_single(result, code, extension, include_readme):
+    """The code as a single file (a project's files in their combined view)"""
+    return {'data': code.encode("utf-8"), 'file_name': f"code.{extension}", 'mime': "text/plain"}
+
+
+def build_markdown(result, code, extension, include_readme):
+    """Markdown document with fenced code and stored analyses"""
+    language = result['settings'].get('language', "").lower()
+    files = project_files(result, code, extension)
+    parts = [readme(result, files) if include_readme else f"# {title_of(result['prompt'])}\n"]
+    for path, text in files:
+        parts += [f"## {path}" if len(files) > 1 else "## Code", "", fence(text, language), ""]
+    for kind, heading in (('explain', "Explanation"), ('review', "Review"), ('improve', "Improved Version")):
+        text = results.get_analysis(result, kind)
+        if text:
+            parts += [f"## {heading}", "", fence(text, language) if kind == 'improve' else text.strip(), ""]
+    return {'data': "\n".join(parts).encode("utf-8"), 'file_name': "code.md", 'mime': "text/markdown"}
+
+
+def build_zip(result, code, extension, include_readme):
+    """ZIP archive of the code, a tests/ folder and optional README"""
+    language = result['settings'].get('language', "")
+    files = project_files(result, code, extension)
+    has_tests = any(path.startswith("tests/") or "/test_" in f"/{path}" for path, _ in files)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for path, text in files:
+            with archive.open(f"project/{path}", "w") as entry:
+                entry.write(text.encode("utf-8"))
+        if language == "Python" and not has_tests:
+            for path, text in files:
+                if path.endswith(".py"):
+                    test_name = "test_" + module_name(path).replace(".", "_") + ".py"
+                    with archive.open(f"project/tests/{test_name}", "w") as entry:
+                        entry.write(python_tests(text, path).encode("utf-8"))
+        elif not has_tests:
+            with archive.open("project/tests/README.md", "w") as entry:
+                entry.write(f"# Tests\n\nAdd {language or 'project'} tests for this project here.\n".encode("utf-8"))
+        if include_readme:
+            with archive.open("project/README.md", "w") as entry:
+                entry.write(readme(result, files).encode("utf-8"))
+    return {'data': buffer.getvalue(), 'file_name': "project.zip", 'mime': "application/zip"}
+
+
+def build_notebook(result, code, extension, include_readme):
+    """Jupyter notebook (nbformat 4) with a title cell and code cells"""
+    language = result['settings'].get('language', "Python").lower()
+    files = project_files(result, code, extension)
+    title = readme(result, files) if include_readme else f"# {title_of(result['prompt'])}"
+    cells = [{'cell_type': "markdown", 'metadata': {}, 'source': _source(title)}]
+    for path, text in files:
+        if len(files) > 1:
+            cells.append({'cell_type': "markdown", 'metadata': {}, 'source': _source(f"## {path}")})
+        for cell in notebook_cells(text, language):
+            cells.append({
+                'cell_type': "code",
+                'execution_count': None,
+                'metadata': {},
+                'outputs': [],
+                'source': _source(cell)
+            })
+
+    metadata = {'language_info': {'name': language, 'file_extension': f".{extension}"}}
+    if language == "python":
+        metadata['kernelspec'] = {'display_name': "Python 3", 'language': "python", 'name': "python3"}
+    notebook = {'cells': cells, 'metadata': metadata, 'nbformat': 4, 'nbformat_minor': 4}
+    return {
+        'data': json.dumps(notebook, indent=1).encode("utf-8"),
+        'file_name': "code.ipynb",
+        'mime': "application/x-ipynb+json"
+    }
+
+
+def build_gist(result, code, extension, include_readme):
+    """Gist API request body with the code and optional README (gists have no folders)"""
+    files = project_files(result, code, extension)
+    gist_files = {path.replace("/", "__"): {'content': text} for path, text in files}
+    if include_readme:
+        gist_files["README.md"] = {'content': readme(result, files)}
+    gist = {'description': title_of(result['prompt']), 'public': False, 'files': gist_files}
+    return {'data': json.dumps(gist, indent=2).encode("utf-8"), 'file_name': "gist.json", 'mime': "application/json"}
+
+
+BUILDERS = {
+    "Single File": build_single,
+    "Markdown Document": build_markdown,
+    "ZIP with Tests": build_zip,
+    "Jupyter Notebook": build_notebook,
+    "GitHub Gist Format": build_gist
+}
+
+
+# ========== CACHE ==========
+
+def result_identity(result):
+    """Hash of everything besides the code that builders write (prompt, date, settings, files)"""
+    described = json.dumps(
+        [result['prompt'], result['created'], result['settings'], result.get('files') or []],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(described.encode("utf-8")).hexdigest()
+
+
+def artifact_key(result, export_format, extension, include_readme):
+    """Cache key: same code, result, format and options give the same artifact"""
+    analyses = tuple(sorted(result['analyses'].items())) if export_format == "Markdown Document" else ()
+    return (result['code_id'], result_identity(result), export_format, extension, bool(include_readme), analyses)
+
+
+def peek(result, export_format, extension, include_readme=False):
+    """Returns an already built artifact, or None (never builds)"""
+    key = artifact_key(result, export_format, extension, include_readme)
+    with _artifacts_lock:
+        artifact = _artifacts.get(key)
+        if artifact is not None:
+            _artifacts.move_to_end(key)
+        return artifact
+
+
+def get_artifact(result, code, export_format, extension, include_readme=False):
+    """
+    Build (or reuse) the export of a result
+
+    Args:
+        result: Stored result dictionary (codegen.results)
+        code: The result's code
+        export_format: One of FORMATS
+        extension: File extension for the code file
+        include_readme: Add a README where the format allows it
+
+    Returns:
+        Dictionary with 'data' (bytes), 'file_name' and 'mime'
+    """
+    global _artifacts_bytes
+    if export_format not in BUILDERS:
+        raise ValueError(f"Unknown export format: {export_format}")
+
+    artifact = peek(result, export_format, extension, include_readme)
+    if artifact is not None:
+        return artifact
+
+    artifact = BUILDERS[export_format](result, code, extension, include_readme)
+    key = artifact_key(result, export_format, extension, include_readme)
+    with _artifacts_lock:
+        if key not in _artifacts:
+            _artifacts[key] = artifact
+            _artifacts_bytes += len(artifact['data'])
+            while _artifacts_bytes > MAX_CACHE_BYTES and len(_artifacts) > 1:
+                _, old = _artifacts.popitem(last=False)
+                _artifacts_bytes -= len(old['data'])
+    return artifact
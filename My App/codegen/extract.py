@@ -0,0 +1,195 @@
+"""
+Code Extraction Module for AI Code Generator
+Import in your main file: from codegen import extract
+Use: extractor = extract.FenceExtractor()
+     extractor.update(accumulated_text)       # while streaming (only the new part is read)
+     parts = extract.split_output(extractor.finish(), "Python")
+
+Models wrap code in Markdown fences, add prose around it and sometimes
+return several blocks (code, tests, a usage example, a shell command).
+FenceExtractor splits output into typed segments in a single pass: every
+character is examined once, as the chunk holding it arrives, so streaming a
+multi-megabyte answer stays linear.
+"""
+
+import io
+
+# Sidebar language -> fence info strings that mean the same language
+LANGUAGE_TAGS = {
+    "Python": {"python", "py", "python3"},
+    "JavaScript": {"javascript", "js", "jsx", "node", "mjs"},
+    "Java": {"java"},
+    "C++": {"cpp", "c++", "cc", "cxx", "hpp"},
+    "C#": {"csharp", "cs", "c#"},
+    "Go": {"go", "golang"},
+    "Ruby": {"ruby", "rb"},
+    "PHP": {"php"},
+    "Swift": {"swift"},
+    "Kotlin": {"kotlin", "kt"},
+    "TypeScript": {"typescript", "ts", "tsx"},
+    "Rust": {"rust", "rs"},
+    "SQL": {"sql", "sqlite", "postgresql", "postgres", "mysql", "plsql", "tsql"},
+    "HTML": {"html", "htm", "xhtml"},
+    "CSS": {"css"}
+}
+
+
+def _segment(kind, language=None):
+    return {'kind': kind, 'language': language, 'buffer': io.StringIO()}
+
+
+class FenceExtractor:
+    """Incremental splitter of model output into prose and code segments"""
+
+    def __init__(self):
+        self.segments = []
+        self.consumed = 0
+        self._pending = []
+        self._fence = None  # (character, length) of the open fence
+        self._current = _segment('prose')
+
+    def feed(self, chunk):
+        """Consume the next piece of output"""
+        self.consumed += len(chunk)
+        start = 0
+        newline = chunk.find("\n")
+        while newline >= 0:
+            if self._pending:
+                self._pending.append(chunk[start:newline + 1])
+                line = "".join(self._pending)
+                self._pending = []
+            else:
+                line = chunk[start:newline + 1]
+            self._line(line)
+            start = newline + 1
+            newline = chunk.find("\n", start)
+        if start < len(chunk):
+            self._pending.append(chunk[start:])
+
+    def update(self, accumulated):
+        """Consume whatever accumulated text has beyond what was already fed"""
+        if len(accumulated) < self.consumed:
+            # A retry started the answer over (streaming.generate sends "" first)
+            self.__init__()
+        if len(accumulated) > self.consumed:
+            self.feed(accumulated[self.consumed:])
+
+    def has_code(self):
+        """True once a code fence has been opened"""
+        return self._current['kind'] == 'code' or any(segment['kind'] == 'code' for segment in self.segments)
+
+    def finish(self):
+        """
+        Flush the last partial line and close any open segment
+
+        Returns:
+            List of segments: dictionaries with 'kind' ('code' or 'prose'),
+            'language' (fence info, '' if untagged, None for prose) and 'text'
+        """
+        if self._pending:
+            line = "".join(self._pending)
+            self._pending = []
+            self._line(line)
+        self._close()
+        return [
+            {'kind': segment['kind'], 'language': segment['language'], 'text': segment['buffer'].getvalue()}
+            for segment in self.segments
+        ]
+
+    def current_code(self):
+        """Text of the code block being written right now ('' outside one)"""
+        if self._current['kind'] != 'code':
+            return ""
+        return self._current['buffer'].getvalue() + "".join(self._pending)
+
+    def code_so_far(self, language=None):
+        """All code received so far (matching language when given), for live display"""
+        parts = [
+            segment['buffer'].getvalue() for segment in self.segments
+            if segment['kind'] == 'code' and (language is None or matches(segment['language'], language))
+        ]
+        if self._current['kind'] == 'code' and (language is None or matches(self._current['language'], language)):
+            parts.append(self.current_code())
+        return "\n".join(part.rstrip("\n") for part in parts)
+
+    def _line(self, line):
+        fence = self._fence_of(line)
+        if self._fence is None:
+            if fence is not None:
+                character, length, info = fence
+                self._close()
+                self._fence = (character, length)
+                self._current = _segment('code', info.split()[0].lower() if info.split() else "")
+                return
+        elif fence is not None and fence[0] == self._fence[0] and fence[1] >= self._fence[1] and not fence[2]:
+            self._close()
+            self._fence = None
+            self._current = _segment('prose')
+            return
+        self._current['buffer'].write(line)
+
+    @staticmethod
+    def _fence_of(line):
+        # A fence is up to 3 spaces, then 3+ backticks or tildes, then an info string
+        stripped = line.lstrip(" ")
+        if len(line) - len(stripped) > 3 or stripped[:3] not in ("```", "~~~"):
+            return None
+        character = stripped[0]
+        length = len(stripped) - len(stripped.lstrip(character))
+        info = stripped[length:].strip()
+        if character == "`" and "`" in info:
+            return None
+        return character, length, info
+
+    def _close(self):
+        segment = self._current
+        text = segment['buffer'].getvalue()
+        if segment['kind'] == 'code' or text.strip():
+            self.segments.append(segment)
+        self._current = _segment('prose')
+
+
+def extract(text):
+    """Split a complete output into segments (see FenceExtractor.finish)"""
+    extractor = FenceExtractor()
+    extractor.feed(text)
+    return extractor.finish()
+
+
+def matches(tag, language):
+    """True when a fence tag belongs to the sidebar language ('' matches anything)"""
+    return not tag or tag in LANGUAGE_TAGS.get(language, {language.lower()})
+
+
+def split_output(segments, language):
+    """
+    Sort segments into the main code file, extra blocks and prose notes
+
+    Code blocks in the requested language (or untagged) are joined into the
+    code file; when there are none, the largest block's language is used.
+    Output without any fence is taken as code as a whole.
+
+    Args:
+        segments: Segments from extract() or FenceExtractor.finish()
+        language: Sidebar language
+
+    Returns:
+        Dictionary with 'code', 'extras' (list of (language, text)) and 'notes'
+    """
+    blocks = [segment for segment in segments if segment['kind'] == 'code']
+    if not blocks:
+        return {'code': "".join(segment['text'] for segment in segments).strip("\n") + "\n", 'extras': [], 'notes': ""}
+
+    main = [block for block in blocks if matches(block['language'], language)]
+    if not main:
+        largest = max(blocks, key=lambda block: len(block['text']))
+        main = [block for block in blocks if block['language'] == largest['language']]
+
+    return {
+        'code': "\n".join(block['text'].rstrip("\n") for block in main) + "\n",
+        'extras': [
+            (block['language'], block['text']) for block in blocks
+            if all(block is not chosen for chosen in main) and block['text'].strip()
+        ],
+        'notes': "\n".join(segment['text'].strip() for segment in segments if segment['kind'] == 'prose')
+    }
@@ -0,0 +1,117 @@
+"""
+Follow-up Actions Module for AI Code Generator
+Import in your main file: from codegen import followups
+Use: followups.prefetch(backend, model_name, code)          # fire all three
+     text = followups.get(backend, model_name, code, 'review')  # instant if prefetched
+
+Results are stored against the SHA-256 of the code, so any rerun or session
+asking about the same code gets the answer already in flight or finished.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from codegen import gateway
+
+# Follow-up kind -> prompt template
+FOLLOW_UPS = {
+    'explain': "Explain this code simply:\n\n{code}",
+    'review': "Review this code for quality, bugs, and improvements:\n\n{code}",
+    'improve': "Improve this code:\n\n{code}"
+}
+
+# Number of (code, kind) results kept before the oldest are dropped
+MAX_RESULTS = 256
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("CODEGEN_PREFETCH_WORKERS", 6)),
+    thread_name_prefix="followups"
+)
+_results = OrderedDict()
+_lock = threading.Lock()
+
+
+def code_hash(code):
+    """Return the content hash used to key follow-up results"""
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+
+def _run(backend, model_name, generation_config, code, kind):
+    # Through the shared gateway, in its own queue so users' requests interleave
+    result = gateway.get_gateway().generate(
+        backend,
+        FOLLOW_UPS[kind].format(code=code),
+        model_name,
+        generation_config,
+        session="followups"
+    )
+    return result['text']
+
+
+def _submit(backend, model_name, generation_config, code, kind):
+    # Caller holds the lock
+    key = (code_hash(code), kind)
+    future = _results.get(key)
+    if future is None:
+        future = _executor.submit(_run, backend, model_name, generation_config, code, kind)
+        _results[key] = future
+        while len(_results) > MAX_RESULTS:
+            _results.popitem(last=False)
+    else:
+        _results.move_to_end(key)
+    return future
+
+
+def prefetch(backend, model_name, code, generation_config=None, kinds=None):
+    """
+    Start every follow-up request for code concurrently
+
+    Args:
+        backend: Backend used to answer the follow-ups
+        model_name: Model to answer with
+        code: The generated code
+        generation_config: Dictionary of generation parameters (optional)
+        kinds: Follow-up kinds to fetch (default: all of FOLLOW_UPS)
+    """
+    with _lock:
+        for kind in kinds or FOLLOW_UPS:
+            _submit(backend, model_name, generation_config, code, kind)
+
+
+def get(backend, model_name, code, kind, generation_config=None, timeout=None):
+    """
+    Return a follow-up answer, waiting for it if it is still in flight
+
+    Args:
+        backend: Backend used if the follow-up was not prefetched
+        model_name: Model to answer with
+        code: The generated code
+        kind: One of FOLLOW_UPS ('explain', 'review', 'improve')
+        generation_config: Dictionary of generation parameters (optional)
+        timeout: Seconds to wait before giving up (default: no limit)
+
+    Returns:
+        The follow-up text
+    """
+    with _lock:
+        future = _submit(backend, model_name, generation_config, code, kind)
+    try:
+        return future.result(timeout=timeout)
+    except Exception:
+        # Forget failures so the next click retries instead of replaying them
+        with _lock:
+            if _results.get((code_hash(code), kind)) is future and future.done():
+                del _results[(code_hash(code), kind)]
+        raise
+
+
+def peek(code, kind):
+    """Return a finished follow-up answer without waiting, or None"""
+    with _lock:
+        future = _results.get((code_hash(code), kind))
+    if future is None or not future.done() or future.exception() is not None:
+        return None
+    return future.result()
@@ -0,0 +1,92 @@
+"""
+Request Gateway for AI Code Generator
+Import in your main file: from codegen import gateway
+Use: result = gateway.get_gateway().generate(backend, prompt, model_name, config,
+                                             session=session_id, prompt_tokens=n)
+
+One shared layer in front of the model for every session using the API key:
+identical requests already in flight are coalesced into a single call, and
+the rest wait their (round-robin) turn under the requests/minute and
+tokens/minute limits.
+
+Configuration (environment variables):
+    CODEGEN_RPM - requests per minute allowed for the key (default 60)
+    CODEGEN_TPM - tokens per minute allowed for the key (default 1000000)
+"""
+
+import os
+import threading
+
+from codegen import cache, prompts, ratelimit, streaming
+
+
+class Gateway:
+    """Single-flight plus fair rate limiting around streaming.generate()"""
+
+    def __init__(self, requests_per_minute=60, tokens_per_minute=1_000_000):
+        self.limiter = ratelimit.FairLimiter(requests_per_minute, tokens_per_minute)
+        self.flights = ratelimit.SingleFlight()
+
+    def generate(self, backend, prompt, model_name, generation_config=None, session=None,
+                 prompt_tokens=None, stream=False, on_chunk=None, coalesce=True):
+        """
+        Generate through the shared limits, sharing identical in-flight calls
+
+        Args:
+            backend: A codegen.backends.Backend
+            prompt: The full prompt to send
+            model_name: Model to answer with
+            generation_config: Dictionary of generation parameters (optional)
+            session: Caller id for fair queuing (default: one shared queue)
+            prompt_tokens: Tokens in prompt (estimated when not given)
+            stream: Stream the response (only the leading caller sees chunks)
+            on_chunk: Called with the accumulated text after every chunk
+            coalesce: Share an identical in-flight call (False for hedged duplicates)
+
+        Returns:
+            streaming.generate() result plus 'queue_wait' (seconds) and
+            'coalesced' (True when another caller's request was reused)
+        """
+        if prompt_tokens is None:
+            prompt_tokens = prompts.estimate_tokens(prompt)
+        key = cache.make_key(prompt, model_name, generation_config)
+
+        def call():
+            waited = self.limiter.acquire(session, prompt_tokens)
+            result = streaming.generate(
+                backend, prompt, model_name, generation_config, stream=stream, on_chunk=on_chunk
+            )
+            self.limiter.debit(result['output_tokens'])
+            result['queue_wait'] = waited
+            return result
+
+        if coalesce:
+            result, shared = self.flights.do(key, call)
+        else:
+            result, shared = call(), False
+        result = dict(result)
+        result['coalesced'] = shared
+        return result
+
+    def stats(self):
+        """Returns queue depth, wait times and coalescing counters"""
+        data = self.limiter.stats()
+        data['in_flight'] = self.flights.in_flight()
+        data['coalesced'] = self.flights.coalesced
+        return data
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway():
+    """Return the process-wide gateway, creating it from the environment on first use"""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = Gateway(
+                requests_per_minute=float(os.environ.get("CODEGEN_RPM", 60)),
+                tokens_per_minute=float(os.environ.get("CODEGEN_TPM", 1_000_000))
+            )
+        return _gateway
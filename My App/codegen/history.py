@@ -0,0 +1,279 @@
+"""
+Generation History Store for AI Code Generator
+Import in your main file: from codegen import history
+Use: store = history.get_store()
+     store.add(user, session, prompt, code, language, code_type)
+     items = store.page(user, offset=0, limit=5)
+
+SQLite-backed so history survives restarts. Identical code is stored once
+per user (content-hash dedupe), favorites are a flag on the row, and the
+sidebar reads one small page at a time instead of the whole history. An
+FTS5 index, updated by triggers on every write, powers store.search().
+
+Configuration (environment variables):
+    CODEGEN_HISTORY_DB - path of the SQLite file (default .codegen/history.db)
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS generations (
+    id INTEGER PRIMARY KEY,
+    user TEXT NOT NULL,
+    session TEXT NOT NULL,
+    prompt TEXT NOT NULL,
+    code TEXT NOT NULL,
+    language TEXT NOT NULL,
+    code_type TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    created REAL NOT NULL,
+    favorite INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (user, content_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_generations_user_created ON generations (user, created DESC);
+CREATE INDEX IF NOT EXISTS idx_generations_session_created ON generations (session, created DESC);
+CREATE INDEX IF NOT EXISTS idx_generations_user_language ON generations (user, language, created DESC);
+CREATE INDEX IF NOT EXISTS idx_generations_user_favorite ON generations (user, favorite, created DESC);
+"""
+
+# Full-text index over prompts, code and metadata, kept in sync by triggers
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS generations_fts USING fts5 (
+    prompt, code, language, code_type,
+    content='generations', content_rowid='id', tokenize='unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS generations_fts_insert AFTER INSERT ON generations BEGIN
+    INSERT INTO generations_fts (rowid, prompt, code, language, code_type)
+    VALUES (new.id, new.prompt, new.code, new.language, new.code_type);
+END;
+CREATE TRIGGER IF NOT EXISTS generations_fts_delete AFTER DELETE ON generations BEGIN
+    INSERT INTO generations_fts (generations_fts, rowid, prompt, code, language, code_type)
+    VALUES ('delete', old.id, old.prompt, old.code, old.language, old.code_type);
+END;
+CREATE TRIGGER IF NOT EXISTS generations_fts_update AFTER UPDATE OF prompt, code, language, code_type ON generations BEGIN
+    INSERT INTO generations_fts (generations_fts, rowid, prompt, code, language, code_type)
+    VALUES ('delete', old.id, old.prompt, old.code, old.language, old.code_type);
+    INSERT INTO generations_fts (rowid, prompt, code, language, code_type)
+    VALUES (new.id, new.prompt, new.code, new.language, new.code_type);
+END;
+"""
+
+# Search ranking weights for prompt, code, language, code_type (bm25)
+SEARCH_WEIGHTS = (4.0, 1.0, 2.0, 2.0)
+
+# Columns returned for list views; the code itself is fetched on demand
+SUMMARY_COLUMNS = "id, prompt, language, code_type, created, favorite"
+
+
+def content_hash(code):
+    """Returns the hash used to dedupe identical generations"""
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+
+def to_match_query(text):
+    """
+    Turn free text into a safe FTS5 query
+
+    Every word must match; the last one also matches as a prefix so results
+    appear while the user is still typing.
+    """
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _summary(row):
+    return {
+        'id': row[0],
+        'prompt': row[1],
+        'language': row[2],
+        'type': row[3],
+        'timestamp': datetime.fromtimestamp(row[4]).strftime("%Y-%m-%d %H:%M:%S"),
+        'favorite': bool(row[5])
+    }
+
+
+class HistoryStore:
+    """Thread-safe SQLite store of past generations"""
+
+    def __init__(self, db_path):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+        self.searchable = self._create_search_index()
+        self._db.commit()
+
+    def _create_search_index(self):
+        """Create the FTS5 index (backfilling old rows); False if FTS5 is unavailable"""
+        existed = self._db.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'generations_fts'"
+        ).fetchone()
+        try:
+            self._db.executescript(FTS_SCHEMA)
+        except sqlite3.OperationalError:
+            return False
+        if not existed:
+            self._db.execute("INSERT INTO generations_fts (generations_fts) VALUES ('rebuild')")
+        return True
+
+    def add(self, user, session, prompt, code, language, code_type):
+        """
+        Record a generation; identical code for the same user is stored once
+
+        Args:
+            user: User (or anonymous session) the history belongs to
+            session: Streamlit session that produced it
+            prompt: The user's prompt
+            code: Generated code
+            language: Programming language
+            code_type: Type of code generated
+
+        Returns:
+            Row id of the (new or existing) entry
+        """
+        digest = content_hash(code)
+        now = time.time()
+        with self._lock:
+            # A repeat moves the existing entry to the top instead of duplicating it
+            self._db.execute(
+                "INSERT INTO generations "
+                "(user, session, prompt, code, language, code_type, content_hash, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (user, content_hash) DO UPDATE SET "
+                "created = excluded.created, session = excluded.session, prompt = excluded.prompt",
+                (user, session, prompt, code, language, code_type, digest, now)
+            )
+            row = self._db.execute(
+                "SELECT id FROM generations WHERE user = ? AND content_hash = ?", (user, digest)
+            ).fetchone()
+            self._db.commit()
+        return row[0]
+
+    def count(self, user, favorites_only=False):
+        """Returns the number of stored generations for user"""
+        query = "SELECT COUNT(*) FROM generations WHERE user = ?"
+        if favorites_only:
+            query += " AND favorite = 1"
+        with self._lock:
+            return self._db.execute(query, (user,)).fetchone()[0]
+
+    def page(self, user, offset=0, limit=5, favorites_only=False):
+        """
+        Returns one page of history summaries, newest first
+
+        Args:
+            user: Whose history to read
+            offset: Number of newer entries to skip
+            limit: Page size
+            favorites_only: Only return favorites
+
+        Returns:
+            List of dictionaries without the code (see get())
+        """
+        query = f"SELECT {SUMMARY_COLUMNS} FROM generations WHERE user = ?"
+        if favorites_only:
+            query += " AND favorite = 1"
+        query += " ORDER BY created DESC LIMIT ? OFFSET ?"
+        with self._lock:
+            rows = self._db.execute(query, (user, limit, offset)).fetchall()
+        return [_summary(row) for row in rows]
+
+    def get(self, user, entry_id):
+        """Returns a full entry, including its code, or None"""
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {SUMMARY_COLUMNS}, code FROM generations WHERE user = ? AND id = ?",
+                (user, entry_id)
+            ).fetchone()
+        if row is None:
+            return None
+        item = _summary(row)
+        item['code'] = row[6]
+        return item
+
+    def search(self, user, text, limit=10):
+        """
+        Full-text search over prompts, code, language and code type
+
+        Args:
+            user: Whose history to search
+            text: Free-text query
+            limit: Maximum number of results
+
+        Returns:
+            List of summaries, best match first
+        """
+        query = to_match_query(text)
+        if query is None:
+            return []
+        with self._lock:
+            if self.searchable:
+                rows = self._db.execute(
+                    "SELECT g.id, g.prompt, g.language, g.code_type, g.created, g.favorite "
+                    "FROM generations_fts JOIN generations AS g ON g.id = generations_fts.rowid "
+                    "WHERE generations_fts MATCH ? AND g.user = ? "
+                    "ORDER BY bm25(generations_fts, ?, ?, ?, ?) LIMIT ?",
+                    (query, user, *SEARCH_WEIGHTS, limit)
+                ).fetchall()
+            else:
+                # Without FTS5: unranked substring match on the prompt, newest first
+                rows = self._db.execute(
+                    f"SELECT {SUMMARY_COLUMNS} FROM generations WHERE user = ? AND prompt LIKE ? "
+                    "ORDER BY created DESC LIMIT ?",
+                    (user, f"%{text.strip()}%", limit)
+                ).fetchall()
+        return [_summary(row) for row in rows]
+
+    def toggle_favorite(self, user, entry_id):
+        """Flips the favorite flag of an entry; returns the new state"""
+        with self._lock:
+            self._db.execute(
+                "UPDATE generations SET favorite = 1 - favorite WHERE user = ? AND id = ?",
+                (user, entry_id)
+            )
+            row = self._db.execute(
+                "SELECT favorite FROM generations WHERE user = ? AND id = ?", (user, entry_id)
+            ).fetchone()
+            self._db.commit()
+        return bool(row and row[0])
+
+    def top_languages(self, limit=3):
+        """Returns the most generated languages across all users, most used first"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT language, COUNT(*) FROM generations GROUP BY language ORDER BY COUNT(*) DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def clear(self, user):
+        """Deletes every entry belonging to user"""
+        with self._lock:
+            self._db.execute("DELETE FROM generations WHERE user = ?", (user,))
+            self._db.commit()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return the process-wide history store, opening it on first use"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = HistoryStore(os.environ.get("CODEGEN_HISTORY_DB", os.path.join(".codegen", "history.db")))
+        return _store
@@ -0,0 +1,257 @@
+"""
+Model Call Metrics Module for AI Code Generator
+Import in your main file: from codegen import metrics
+Use: metrics.get_metrics().observe(model, backend, ttft, latency, prompt_tokens,
+                                   output_tokens, finish_reason, error=None)
+     text = metrics.get_metrics().render()      # Prometheus text format
+
+Every model request (streaming.generate is the single place they pass
+through) is recorded once: time to first token, total latency, prompt/output
+tokens, model, finish reason and error class. A stream that broke and was
+retried on the blocking path counts as one request with its final outcome,
+plus one stream fallback. Histograms are fixed arrays of
+bucket counters, so recording a call is a bisect and a few increments.
+
+Exporters (environment variables; both off by default):
+    CODEGEN_METRICS_PORT       - serve /metrics on 127.0.0.1:<port> for Prometheus
+    CODEGEN_METRICS_FILE       - append one JSON line per call to this file
+    CODEGEN_METRICS_FILE_BYTES - rotate the file at this size (default 10 MB, 5 backups)
+"""
+
+import bisect
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+from array import array
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from codegen import analytics
+
+LATENCY_BUCKETS = analytics.LATENCY_BUCKETS
+TOKEN_BUCKETS = (64, 256, 1024, 2048, 4096, 8192, 16384, 32768, float("inf"))
+
+FILE_BACKUPS = 5
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """Cumulative-on-render histogram over fixed bucket upper bounds"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = array("Q", [0] * len(buckets))
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """Count one value (caller holds the registry lock)"""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _labels(names, values):
+    """Prometheus label set text for parallel names/values"""
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metrics:
+    """Thread-safe registry of model call counters and histograms"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = defaultdict(int)            # (model, backend, outcome, error) -> calls
+        self.tokens = defaultdict(int)           # (model, kind) -> tokens
+        self.finish_reasons = defaultdict(int)   # (model, reason) -> calls
+        self.fallbacks = defaultdict(int)        # model -> broken streams retried blocking
+        self.ttft = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+        self.latency = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+        self.output_tokens = defaultdict(lambda: Histogram(TOKEN_BUCKETS))
+        self._log = None
+
+    def observe(self, model, backend, ttft, latency, prompt_tokens=None, output_tokens=None,
+                finish_reason=None, error=None, streamed=False, fallback=False):
+        """
+        Record one model request (call once per request, with its final outcome)
+
+        Args:
+            model: Model name
+            backend: Backend name (gemini, stub, replay, record)
+            ttft: Seconds to the first token (None for failed calls)
+            latency: Seconds for the whole call
+            prompt_tokens: Tokens sent
+            output_tokens: Tokens received
+            finish_reason: Why the model stopped (STOP, MAX_TOKENS, SAFETY, ...)
+            error: Exception raised by the call, if it failed
+            streamed: Whether the response was streamed
+            fallback: Whether a broken stream was retried on the blocking path
+        """
+        outcome = "error" if error is not None else "ok"
+        error_class = type(error).__name__ if error is not None else ""
+        with self._lock:
+            self.calls[(model, backend, outcome, error_class)] += 1
+            self.latency[model].observe(latency)
+            if fallback:
+                self.fallbacks[model] += 1
+            if error is None:
+                self.ttft[model].observe(ttft if ttft is not None else latency)
+                self.finish_reasons[(model, finish_reason or "UNKNOWN")] += 1
+            if prompt_tokens:
+                self.tokens[(model, "prompt")] += prompt_tokens
+            if output_tokens:
+                self.tokens[(model, "output")] += output_tokens
+                self.output_tokens[model].observe(output_tokens)
+            log = self._log
+
+        if log is not None:
+            log.info(json.dumps({
+                'time': round(time.time(), 3),
+                'model': model,
+                'backend': backend,
+                'outcome': outcome,
+                'error': error_class or None,
+                'ttft': None if ttft is None else round(ttft, 4),
+                'latency': round(latency, 4),
+                'prompt_tokens': prompt_tokens,
+                'output_tokens': output_tokens,
+                'finish_reason': finish_reason,
+                'streamed': streamed,
+                'fallback': fallback
+            }))
+
+    def render(self):
+        """Returns every metric in the Prometheus text exposition format"""
+        with self._lock:
+            calls = dict(self.calls)
+            tokens = dict(self.tokens)
+            reasons = dict(self.finish_reasons)
+            fallbacks = dict(self.fallbacks)
+            histograms = [
+                ("codegen_model_ttft_seconds", "Seconds to the first token of successful model calls", self.ttft),
+                ("codegen_model_latency_seconds", "Seconds per model call, failed ones included", self.latency),
+                ("codegen_model_output_tokens", "Output tokens per model call", self.output_tokens)
+            ]
+            histograms = [
+                (name, help_text, {
+                    model: (hist.buckets, list(hist.counts), hist.sum, hist.count)
+                    for model, hist in series.items()
+                })
+                for name, help_text, series in histograms
+            ]
+
+        lines = [
+            "# HELP codegen_model_calls_total Model requests by final outcome and error class",
+            "# TYPE codegen_model_calls_total counter"
+        ]
+        for (model, backend, outcome, error), value in sorted(calls.items()):
+            labels = _labels(("model", "backend", "outcome", "error"), (model, backend, outcome, error))
+            lines.append(f"codegen_model_calls_total{labels} {value}")
+
+        lines += [
+            "# HELP codegen_model_tokens_total Tokens sent (prompt) and received (output)",
+            "# TYPE codegen_model_tokens_total counter"
+        ]
+        for (model, kind), value in sorted(tokens.items()):
+            lines.append(f"codegen_model_tokens_total{_labels(('model', 'kind'), (model, kind))} {value}")
+
+        lines += [
+            "# HELP codegen_model_finish_reasons_total Successful model calls by finish reason",
+            "# TYPE codegen_model_finish_reasons_total counter"
+        ]
+        for (model, reason), value in sorted(reasons.items()):
+            lines.append(f"codegen_model_finish_reasons_total{_labels(('model', 'reason'), (model, reason))} {value}")
+
+        lines += [
+            "# HELP codegen_model_stream_fallbacks_total Broken streams retried as one blocking call",
+            "# TYPE codegen_model_stream_fallbacks_total counter"
+        ]
+        for model, value in sorted(fallbacks.items()):
+            lines.append(f"codegen_model_stream_fallbacks_total{_labels(('model',), (model,))} {value}")
+
+        for name, help_text, series in histograms:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for model, (buckets, counts, total, count) in sorted(series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(f"{name}_bucket{_labels(('model', 'le'), (model, _number(bound)))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(('model',), (model,))} {_number(total)}")
+                lines.append(f"{name}_count{_labels(('model',), (model,))} {count}")
+        return "\n".join(lines) + "\n"
+
+    def log_to_file(self, path, max_bytes=10 * 1024 * 1024, backups=FILE_BACKUPS):
+        """Also append every call as a JSON line to path, rotating at max_bytes"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log = logging.getLogger(f"codegen.metrics.{path}")
+        log.setLevel(logging.INFO)
+        log.propagate = False
+        log.addHandler(handler)
+        with self._lock:
+            self._log = log
+
+    def serve(self, port, host="127.0.0.1"):
+        """Serve render() at http://host:port/metrics from a daemon thread"""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Scrapes every few seconds would flood the Streamlit log
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        return server
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics():
+    """Return the process-wide metrics, starting the configured exporters on first use"""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = Metrics()
+            port = os.environ.get("CODEGEN_METRICS_PORT")
+            if port:
+                try:
+                    _metrics.serve(int(port))
+                except OSError as e:
+                    # Another process (e.g. a second Streamlit worker) owns the port
+                    logging.getLogger(__name__).warning("Metrics endpoint not started: %s", e)
+            path = os.environ.get("CODEGEN_METRICS_FILE")
+            if path:
+                _metrics.log_to_file(path, int(os.environ.get("CODEGEN_METRICS_FILE_BYTES", 10 * 1024 * 1024)))
+        return _metrics
@@ -0,0 +1,241 @@
+"""
+Multi-file Project Module for AI Code Generator
+Import in your main file: from codegen import project
+Use: built = project.generate_project(call, requirement, settings, workers=4)
+     # call(prompt, generation_config, prompt_tokens) -> result dict with 'text'
+     code = project.combine(built['files'], settings['language'])
+
+"Full Program" and "Component" requests are too big for one response, so
+they are planned and fanned out:
+    1. one cheap call returns a JSON manifest of files and their interfaces
+    2. every file is generated concurrently (bounded), each prompt carrying
+       the whole manifest so the files agree on names and signatures
+Wall-clock time follows the slowest file instead of the sum, and the
+project is no longer capped by a single response's token limit.
+
+Configuration (environment variables):
+    CODEGEN_PROJECT_WORKERS - files generated at the same time (default 4)
+"""
+
+import json
+import os
+import posixpath
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from codegen import extract, prompts
+
+PROJECT_CODE_TYPES = ("Full Program", "Component")
+
+MAX_FILES = 8
+PLAN_MAX_TOKENS = 1024
+PLAN_TEMPERATURE = 0.2
+
+DEFAULT_WORKERS = int(os.environ.get("CODEGEN_PROJECT_WORKERS", 4))
+
+PLAN_TEMPLATE = """You are planning a {language} {code_type} split into files.
+
+Requirement:
+{requirement}
+
+Reply with JSON only, no prose, in this shape:
+{{"files": [{{"path": "relative/path.ext", "purpose": "one sentence", "interface": "public names and signatures other files may use"}}]}}
+
+Use at most {max_files} files. Keep the structure conventional for {language}{framework}."""
+
+FILE_TEMPLATE = """Write ONLY the file `{path}` of a multi-file project. Output the complete file contents and nothing else.
+
+Purpose of this file: {purpose}
+Interface it must provide: {interface}
+
+Project requirement:
+{requirement}
+
+All project files (use exactly these paths and interfaces when importing from other files):
+{manifest}"""
+
+# Extensions of files that hold settings or data rather than code
+CONFIG_EXTENSIONS = (".json", ".toml", ".yaml", ".yml", ".ini", ".cfg", ".env", ".txt", ".md")
+
+# Line comment markers used to label files in the combined view
+LINE_COMMENTS = {
+    "Python": "# {}",
+    "Ruby": "# {}",
+    "SQL": "-- {}",
+    "HTML": "<!-- {} -->",
+    "CSS": "/* {} */"
+}
+
+
+class ProjectPlanError(ValueError):
+    """Raised when the planner's answer is not a usable file manifest"""
+
+
+def is_project_request(settings):
+    """Returns True when settings ask for a planned multi-file project"""
+    settings = prompts.resolve_settings(settings)
+    return bool(settings.get('multi_file')) and settings['code_type'] in PROJECT_CODE_TYPES
+
+
+def plan_prompt(requirement, settings):
+    """Prompt for the planning call plus its (small) generation config"""
+    settings = prompts.resolve_settings(settings)
+    framework = f" and {settings['framework']}" if settings['framework'] != "None" else ""
+    text = PLAN_TEMPLATE.format(
+        language=settings['language'],
+        code_type=settings['code_type'].lower(),
+        requirement=requirement.strip(),
+        max_files=MAX_FILES,
+        framework=framework
+    )
+    config = {
+        "temperature": PLAN_TEMPERATURE,
+        "max_output_tokens": min(PLAN_MAX_TOKENS, int(settings['max_tokens']))
+    }
+    return text, config
+
+
+def clean_path(path):
+    """Normalize a manifest path, or return None if it escapes the project"""
+    path = posixpath.normpath(str(path).strip().replace("\\", "/"))
+    if not path or path == "." or path.startswith(("/", "../")) or path == ".." or ":" in path:
+        return None
+    return path
+
+
+def parse_manifest(text):
+    """
+    Parse the planner's answer into a list of file entries
+
+    Args:
+        text: Planner response (JSON, possibly wrapped in a code fence)
+
+    Returns:
+        List of dictionaries with 'path', 'purpose' and 'interface'
+
+    Raises:
+        ProjectPlanError: If no usable file list is found
+    """
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end < start:
+        raise ProjectPlanError("The planner did not return a JSON manifest")
+    try:
+        data = json.loads(text[start:end + 1])
+    except json.JSONDecodeError as e:
+        raise ProjectPlanError(f"The planner's manifest is not valid JSON: {e}") from None
+
+    entries = []
+    seen = set()
+    for item in data.get('files') or []:
+        if not isinstance(item, dict):
+            continue
+        path = clean_path(item.get('path', ""))
+        if path is None or path in seen:
+            continue
+        seen.add(path)
+        entries.append({
+            'path': path,
+            'purpose': str(item.get('purpose') or "").strip(),
+            'interface': str(item.get('interface') or "").strip()
+        })
+        if len(entries) == MAX_FILES:
+            break
+
+    if not entries:
+        raise ProjectPlanError("The planner's manifest lists no files")
+    return entries
+
+
+def describe_manifest(entries):
+    """Manifest as the bullet list included in every file prompt"""
+    return "\n".join(
+        f"- {entry['path']}: {entry['purpose']}" + (f" [{entry['interface']}]" if entry['interface'] else "")
+        for entry in entries
+    )
+
+
+def file_role(path):
+    """Code Type line for one file: 'Test File', 'Configuration File' or 'Source File'"""
+    name = posixpath.basename(path).lower()
+    if path.startswith("tests/") or "/tests/" in path or name.startswith("test_") \
+            or name.endswith(("_test.py", ".test.js", ".spec.js", ".test.ts", ".spec.ts")):
+        return "Test File"
+    if name.endswith(CONFIG_EXTENSIONS) or name in ("dockerfile", "makefile"):
+        return "Configuration File"
+    return "Source File"
+
+
+def file_prompt(requirement, settings, entries, entry):
+    """Full prompt (via prompts.build_prompt) for one file of the manifest"""
+    # The project's code type describes the whole plan, not this one file
+    settings = dict(prompts.resolve_settings(settings), code_type=file_role(entry['path']))
+    file_requirement = FILE_TEMPLATE.format(
+        path=entry['path'],
+        purpose=entry['purpose'] or "see the project requirement",
+        interface=entry['interface'] or "whatever the other files need from it",
+        requirement=requirement.strip(),
+        manifest=describe_manifest(entries)
+    )
+    return prompts.build_prompt(file_requirement, settings)
+
+
+def combine(files, language):
+    """Join project files into one text, each under a comment with its path"""
+    marker = LINE_COMMENTS.get(language, "// {}")
+    return "\n\n".join(
+        marker.format(f"===== {path} =====") + "\n" + code.rstrip()
+        for path, code in files.items()
+    ) + "\n"
+
+
+def generate_project(call, requirement, settings, workers=DEFAULT_WORKERS, on_file=None):
+    """
+    Plan a project and generate its files concurrently
+
+    Args:
+        call: Function(prompt, generation_config, prompt_tokens) returning a result dictionary
+        requirement: What the user asked for
+        settings: Settings dictionary from sidebar.create_sidebar()
+        workers: Files generated at the same time
+        on_file: Called as on_file(path, done, total) in the caller's thread as files finish
+
+    Returns:
+        Dictionary with 'files' (path -> code, in manifest order), 'manifest',
+        'failed' (path -> error message), 'plan_latency' and 'latency'
+
+    Raises:
+        ProjectPlanError: If the plan is unusable (callers fall back to one call)
+    """
+    start = time.perf_counter()
+    plan_text, plan_config = plan_prompt(requirement, settings)
+    plan = call(plan_text, plan_config, prompts.estimate_tokens(plan_text))
+    entries = parse_manifest(plan['text'] or "")
+    plan_latency = time.perf_counter() - start
+
+    outputs = {}
+    failed = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(entries)))) as pool:
+        futures = {}
+        for entry in entries:
+            built = file_prompt(requirement, settings, entries, entry)
+            futures[pool.submit(call, built['text'], built['generation_config'], built['prompt_tokens'])] = entry['path']
+
+        for done, future in enumerate(as_completed(futures), start=1):
+            path = futures[future]
+            try:
+                text = future.result()['text'] or ""
+                outputs[path] = extract.split_output(extract.extract(text), settings['language'])['code']
+            except Exception as e:
+                failed[path] = str(e)
+            if on_file is not None:
+                on_file(path, done, len(entries))
+
+    files = OrderedDict((entry['path'], outputs[entry['path']]) for entry in entries if entry['path'] in outputs)
+    return {
+        'files': files,
+        'manifest': entries,
+        'failed': failed,
+        'plan_latency': plan_latency,
+        'latency': time.perf_counter() - start
+    }
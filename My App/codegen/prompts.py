@@ -0,0 +1,206 @@
+"""
+Prompt Builder Module for AI Code Generator
+Import in your main file: from codegen import prompts
+Use: built = prompts.build_prompt(requirement, settings)
+     text = backend.generate(built['text'], settings['model_version'], built['generation_config'])
+
+Turns the settings returned by sidebar.create_sidebar() into the full prompt
+and generation config, and enforces the token budget before any network call.
+"""
+
+import functools
+
+# Same defaults as the sidebar widgets, used for any missing key
+DEFAULT_SETTINGS = {
+    "language": "Python",
+    "framework": "None",
+    "code_type": "Function",
+    "temperature": 0.7,
+    "max_tokens": 2048,
+    "libraries": [],
+    "include_comments": True,
+    "include_docstrings": True,
+    "include_examples": True,
+    "include_tests": False,
+    "error_handling": True,
+    "type_hints": True,
+    "optimize_code": False,
+    "logging": False,
+    "code_style": "Auto-detect",
+    "indent_style": "Spaces (4)",
+    "export_format": "Single File",
+    "include_readme": False,
+    "model_version": "gemini-2.0-flash-exp",
+    "streaming": False,
+    "prefetch_actions": False,
+    "hedge_requests": False,
+    "multi_file": True,
+    "validate_code": True,
+    "reuse_similar": False,
+    "safe_mode": True,
+    "auto_save": True
+}
+
+# Quick Templates in the sidebar -> the requirement they fill in
+TEMPLATES = {
+    "User Authentication": "Create a user authentication system with password hashing, login, and session management",
+    "Data Analysis": "Create a script to read CSV data, perform statistical analysis, and create visualizations",
+    "REST API": "Build a REST API endpoint with GET, POST, PUT, DELETE methods and error handling",
+    "File Handler": "Create a file I/O handler class that can read, write, and process different file formats",
+    "Algorithm": "Implement an efficient sorting algorithm with time complexity analysis",
+    "Database CRUD": "Create a database handler class with Create, Read, Update, Delete operations"
+}
+
+# Checkbox setting -> what to ask the model to include
+OPTION_LABELS = [
+    ("include_comments", "detailed inline comments"),
+    ("include_docstrings", "comprehensive docstrings"),
+    ("include_examples", "usage examples"),
+    ("include_tests", "unit tests"),
+    ("error_handling", "proper error handling"),
+    ("type_hints", "type hints/annotations"),
+    ("optimize_code", "performance optimizations"),
+    ("logging", "logging statements")
+]
+
+INDENT_RULES = {
+    "Spaces (4)": "Indent with 4 spaces.",
+    "Spaces (2)": "Indent with 2 spaces.",
+    "Tabs": "Indent with tabs."
+}
+
+# Rough characters-per-token ratio for Gemini on code and English
+CHARS_PER_TOKEN = 4
+
+# Requirements over this multiple of the budget are rejected instead of trimmed
+MAX_TRIM_RATIO = 2
+
+TRIM_MARKER = "\n[... requirement trimmed to fit the token budget ...]"
+
+
+class PromptTooLarge(ValueError):
+    """Raised when a prompt cannot be made to fit the token budget"""
+
+    def __init__(self, tokens, budget):
+        super().__init__(
+            f"Prompt needs about {tokens} tokens but the budget is {budget}. "
+            "Shorten the requirement or raise Max Output Length."
+        )
+        self.tokens = tokens
+        self.budget = budget
+
+
+def resolve_settings(settings=None):
+    """Return a complete settings dictionary, filling gaps from DEFAULT_SETTINGS"""
+    resolved = dict(DEFAULT_SETTINGS)
+    resolved.update(settings or {})
+    return resolved
+
+
+def estimate_tokens(text):
+    """Estimate the token count of text locally, without a network call"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def count_tokens(text, backend=None, model_name=None):
+    """
+    Count the tokens in text
+
+    Args:
+        text: Text to measure
+        backend: Optional backend; when given, its count_tokens is used
+        model_name: Model whose tokenizer the backend should use
+
+    Returns:
+        Number of tokens
+    """
+    if backend is not None:
+        try:
+            return backend.count_tokens(text, model_name)
+        except Exception:
+            pass
+    return estimate_tokens(text)
+
+
+def generation_config(settings):
+    """Return the generation config for the given settings"""
+    settings = resolve_settings(settings)
+    return {
+        "temperature": float(settings['temperature']),
+        "max_output_tokens": int(settings['max_tokens'])
+    }
+
+
+@functools.lru_cache(maxsize=128)
+def _fragments(language, code_type, framework, libraries, options, code_style, indent_style):
+    """Build the fixed text around the requirement (memoized per settings)"""
+    head = f"Generate {language} code for the following requirement:\n\n"
+
+    tail = f"\n\nCode Type: {code_type}"
+    if framework != "None":
+        tail += f"\nFramework: {framework}"
+    if libraries:
+        tail += f"\nRequired Libraries: {', '.join(libraries)}"
+    if options:
+        tail += "\n\nInclude:\n- " + "\n- ".join(options)
+    if code_style not in ["None", "Auto-detect"]:
+        tail += f"\n\nFollow {code_style} style guidelines."
+    if indent_style in INDENT_RULES:
+        tail += f"\n{INDENT_RULES[indent_style]}"
+    tail += "\n\nProvide clean, production-ready, well-documented code."
+
+    return head, tail, estimate_tokens(head) + estimate_tokens(tail)
+
+
+def build_prompt(requirement, settings=None, max_prompt_tokens=None, trim=True):
+    """
+    Build the full prompt and generation config for a requirement
+
+    The prompt budget defaults to the Max Output Length setting: a requirement
+    longer than the answer we allow would only produce a truncated response.
+
+    Args:
+        requirement: What the user asked for
+        settings: Settings dictionary from sidebar.create_sidebar()
+        max_prompt_tokens: Prompt token budget (default: settings['max_tokens'])
+        trim: Trim an oversize requirement instead of rejecting it
+
+    Returns:
+        Dictionary with the prompt text, generation_config, prompt_tokens
+        and whether the requirement was trimmed
+
+    Raises:
+        PromptTooLarge: If the prompt cannot fit the budget
+    """
+    settings = resolve_settings(settings)
+    budget = int(max_prompt_tokens or settings['max_tokens'])
+
+    options = tuple(label for key, label in OPTION_LABELS if settings.get(key))
+    head, tail, fixed_tokens = _fragments(
+        settings['language'],
+        settings['code_type'],
+        settings['framework'],
+        tuple(settings.get('libraries') or ()),
+        options,
+        settings['code_style'],
+        settings['indent_style']
+    )
+
+    requirement = requirement.strip()
+    tokens = fixed_tokens + estimate_tokens(requirement)
+    trimmed = False
+
+    if tokens > budget:
+        room = budget - fixed_tokens - estimate_tokens(TRIM_MARKER)
+        if not trim or room <= 0 or tokens > budget * MAX_TRIM_RATIO:
+            raise PromptTooLarge(tokens, budget)
+        requirement = requirement[:room * CHARS_PER_TOKEN].rstrip() + TRIM_MARKER
+        tokens = fixed_tokens + estimate_tokens(requirement)
+        trimmed = True
+
+    return {
+        'text': head + requirement + tail,
+        'generation_config': generation_config(settings),
+        'prompt_tokens': tokens,
+        'trimmed': trimmed
+    }
@@ -0,0 +1,208 @@
+"""
+Rate Limiting Module for AI Code Generator
+Import in your main file: from codegen import ratelimit
+Use: limiter = ratelimit.TokenBucket(rate=2.0, capacity=5)
+     limiter.acquire()   # blocks until a request may go out
+
+     gate = ratelimit.FairLimiter(requests_per_minute=60, tokens_per_minute=1_000_000)
+     waited = gate.acquire(session_id, prompt_tokens)
+
+     flights = ratelimit.SingleFlight()
+     result, shared = flights.do(key, call)
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursts up to `capacity`"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        # Caller holds the lock
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, tokens=1.0):
+        """Seconds until tokens will be available (0 if they are now)"""
+        tokens = min(float(tokens), self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def try_acquire(self, tokens=1.0):
+        """Take tokens if available right now; returns True on success"""
+        tokens = min(float(tokens), self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def debit(self, tokens):
+        """Take tokens after the fact, even into debt (e.g. output tokens)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= float(tokens)
+
+    def acquire(self, tokens=1.0):
+        """
+        Block until tokens are available, then take them
+
+        Args:
+            tokens: Number of tokens to take (at most the capacity)
+
+        Returns:
+            Seconds spent waiting
+        """
+        tokens = min(float(tokens), self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class FairLimiter:
+    """
+    Requests/minute and tokens/minute limits shared by every session
+
+    Waiting requests are served round-robin across sessions, so one session
+    submitting a burst cannot starve the others.
+    """
+
+    def __init__(self, requests_per_minute=60, tokens_per_minute=1_000_000):
+        self.requests = TokenBucket(requests_per_minute / 60.0, capacity=requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute / 60.0, capacity=tokens_per_minute)
+        self.granted = 0
+        self.total_wait = 0.0
+        self.last_wait = 0.0
+        self._queues = OrderedDict()   # session -> deque of waiting tickets
+        self._cond = threading.Condition()
+
+    def _head(self):
+        # Caller holds the condition; the ticket whose turn it is
+        for queue in self._queues.values():
+            if queue:
+                return queue[0]
+        return None
+
+    def acquire(self, session, tokens=0):
+        """
+        Wait for this session's turn and for quota, then take it
+
+        Args:
+            session: Session (or any caller id) used for fair queuing
+            tokens: Prompt tokens the request will spend
+
+        Returns:
+            Seconds spent waiting
+        """
+        ticket = object()
+        start = time.monotonic()
+        with self._cond:
+            self._queues.setdefault(session, deque()).append(ticket)
+            while True:
+                if self._head() is ticket:
+                    delay = max(self.requests.delay(1), self.tokens.delay(tokens))
+                    if delay == 0:
+                        self.requests.debit(1)
+                        self.tokens.debit(min(float(tokens), self.tokens.capacity))
+                        queue = self._queues[session]
+                        queue.popleft()
+                        # Round robin: this session goes behind everyone else
+                        if queue:
+                            self._queues.move_to_end(session)
+                        else:
+                            del self._queues[session]
+                        waited = time.monotonic() - start
+                        self.granted += 1
+                        self.total_wait += waited
+                        self.last_wait = waited
+                        self._cond.notify_all()
+                        return waited
+                    self._cond.wait(delay)
+                else:
+                    self._cond.wait()
+
+    def debit(self, tokens):
+        """Charge tokens that are only known afterwards (the response)"""
+        self.tokens.debit(tokens)
+
+    def stats(self):
+        """Returns queue depth and wait times"""
+        with self._cond:
+            return {
+                'queue_depth': sum(len(queue) for queue in self._queues.values()),
+                'waiting_sessions': sum(1 for queue in self._queues.values() if queue),
+                'granted': self.granted,
+                'mean_wait': self.total_wait / self.granted if self.granted else 0.0,
+                'last_wait': self.last_wait
+            }
+
+
+class SingleFlight:
+    """Coalesces identical concurrent calls: one runs, the others get its result"""
+
+    def __init__(self):
+        self.coalesced = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, call):
+        """
+        Run call() unless a call with the same key is already running
+
+        Args:
+            key: Identity of the request (e.g. a cache key)
+            call: Zero-argument function doing the work
+
+        Returns:
+            Tuple of (result, shared) where shared is True for waiters that
+            received another caller's result
+        """
+        with self._lock:
+            future = self._flights.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._flights[key] = future
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = call()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+
+    def in_flight(self):
+        """Returns the number of distinct calls currently running"""
+        with self._lock:
+            return len(self._flights)
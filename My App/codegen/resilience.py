@@ -0,0 +1,186 @@
+"""
+Resilient Call Module for AI Code Generator
+Import in your main file: from codegen import resilience
+Use: result = resilience.generate(call, model_name, cached=lookup, hedge=True)
+     # call(model_name, is_hedge) -> result dict, e.g. a gateway.generate wrapper
+     # cached(model_name) -> text or None, the last-resort tier
+
+Each request climbs a ladder until something answers within the SLO:
+    1. the selected model, retried with exponential backoff and full jitter
+       on retryable errors, optionally hedged with a duplicate request when
+       the first is slower than the model's recent p95 latency
+    2. the next model in MODEL_FALLBACKS (same treatment)
+    3. a cached answer for any model in the chain
+The result records which tier served it.
+
+Configuration (environment variables):
+    CODEGEN_RETRY_ATTEMPTS - tries per model on retryable errors (default 3)
+    CODEGEN_SLO - seconds after which no new attempt is started (default 60)
+"""
+
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from codegen import backends
+
+# Cheaper/more available models to try when a model keeps failing
+MODEL_FALLBACKS = {
+    "gemini-2.0-flash-exp": ["gemini-1.5-flash"],
+    "gemini-1.5-pro": ["gemini-1.5-flash"],
+    "gemini-1.5-flash": []
+}
+
+# Google API error class names worth retrying (matched by name: no SDK import)
+RETRYABLE_ERRORS = {
+    "DeadlineExceeded", "ServiceUnavailable", "ResourceExhausted", "TooManyRequests",
+    "InternalServerError", "Aborted", "Unavailable"
+}
+
+DEFAULT_ATTEMPTS = int(os.environ.get("CODEGEN_RETRY_ATTEMPTS", 3))
+DEFAULT_BASE_DELAY = 0.5
+DEFAULT_MAX_DELAY = 8.0
+DEFAULT_SLO = float(os.environ.get("CODEGEN_SLO", 60))
+
+# Hedge after this many seconds until a model has enough latency samples
+DEFAULT_HEDGE_AFTER = 8.0
+MIN_HEDGE_SAMPLES = 20
+
+_latencies = {}
+_latencies_lock = threading.Lock()
+_hedge_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedge")
+
+
+def is_retryable(error):
+    """Returns True for errors that a later attempt might not hit"""
+    if isinstance(error, (backends.TransientBackendError, TimeoutError, ConnectionError)):
+        return True
+    return type(error).__name__ in RETRYABLE_ERRORS
+
+
+def backoff_delay(attempt, base_delay=DEFAULT_BASE_DELAY, max_delay=DEFAULT_MAX_DELAY, rng=random):
+    """Full-jitter exponential backoff: uniform in [0, min(max, base * 2**attempt)]"""
+    return rng.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def record_latency(model_name, seconds):
+    """Adds a successful call's latency to the model's recent samples"""
+    with _latencies_lock:
+        _latencies.setdefault(model_name, deque(maxlen=200)).append(seconds)
+
+
+def p95_latency(model_name):
+    """Returns the model's recent p95 latency, or None with too few samples"""
+    with _latencies_lock:
+        samples = sorted(_latencies.get(model_name, ()))
+    if len(samples) < MIN_HEDGE_SAMPLES:
+        return None
+    return samples[int(0.95 * (len(samples) - 1))]
+
+
+def _hedged(call, model_name, hedge_after):
+    """Run call; if it is slower than hedge_after, race a duplicate against it"""
+    first = _hedge_pool.submit(call, model_name, False)
+    done, _ = wait([first], timeout=hedge_after)
+    if done:
+        return first.result(), False
+
+    second = _hedge_pool.submit(call, model_name, True)
+    pending = [first, second]
+    while pending:
+        done, not_done = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result(), future is second
+        pending = list(not_done)
+    raise first.exception()
+
+
+def generate(call, model_name, cached=None, attempts=DEFAULT_ATTEMPTS, base_delay=DEFAULT_BASE_DELAY,
+             max_delay=DEFAULT_MAX_DELAY, hedge=False, hedge_after=None, slo=DEFAULT_SLO,
+             fallbacks=None, sleep=time.sleep, rng=random):
+    """
+    Generate with retries, optional hedging and a model fallback chain
+
+    Args:
+        call: Function(model_name, is_hedge) returning a result dictionary;
+            with hedge=True every attempt runs on a worker thread, so call
+            must not touch thread-bound state (e.g. draw Streamlit elements)
+        model_name: The selected model
+        cached: Optional function(model_name) returning a cached text or None
+        attempts: Tries per model on retryable errors
+        base_delay: First backoff step in seconds
+        max_delay: Largest backoff step in seconds
+        hedge: Issue a duplicate request when the first is slow
+        hedge_after: Seconds before hedging (default: the model's p95)
+        slo: Seconds after which no more attempts are started
+        fallbacks: Models to try after model_name (default: MODEL_FALLBACKS)
+        sleep: Sleep function (injectable for tests)
+        rng: Random source for jitter (injectable for tests)
+
+    Returns:
+        The call's result dictionary plus 'tier' ('primary', 'retry', 'hedge',
+        'fallback' or 'cache'), 'served_by' and 'attempts'
+
+    Raises:
+        The last error if every tier failed
+    """
+    start = time.monotonic()
+    chain = [model_name] + list(MODEL_FALLBACKS.get(model_name, []) if fallbacks is None else fallbacks)
+    total_attempts = 0
+    last_error = None
+
+    for position, model in enumerate(chain):
+        for attempt in range(attempts):
+            if time.monotonic() - start > slo:
+                break
+            total_attempts += 1
+            call_start = time.monotonic()
+            try:
+                if hedge:
+                    threshold = hedge_after or p95_latency(model) or DEFAULT_HEDGE_AFTER
+                    result, hedged = _hedged(call, model, threshold)
+                else:
+                    result, hedged = call(model, False), False
+            except Exception as e:
+                last_error = e
+                if not is_retryable(e):
+                    # Retrying this model will not help; move down the chain
+                    break
+                if attempt + 1 < attempts:
+                    sleep(backoff_delay(attempt, base_delay, max_delay, rng))
+                continue
+
+            record_latency(model, time.monotonic() - call_start)
+            result = dict(result)
+            if position:
+                result['tier'] = "fallback"
+            elif hedged:
+                result['tier'] = "hedge"
+            else:
+                result['tier'] = "retry" if attempt else "primary"
+            result['served_by'] = model
+            result['attempts'] = total_attempts
+            return result
+
+    if cached is not None:
+        for model in chain:
+            text = cached(model)
+            if text:
+                return {
+                    'text': text,
+                    'cached': True,
+                    'fallback': False,
+                    'ttft': 0.0,
+                    'latency': time.monotonic() - start,
+                    'tier': "cache",
+                    'served_by': model,
+                    'attempts': total_attempts
+                }
+
+    if last_error is None:
+        raise TimeoutError(f"No response within the {slo:.0f}s latency SLO")
+    raise last_error
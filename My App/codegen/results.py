@@ -0,0 +1,101 @@
+"""
+Generation Result Module for AI Code Generator
+Import in your main file: from codegen import results
+Use: st.session_state.current_result = results.new_result(code, prompt, settings, session=sid)
+     code = results.get_code(result)
+
+A result is a small dictionary that lives in st.session_state and is redrawn
+on every rerun without touching the model again. Code and analyses are kept
+in the shared blob store (codegen.blobs); the result holds only their ids.
+"""
+
+import time
+
+from codegen import blobs
+
+
+def new_result(code, prompt, settings, stats=None, session=None, files=None, extras=None, notes=None):
+    """
+    Create the stored record of one generation
+
+    Args:
+        code: Generated code
+        prompt: The user's requirement
+        settings: Settings used for the generation (copied)
+        stats: Timing/serving info from streaming.generate (optional)
+        session: Session id charged for the stored code (optional)
+        files: Path -> code of a multi-file project (optional; code is their combined view)
+        extras: (language, text) code blocks that are not part of the code file (optional)
+        notes: The model's prose around the code (optional)
+
+    Returns:
+        Dictionary with the code id, prompt, settings snapshot, stats, analyses
+        and, for projects, file ids
+    """
+    store = blobs.get_store()
+    return {
+        'code_id': store.put(code, session=session),
+        'files': [(path, store.put(text, session=session)) for path, text in (files or {}).items()],
+        'extras': [(language, store.put(text, session=session)) for language, text in (extras or [])],
+        'notes_id': store.put(notes, session=session) if notes else None,
+        'session': session,
+        'prompt': prompt,
+        'settings': dict(settings),
+        'stats': dict(stats or {}),
+        'analyses': {},
+        'created': time.time()
+    }
+
+
+def get_code(result):
+    """Returns the code of a result, or None if it was evicted from memory"""
+    return blobs.get_store().get(result['code_id'], session=result.get('session'))
+
+
+def get_files(result):
+    """
+    Returns the files of a multi-file project result
+
+    Returns:
+        List of (path, code) pairs in project order; empty for single-file
+        results, None if any file was evicted from memory
+    """
+    store = blobs.get_store()
+    files = []
+    for path, blob_id in result.get('files') or []:
+        text = store.get(blob_id, session=result.get('session'))
+        if text is None:
+            return None
+        files.append((path, text))
+    return files
+
+
+def get_extras(result):
+    """Returns the extra code blocks as (language, text) pairs (evicted ones are skipped)"""
+    store = blobs.get_store()
+    extras = []
+    for language, blob_id in result.get('extras') or []:
+        text = store.get(blob_id, session=result.get('session'))
+        if text is not None:
+            extras.append((language, text))
+    return extras
+
+
+def get_notes(result):
+    """Returns the model's prose around the code, or None"""
+    if not result.get('notes_id'):
+        return None
+    return blobs.get_store().get(result['notes_id'], session=result.get('session'))
+
+
+def set_analysis(result, kind, text):
+    """Stores an Explain/Review/Improve answer with the result"""
+    result['analyses'][kind] = blobs.get_store().put(text, session=result.get('session'))
+
+
+def get_analysis(result, kind):
+    """Returns a stored analysis, or None if there is none (or it was evicted)"""
+    blob_id = result['analyses'].get(kind)
+    if blob_id is None:
+        return None
+    return blobs.get_store().get(blob_id, session=result.get('session'))
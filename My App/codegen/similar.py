@@ -0,0 +1,262 @@
+"""
+Similar Prompt Cache Module for AI Code Generator
+Import in your main file: from codegen import similar
+Use: match = similar.get_index().lookup(prompt, settings)    # None or a stored answer
+     similar.get_index().add(prompt, settings, answer_text)
+
+The exact cache (codegen.cache) only helps when a prompt repeats word for
+word. This index finds earlier requests that say the same thing in other
+words ("write a function to reverse a linked list" / "reverse linked list
+function in python") without an embedding service:
+    prompt -> normalized words -> word unigrams and ordered bigrams
+           -> MinHash signature -> LSH band buckets
+A lookup hashes the prompt once, reads its band buckets, and confirms each
+candidate with the exact Jaccard similarity of the shingle sets. Answers are
+only shared between requests whose prompt-shaping settings all match:
+language, code type, framework, libraries, include options, style guide,
+indentation, model, temperature and output length.
+
+Reusing the wrong answer is worse than paying for a new one, so matching is
+strict: verbs such as read/write and negations are kept, bigrams keep their
+word order ("fahrenheit celsius" is not "celsius fahrenheit"), a match needs
+MIN_SHARED shingles in common and the same negated terms, and sessions only
+reuse answers after turning on "Reuse Similar Answers".
+
+Configuration (environment variables):
+    CODEGEN_SIMILAR           - 0 turns similar-answer reuse off for every session (default 1)
+    CODEGEN_SIMILAR_THRESHOLD - Jaccard similarity needed to reuse an answer (default 0.8)
+    CODEGEN_SIMILAR_SIZE      - answers kept in the index (default 5000)
+"""
+
+import functools
+import hashlib
+import os
+import re
+import struct
+import threading
+from collections import Counter, OrderedDict
+
+from codegen import extract, prompts
+
+NUM_HASHES = 64
+BANDS = 32  # 2 rows per band: P(shared band) = similarity ** 2
+
+_HASH_FORMAT = f"<{NUM_HASHES}Q"
+
+# Shingles two prompts must share, so short prompts never match on a word or two
+MIN_SHARED = 4
+
+# Words that do not change what is being asked for
+STOP_WORDS = {
+    "a", "an", "the", "to", "for", "of", "in", "on", "with", "and", "or", "that", "which",
+    "me", "my", "i", "you", "please", "can", "could", "would", "should", "give", "using",
+    "is", "it", "this", "some", "simple", "how", "do", "does", "want", "need"
+}
+
+# Names for "some code"; the Code Type setting already says which kind
+CODE_NOUNS = {"function", "method", "script", "program", "code", "snippet"}
+
+# "Write a function ...", "Create a class ...": the opening verb only asks for code
+REQUEST_VERBS = {"write", "create", "make", "generate", "build", "implement", "show"}
+
+# Words that flip the meaning of the word after them
+NEGATIONS = {"not", "no", "without", "never"}
+
+WORD_PATTERN = re.compile(r"[a-z0-9_+#]+")
+
+
+def is_enabled():
+    """Returns False when CODEGEN_SIMILAR=0 turns reuse off process-wide"""
+    return os.environ.get("CODEGEN_SIMILAR", "1") != "0"
+
+
+def normalize(prompt, language=None):
+    """
+    Lowercase content words of a prompt, in order
+
+    Stop words, the language name and words that only mean "code" are left
+    out, as is an opening request ("write a function", "create a class").
+    Verbs and negations are kept ("doesn't" becomes "does not").
+    """
+    skip = STOP_WORDS | extract.LANGUAGE_TAGS.get(language, set()) | ({language.lower()} if language else set())
+    words = []
+    for word in WORD_PATTERN.findall(prompt.lower().replace("n't", " not")):
+        if word in skip:
+            continue
+        # Cheap plural folding: lists -> list, classes -> class
+        if len(word) > 4 and word.endswith("es") and word[-3] in "sxz":
+            word = word[:-2]
+        elif len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+            word = word[:-1]
+        words.append(word)
+    if len(words) > 1 and words[0] in REQUEST_VERBS and (words[1] in CODE_NOUNS or words[1] == "class"):
+        words = words[2:]
+    return [word for word in words if word not in CODE_NOUNS]
+
+
+def shingles(words):
+    """Set of word unigrams and ordered bigrams"""
+    grams = set(words)
+    grams.update(" ".join(pair) for pair in zip(words, words[1:]))
+    return grams
+
+
+def negated(words):
+    """Negation bigrams of a prompt ('not prime'); prompts must agree on these to match"""
+    negations = {word for word in words if word in NEGATIONS}
+    negations.update(" ".join(pair) for pair in zip(words, words[1:]) if pair[0] in NEGATIONS)
+    return frozenset(negations)
+
+
+@functools.lru_cache(maxsize=65536)
+def _shingle_hashes(shingle):
+    # NUM_HASHES independent 64-bit hashes from one extendable-output digest
+    return struct.unpack(_HASH_FORMAT, hashlib.shake_128(shingle.encode("utf-8")).digest(8 * NUM_HASHES))
+
+
+def signature(grams):
+    """MinHash signature of a shingle set"""
+    return tuple(map(min, zip(*map(_shingle_hashes, grams))))
+
+
+def min_band_hits(threshold):
+    """
+    Shared bands a candidate needs before its exact similarity is computed
+
+    A pair with similarity s shares BANDS * s**2 bands on average; the bar
+    is set well below that at the threshold so true matches are rarely lost.
+    """
+    return max(1, int(BANDS * (0.75 * threshold) ** 2))
+
+
+def jaccard(first, second):
+    """Exact Jaccard similarity of two sets"""
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+def scope_of(settings):
+    """Settings that must match for an answer to be reusable (all that shape the prompt or reply)"""
+    settings = prompts.resolve_settings(settings)
+    options = tuple(key for key, _ in prompts.OPTION_LABELS if settings.get(key))
+    return (
+        settings['language'],
+        settings['code_type'],
+        settings['framework'],
+        tuple(sorted(settings.get('libraries') or ())),
+        options,
+        settings['code_style'],
+        settings['indent_style'],
+        settings['model_version'],
+        float(settings['temperature']),
+        int(settings['max_tokens'])
+    )
+
+
+class SimilarIndex:
+    """MinHash/LSH index of answered prompts, bounded and thread-safe"""
+
+    def __init__(self, threshold=0.8, max_entries=5000):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.reused = 0
+        self._entries = OrderedDict()  # id -> entry
+        self._buckets = {}             # (scope, band, values) -> set of ids
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def _bands(self, scope, sig):
+        rows = NUM_HASHES // BANDS
+        return [(scope, band, sig[band * rows:(band + 1) * rows]) for band in range(BANDS)]
+
+    def add(self, prompt, settings, text):
+        """Remember text as the answer to prompt under settings"""
+        scope = scope_of(settings)
+        words = normalize(prompt, scope[0])
+        grams = shingles(words)
+        if not grams or not text:
+            return
+        sig = signature(grams)
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            bands = self._bands(scope, sig)
+            self._entries[entry_id] = {
+                'prompt': prompt, 'text': text, 'shingles': grams, 'negated': negated(words), 'bands': bands
+            }
+            for band in bands:
+                self._buckets.setdefault(band, set()).add(entry_id)
+            while len(self._entries) > self.max_entries:
+                old_id, old = self._entries.popitem(last=False)
+                for band in old['bands']:
+                    ids = self._buckets.get(band)
+                    if ids is not None:
+                        ids.discard(old_id)
+                        if not ids:
+                            del self._buckets[band]
+
+    def lookup(self, prompt, settings, threshold=None):
+        """
+        Find the stored answer to the most similar earlier prompt
+
+        Args:
+            prompt: The user's requirement
+            settings: Settings dictionary from sidebar.create_sidebar()
+            threshold: Minimum Jaccard similarity (default: the index's)
+
+        Returns:
+            Dictionary with 'text', 'prompt' and 'similarity', or None
+        """
+        threshold = self.threshold if threshold is None else threshold
+        scope = scope_of(settings)
+        words = normalize(prompt, scope[0])
+        grams = shingles(words)
+        if len(grams) < MIN_SHARED:
+            return None
+        negations = negated(words)
+        bands = self._bands(scope, signature(grams))
+
+        with self._lock:
+            hits = Counter()
+            for band in bands:
+                hits.update(self._buckets.get(band, ()))
+            needed = min_band_hits(threshold)
+            best = None
+            best_score = threshold
+            for entry_id, count in hits.items():
+                if count < needed:
+                    continue
+                entry = self._entries[entry_id]
+                if entry['negated'] != negations or len(grams & entry['shingles']) < MIN_SHARED:
+                    continue
+                score = jaccard(grams, entry['shingles'])
+                if score >= best_score:
+                    best, best_score = entry_id, score
+            if best is None:
+                return None
+            self._entries.move_to_end(best)
+            self.reused += 1
+            entry = self._entries[best]
+            return {'text': entry['text'], 'prompt': entry['prompt'], 'similarity': best_score}
+
+    def stats(self):
+        """Returns the index size and how many answers were reused"""
+        with self._lock:
+            return {'size': len(self._entries), 'reused': self.reused, 'threshold': self.threshold}
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """Return the process-wide index, creating it from the environment on first use"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SimilarIndex(
+                threshold=float(os.environ.get("CODEGEN_SIMILAR_THRESHOLD", 0.8)),
+                max_entries=int(os.environ.get("CODEGEN_SIMILAR_SIZE", 5000))
+            )
+        return _index
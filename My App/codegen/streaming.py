@@ -0,0 +1,100 @@
+"""
+Streaming Generation Module for AI Code Generator
+Import in your main file: from codegen import streaming
+Use: result = streaming.generate(backend, full_prompt, model_name, config,
+                                 stream=True, on_chunk=show)
+"""
+
+import time
+
+from codegen import backends, metrics, prompts
+
+
+def generate(backend, prompt, model_name, generation_config=None, stream=False, on_chunk=None):
+    """
+    Generate a response, optionally streaming it chunk by chunk
+
+    When streaming fails part-way through, the partial output is dropped
+    and the request is retried once on the blocking path; on_chunk is then
+    called with "" so consumers start over before the retried text arrives.
+    Metrics get exactly one outcome per request, marked as a fallback when
+    the retry answered (or failed) in place of the stream.
+
+    Args:
+        backend: A codegen.backends.Backend
+        prompt: The full prompt to send
+        model_name: Model to answer with
+        generation_config: Dictionary of generation parameters (optional)
+        stream: Request the response as a stream of chunks
+        on_chunk: Called with the accumulated text after every chunk
+
+    Returns:
+        Dictionary with the text, timings (seconds), token usage, finish
+        reason and how it was served
+    """
+    registry = metrics.get_metrics()
+    backends.take_usage()  # drop anything an earlier call left on this thread
+    result = {
+        'text': "",
+        'streamed': False,
+        'fallback': False,
+        'chunks': 0,
+        'ttft': None,
+        'latency': None
+    }
+    start = time.perf_counter()
+
+    if stream:
+        text = ""
+        try:
+            for piece in backend.stream(prompt, model_name, generation_config):
+                if not piece:
+                    continue
+                if result['ttft'] is None:
+                    result['ttft'] = time.perf_counter() - start
+                text += piece
+                result['chunks'] += 1
+                if on_chunk:
+                    on_chunk(text)
+            result['text'] = text
+            result['streamed'] = True
+        except Exception:
+            # Degrade to one blocking call; its error (if any) is the caller's
+            result['fallback'] = True
+            result['chunks'] = 0
+            result['ttft'] = None
+            if on_chunk and text:
+                on_chunk("")
+
+    if not result['streamed']:
+        try:
+            result['text'] = backend.generate(prompt, model_name, generation_config)
+        except Exception as e:
+            registry.observe(model_name, backend.name, None, time.perf_counter() - start, error=e,
+                             fallback=result['fallback'])
+            raise
+        if on_chunk and result['text']:
+            on_chunk(result['text'])
+
+    result['latency'] = time.perf_counter() - start
+    if result['ttft'] is None:
+        # Blocking responses arrive all at once
+        result['ttft'] = result['latency']
+
+    # Reported usage where the backend has it, local estimates otherwise
+    usage = backends.take_usage()
+    result['prompt_tokens'] = usage.get('prompt_tokens') or prompts.estimate_tokens(prompt)
+    result['output_tokens'] = usage.get('output_tokens') or prompts.estimate_tokens(result['text'])
+    result['finish_reason'] = usage.get('finish_reason')
+    registry.observe(
+        model_name,
+        backend.name,
+        result['ttft'],
+        result['latency'],
+        prompt_tokens=result['prompt_tokens'],
+        output_tokens=result['output_tokens'],
+        finish_reason=result['finish_reason'],
+        streamed=result['streamed'],
+        fallback=result['fallback']
+    )
+    return result
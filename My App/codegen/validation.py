@@ -0,0 +1,398 @@
+"""
+Validation Module for AI Code Generator
+Import in your main file: from codegen import validation
+Use: key = validation.submit(files, run_tests=settings['include_tests'])   # non-blocking
+     checks = validation.wait(key, timeout=0)                            # list of badges
+
+Checks generated code locally instead of spending another model call:
+    Python - ast.parse/compile
+    SQL    - EXPLAIN of every statement in an in-memory sqlite3 database
+    JSON   - json.loads
+    HTML   - tag balance with html.parser
+    Tests  - (Python, when "🧪 Unit Tests" is on and CODEGEN_RUN_TESTS=1)
+             the generated tests run with pytest or unittest in a separate
+             subprocess under CPU, memory, file-size and wall-clock limits
+Every check runs in its own short-lived worker process
+(python -m codegen.validation), a few at a time, so a pathological input
+cannot crash or stall the server. Results are cached by the hash of the
+files, so reruns and other sessions reuse them.
+
+Running the generated tests executes model-written code on this machine.
+The limits above stop runaway CPU, memory and disk use, but there is no
+network or filesystem isolation: the code can reach anything the server's
+user can. That is why it is off unless the operator opts in.
+
+Configuration (environment variables):
+    CODEGEN_VALIDATION_WORKERS - checks running at the same time (default 2)
+    CODEGEN_RUN_TESTS - set to 1 to run the generated unit tests (default 0)
+    CODEGEN_TEST_TIMEOUT - seconds a test run may take (default 20)
+"""
+
+import ast
+import hashlib
+import importlib.util
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from html.parser import HTMLParser
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, only the timeout applies
+    resource = None
+
+WORKERS = int(os.environ.get("CODEGEN_VALIDATION_WORKERS", 2))
+TEST_TIMEOUT = float(os.environ.get("CODEGEN_TEST_TIMEOUT", 20))
+
+# Limits for the test subprocess
+TEST_CPU_SECONDS = 15
+TEST_MEMORY_BYTES = 512 * 1024 * 1024
+TEST_FILE_BYTES = 16 * 1024 * 1024
+
+# Seconds a syntax check may take before it is reported as timed out
+CHECK_TIMEOUT = 5
+
+# Folder that contains the codegen package, the workers' working directory
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MAX_RESULTS = 512
+
+# HTML elements that never have a closing tag
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "param", "source", "track", "wbr", "!doctype"
+}
+
+_executor = None
+_results = OrderedDict()
+_lock = threading.Lock()
+
+
+def _check(name, status, detail=""):
+    """One badge: status is 'pass', 'warn', 'fail' or 'skip'"""
+    return {'name': name, 'status': status, 'detail': detail}
+
+
+def tests_enabled():
+    """Returns True when CODEGEN_RUN_TESTS=1 allows running generated tests"""
+    return os.environ.get("CODEGEN_RUN_TESTS", "0") == "1"
+
+
+# ========== CHECKS (run in worker processes) ==========
+
+def check_python(code, path):
+    """Parse and compile Python source"""
+    try:
+        compile(ast.parse(code, filename=path), path, "exec")
+    except SyntaxError as e:
+        return _check(f"{path}: syntax", "fail", f"line {e.lineno}: {e.msg}")
+    except ValueError as e:
+        return _check(f"{path}: syntax", "fail", str(e))
+    return _check(f"{path}: syntax", "pass", "Python parses and compiles")
+
+
+def split_sql(code):
+    """Split a script into complete SQL statements"""
+    statements = []
+    current = ""
+    for line in code.splitlines(keepends=True):
+        current += line
+        if sqlite3.complete_statement(current):
+            if current.strip().strip(";").strip():
+                statements.append(current.strip())
+            current = ""
+    if current.strip():
+        statements.append(current.strip())
+    return statements
+
+
+def check_sql(code, path):
+    """EXPLAIN every statement against an in-memory database (DDL is executed)"""
+    connection = sqlite3.connect(":memory:")
+    unknown = []
+    try:
+        for statement in split_sql(code):
+            try:
+                if statement.lstrip().upper().startswith(("CREATE", "DROP", "ALTER")):
+                    connection.execute(statement)
+                else:
+                    connection.execute(f"EXPLAIN {statement}")
+            except sqlite3.OperationalError as e:
+                message = str(e)
+                if message.startswith(("no such table", "no such column", "no such function")):
+                    # The schema lives elsewhere; the statement itself parsed
+                    unknown.append(message)
+                elif "syntax error" in message:
+                    return _check(f"{path}: SQL", "warn", f"not valid SQLite ({message}); may be dialect-specific")
+                else:
+                    return _check(f"{path}: SQL", "fail", message)
+            except sqlite3.Error as e:
+                return _check(f"{path}: SQL", "fail", str(e))
+    finally:
+        connection.close()
+    if unknown:
+        return _check(f"{path}: SQL", "warn", f"parses, but refers to objects not defined here ({unknown[0]})")
+    return _check(f"{path}: SQL", "pass", "every statement is valid SQLite")
+
+
+def check_json(code, path):
+    """Parse JSON"""
+    try:
+        json.loads(code)
+    except json.JSONDecodeError as e:
+        return _check(f"{path}: JSON", "fail", f"line {e.lineno}: {e.msg}")
+    return _check(f"{path}: JSON", "pass", "valid JSON")
+
+
+class _TagBalance(HTMLParser):
+    """Tracks open tags to find unclosed and mismatched ones"""
+
+    def __init__(self):
+        super().__init__()
+        self.stack = []
+        self.problems = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag not in VOID_TAGS:
+            self.stack.append((tag, self.getpos()[0]))
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS:
+            return
+        if tag not in (open_tag for open_tag, _ in self.stack):
+            self.problems.append(f"line {self.getpos()[0]}: stray </{tag}>")
+            return
+        while self.stack:
+            open_tag, line = self.stack.pop()
+            if open_tag == tag:
+                break
+            # Browsers forgive a few implicitly closed tags
+            if open_tag not in ("p", "li", "td", "th", "tr", "option", "dt", "dd"):
+                self.problems.append(f"line {line}: <{open_tag}> is never closed")
+
+
+def check_html(code, path):
+    """Check that HTML tags are balanced"""
+    parser = _TagBalance()
+    parser.feed(code)
+    parser.close()
+    problems = parser.problems + [
+        f"line {line}: <{tag}> is never closed" for tag, line in parser.stack
+        if tag not in ("p", "li", "td", "th", "tr", "option", "dt", "dd", "html", "body", "head")
+    ]
+    if problems:
+        return _check(f"{path}: HTML", "warn", "; ".join(problems[:3]))
+    return _check(f"{path}: HTML", "pass", "tags are balanced")
+
+
+def _limit_resources():
+    # Runs in the test subprocess just before it executes
+    resource.setrlimit(resource.RLIMIT_CPU, (TEST_CPU_SECONDS, TEST_CPU_SECONDS))
+    resource.setrlimit(resource.RLIMIT_AS, (TEST_MEMORY_BYTES, TEST_MEMORY_BYTES))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (TEST_FILE_BYTES, TEST_FILE_BYTES))
+    os.setsid()
+
+
+def run_tests(files, timeout=TEST_TIMEOUT):
+    """
+    Run the generated Python tests in an isolated subprocess
+
+    Args:
+        files: List of (path, code) pairs written into a temporary folder
+        timeout: Wall-clock seconds before the run is killed
+
+    Returns:
+        A 'tests' check
+    """
+    with tempfile.TemporaryDirectory(prefix="codegen-tests-") as folder:
+        for path, code in files:
+            # Single files get a test_ name so pytest collects them
+            name = path if len(files) > 1 else "test_generated.py"
+            target = os.path.join(folder, name)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "w", encoding="utf-8") as handle:
+                handle.write(code)
+
+        if importlib.util.find_spec("pytest") is not None:
+            command = [sys.executable, "-I", "-m", "pytest", "-q", "-p", "no:cacheprovider",
+                       "--rootdir", folder, "-o", "pythonpath=.", folder]
+        else:
+            command = [sys.executable, "-I", "-m", "unittest", "discover", "-s", folder, "-p", "*.py"]
+
+        try:
+            completed = subprocess.run(
+                command,
+                cwd=folder,
+                env={'PATH': os.environ.get("PATH", ""), 'PYTHONDONTWRITEBYTECODE': "1", 'HOME': folder},
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+                preexec_fn=_limit_resources if resource is not None else None
+            )
+        except subprocess.TimeoutExpired:
+            return _check("tests", "fail", f"timed out after {timeout:.0f}s")
+
+    output = (completed.stdout + completed.stderr).strip().splitlines()
+    summary = output[-1] if output else ""
+    if completed.returncode == 0:
+        if "Ran 0 tests" in summary or "NO TESTS RAN" in summary:
+            return _check("tests", "skip", "no tests found in the generated code")
+        return _check("tests", "pass", summary)
+    if completed.returncode == 5:  # pytest: nothing collected
+        return _check("tests", "skip", "no tests found in the generated code")
+    return _check("tests", "fail", summary or f"exit code {completed.returncode}")
+
+
+CHECKS = {
+    ".py": check_python,
+    ".sql": check_sql,
+    ".json": check_json,
+    ".html": check_html,
+    ".htm": check_html
+}
+
+
+# ========== POOL AND CACHE ==========
+
+def files_hash(files, run_tests_too=False):
+    """Return the content hash used to key validation results"""
+    digest = hashlib.sha256(b"tests" if run_tests_too else b"syntax")
+    for path, code in files:
+        digest.update(b"\0" + path.encode("utf-8") + b"\0" + code.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _get_executor():
+    # Caller holds the lock; the threads only wait on worker processes
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="validation")
+    return _executor
+
+
+def _in_worker(name, job, timeout):
+    """Run one job in a fresh `python -m codegen.validation` process and return its check"""
+    try:
+        completed = subprocess.run(
+            [sys.executable, "-m", "codegen.validation"],
+            cwd=APP_DIR,
+            input=json.dumps(job),
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        return _check(name, "warn", f"check timed out after {timeout:.0f}s")
+    try:
+        return json.loads(completed.stdout)
+    except ValueError:
+        errors = completed.stderr.strip().splitlines()
+        return _check(name, "warn", f"check crashed: {errors[-1] if errors else completed.returncode}")
+
+
+def _done(check):
+    # A finished future for checks decided without a worker
+    future = Future()
+    future.set_result(check)
+    return future
+
+
+def _submit_checks(executor, files, run_tests_too):
+    jobs = [
+        (path, executor.submit(_in_worker, path, {'path': path, 'code': code}, CHECK_TIMEOUT))
+        for path, code in files
+        if os.path.splitext(path)[1].lower() in CHECKS
+    ]
+    if run_tests_too and any(path.endswith(".py") for path, _ in files):
+        if tests_enabled():
+            jobs.append(("tests", executor.submit(
+                _in_worker, "tests", {'tests': [list(pair) for pair in files]}, TEST_TIMEOUT + CHECK_TIMEOUT
+            )))
+        else:
+            jobs.append(("tests", _done(_check("tests", "skip", "not run: set CODEGEN_RUN_TESTS=1 to allow it"))))
+    return jobs
+
+
+def submit(files, run_tests_too=False):
+    """
+    Start validating files in the background (no-op if already known)
+
+    Args:
+        files: List of (path, code) pairs
+        run_tests_too: Also run the generated tests (Python, CODEGEN_RUN_TESTS=1 only)
+
+    Returns:
+        Key to pass to wait() or peek()
+    """
+    files = [(path, code) for path, code in files]
+    key = files_hash(files, run_tests_too and tests_enabled())
+    with _lock:
+        if key in _results:
+            _results.move_to_end(key)
+            return key
+        _results[key] = _submit_checks(_get_executor(), files, run_tests_too)
+        while len(_results) > MAX_RESULTS:
+            _results.popitem(last=False)
+    return key
+
+
+def wait(key, timeout=None):
+    """
+    Collect the checks for key, waiting up to timeout seconds in total
+
+    Returns:
+        List of check dictionaries (unfinished ones are reported as 'skip'),
+        or None if key is unknown
+    """
+    with _lock:
+        jobs = _results.get(key)
+    if jobs is None:
+        return None
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    checks = []
+    for name, future in jobs:
+        limit = TEST_TIMEOUT + CHECK_TIMEOUT if name == "tests" else CHECK_TIMEOUT
+        if deadline is not None:
+            limit = max(0, deadline - time.monotonic())
+        try:
+            checks.append(future.result(timeout=limit))
+        except FutureTimeout:
+            checks.append(_check(name, "skip", "still running"))
+        except Exception as e:
+            checks.append(_check(name, "warn", f"check crashed: {e}"))
+    return checks
+
+
+def peek(key):
+    """Returns True when every check for key has finished"""
+    with _lock:
+        jobs = _results.get(key)
+    return jobs is not None and all(future.done() for _, future in jobs)
+
+
+# ========== WORKER ENTRY POINT ==========
+
+def worker_main():
+    """Run the job read from stdin and write its check to stdout (one per process)"""
+    job = json.load(sys.stdin)
+    if 'tests' in job:
+        check = run_tests([tuple(pair) for pair in job['tests']])
+    else:
+        path = job['path']
+        check = CHECKS[os.path.splitext(path)[1].lower()](job['code'], path)
+    json.dump(check, sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(worker_main())
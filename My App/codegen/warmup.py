@@ -0,0 +1,156 @@
+"""
+Cache Warm-up Module for AI Code Generator
+Import in your main file: from codegen import warmup
+Use: warmup.start(backend)        # returns at once; idempotent across reruns
+     warmup.status()              # what has been warmed so far
+
+Templates are the most repeated requests, so after startup (and then on a
+schedule, if configured) a background thread generates every Quick Template
+for the most used languages with default settings and stores the answers
+in the response cache and the similar-prompt index. Loading a template
+and pressing Generate is then answered instantly. Calls go through the
+shared gateway in their own queue, so users are served between them.
+
+Warm-up spends quota without any user action (templates x languages model
+calls per run, 12 with the defaults), so it is off unless enabled. Answers
+already in the response cache are skipped, so with CODEGEN_CACHE_DB set a
+restart does not pay for them again.
+
+Configuration (environment variables):
+    CODEGEN_WARMUP           - 1 enables warm-up (default 0)
+    CODEGEN_WARMUP_LANGUAGES - comma-separated languages to warm
+                               (default: the most used ones in history)
+    CODEGEN_WARMUP_TOP       - how many most-used languages to warm (default 2)
+    CODEGEN_WARMUP_WORKERS   - concurrent warm-up requests (default 2)
+    CODEGEN_WARMUP_DELAY     - seconds after startup before warming (default 5)
+    CODEGEN_WARMUP_INTERVAL  - seconds between runs; 0 runs once (default 0)
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from codegen import cache, gateway, history, prompts, similar
+
+# Used when the history does not name enough languages yet
+DEFAULT_LANGUAGES = ("Python", "JavaScript", "Java")
+
+_thread = None
+_thread_lock = threading.Lock()
+_status = {'runs': 0, 'warmed': 0, 'skipped': 0, 'failed': 0, 'running': False, 'languages': [], 'last_run': None}
+_status_lock = threading.Lock()
+
+
+def top_languages(count):
+    """Most used languages from the history, topped up with DEFAULT_LANGUAGES"""
+    try:
+        languages = history.get_store().top_languages(count)
+    except Exception:
+        languages = []
+    for language in DEFAULT_LANGUAGES:
+        if len(languages) >= count:
+            break
+        if language not in languages:
+            languages.append(language)
+    return languages[:count]
+
+
+def warm_one(backend, template, language):
+    """
+    Generate and cache one template in one language (default settings)
+
+    Returns:
+        'warmed', 'skipped' (already cached) or 'failed'
+    """
+    settings = prompts.resolve_settings({'language': language})
+    built = prompts.build_prompt(prompts.TEMPLATES[template], settings)
+    model_name = settings['model_version']
+    response_cache = cache.get_cache()
+    key = cache.make_key(built['text'], model_name, built['generation_config'])
+    if response_cache.get(key, counted=False) is not None:
+        return 'skipped'
+    try:
+        result = gateway.get_gateway().generate(
+            backend,
+            built['text'],
+            model_name,
+            built['generation_config'],
+            session="warmup",
+            prompt_tokens=built['prompt_tokens']
+        )
+    except Exception:
+        return 'failed'
+    if not result['text']:
+        return 'failed'
+    response_cache.set(key, result['text'])
+    similar.get_index().add(prompts.TEMPLATES[template], settings, result['text'])
+    return 'warmed'
+
+
+def warm(backend, languages, workers=2):
+    """
+    Warm every template for languages with bounded concurrency (blocking)
+
+    Returns:
+        Dictionary with counts of 'warmed', 'skipped' and 'failed'
+    """
+    counts = {'warmed': 0, 'skipped': 0, 'failed': 0}
+    jobs = [(template, language) for language in languages for template in prompts.TEMPLATES]
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="warmup") as pool:
+        for outcome in pool.map(lambda job: warm_one(backend, *job), jobs):
+            counts[outcome] += 1
+    return counts
+
+
+def _loop(backend, delay, interval, workers, languages, top):
+    time.sleep(delay)
+    while True:
+        chosen = languages or top_languages(top)
+        with _status_lock:
+            _status['running'] = True
+            _status['languages'] = chosen
+        counts = warm(backend, chosen, workers)
+        with _status_lock:
+            _status['running'] = False
+            _status['runs'] += 1
+            _status['last_run'] = time.time()
+            for outcome, count in counts.items():
+                _status[outcome] += count
+        if interval <= 0:
+            return
+        time.sleep(interval)
+
+
+def start(backend):
+    """Start the warm-up thread once per process when CODEGEN_WARMUP=1 (returns immediately)"""
+    global _thread
+    if os.environ.get("CODEGEN_WARMUP", "0") != "1":
+        return
+    with _thread_lock:
+        if _thread is not None:
+            return
+        languages = [
+            language.strip() for language in os.environ.get("CODEGEN_WARMUP_LANGUAGES", "").split(",")
+            if language.strip()
+        ]
+        _thread = threading.Thread(
+            target=_loop,
+            args=(
+                backend,
+                float(os.environ.get("CODEGEN_WARMUP_DELAY", 5)),
+                float(os.environ.get("CODEGEN_WARMUP_INTERVAL", 0)),
+                int(os.environ.get("CODEGEN_WARMUP_WORKERS", 2)),
+                languages,
+                int(os.environ.get("CODEGEN_WARMUP_TOP", 2))
+            ),
+            name="cache-warmup",
+            daemon=True
+        )
+        _thread.start()
+
+
+def status():
+    """Returns warm-up progress counters"""
+    with _status_lock:
+        return dict(_status)
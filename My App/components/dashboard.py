@@ -0,0 +1,76 @@
+"""
+Usage Analytics Dashboard for AI Code Generator
+Import in your main file: from components import dashboard
+Use: dashboard.show_dashboard()
+
+Reads the process-wide counters from codegen.analytics, so it renders in
+constant time no matter how many generations all users have made.
+"""
+
+import pandas as pd
+import streamlit as st
+from codegen import analytics
+
+
+def _seconds(value):
+    """Formats a latency for a metric card"""
+    if value is None:
+        return "N/A"
+    if value == float("inf"):
+        return f"> {analytics.LATENCY_BUCKETS[-2]:.0f}s"
+    return f"≤ {value:g}s"
+
+
+@st.fragment(run_every=30)
+def show_dashboard():
+    """Renders the usage dashboard for all sessions (refreshes every 30 s)"""
+    st.markdown("### 📈 Usage Analytics")
+    st.caption("Live totals across all users since the server started")
+
+    data = analytics.get_analytics().snapshot()
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Generations", data['total'])
+    with col2:
+        last_minute = data['per_minute'][-1]
+        st.metric("This Minute", last_minute, help="Generations in the current minute")
+    with col3:
+        cache_share = data['cached'] / data['total'] if data['total'] else 0.0
+        st.metric("From Cache", f"{cache_share:.0%}")
+    with col4:
+        st.metric("Errors", data['errors'])
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        mean = data['mean_latency']
+        st.metric("Mean Latency", f"{mean:.2f}s" if mean is not None else "N/A",
+                  help="Model calls only; cache hits are left out")
+    with col2:
+        st.metric("p50 Latency", _seconds(data['p50']))
+    with col3:
+        st.metric("p95 Latency", _seconds(data['p95']))
+    with col4:
+        st.metric("p99 Latency", _seconds(data['p99']))
+
+    if not data['total']:
+        st.info("📭 No generations yet. Numbers appear here as soon as anyone generates code.")
+        return
+
+    st.markdown("#### ⏱️ Generations per Minute (last hour)")
+    minutes = pd.Index(range(-len(data['per_minute']) + 1, 1), name="Minute (0 = now)")
+    st.line_chart(pd.Series(data['per_minute'], index=minutes, name="Generations"))
+
+    st.markdown("#### 🐢 Mean Latency per Minute (seconds)")
+    st.line_chart(pd.Series(data['latency_per_minute'], index=minutes, name="Latency", dtype=float))
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("#### 🔤 Language Mix")
+        st.bar_chart(pd.Series(data['languages'], name="Generations"))
+    with col2:
+        st.markdown("#### 📦 Code Types")
+        st.bar_chart(pd.Series(data['code_types'], name="Generations"))
+
+    st.markdown("#### 🤖 Models")
+    st.bar_chart(pd.Series(data['models'], name="Generations"))
@@ -6,182 +6,198 @@ Use: header.create_header()
 """
 
 import streamlit as st
+from components import dashboard
+
+# Header styles; bundled and injected by components.styles
+HEADER_CSS = """
+/* Header Container */
+.header-container {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    padding: 1.5rem 2rem;
+    border-radius: 0;  /* Remove rounded corners for full-width */
+    margin-bottom: 2rem;
+    margin-top: -5rem;  /* Pull it to the very top */
+    box-shadow: 0 4px 15px rgba(102, 126, 234, 0.3);
+    position: sticky;  /* Make it stick to top when scrolling */
+    top: 0;
+    z-index: 999;
+}
+/* Brand Section */
+.brand-section {
+    display: flex;
+    align-items: center;
+    gap: 1rem;
+    margin-bottom: 1rem;
+}
+
+.brand-logo {
+    font-size: 2.5rem;
+    animation: rotate 3s linear infinite;
+}
+
+@keyframes rotate {
+    0% { transform: rotate(0deg); }
+    100% { transform: rotate(360deg); }
+}
+
+.brand-name {
+    font-size: 2rem;
+    font-weight: 800;
+    color: white;
+    text-shadow: 2px 2px 4px rgba(0,0,0,0.2);
+    letter-spacing: 1px;
+}
+
+.brand-tagline {
+    color: rgba(255,255,255,0.9);
+    font-size: 0.95rem;
+    font-style: italic;
+    margin-top: -0.5rem;
+}
+
+/* Navigation Bar */
+.nav-bar {
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    flex-wrap: wrap;
+    gap: 1rem;
+}
+
+.nav-links {
+    display: flex;
+    gap: 1.5rem;
+    flex-wrap: wrap;
+}
+
+.nav-link {
+    color: white;
+    text-decoration: none;
+    font-weight: 600;
+    font-size: 1rem;
+    padding: 0.5rem 1rem;
+    border-radius: 8px;
+    transition: all 0.3s ease;
+    background: rgba(255,255,255,0.1);
+    backdrop-filter: blur(10px);
+}
+
+.nav-link:hover {
+    background: rgba(255,255,255,0.25);
+    transform: translateY(-2px);
+    box-shadow: 0 4px 8px rgba(0,0,0,0.2);
+}
+
+.nav-link.active {
+    background: rgba(255,255,255,0.3);
+    box-shadow: 0 4px 8px rgba(0,0,0,0.15);
+}
+
+/* User Section */
+.user-section {
+    display: flex;
+    gap: 1rem;
+    align-items: center;
+}
+
+.user-badge {
+    background: rgba(255,255,255,0.2);
+    padding: 0.5rem 1rem;
+    border-radius: 20px;
+    color: white;
+    font-weight: 600;
+    font-size: 0.9rem;
+    backdrop-filter: blur(10px);
+}
+
+/* Profile Section */
+.profile-section {
+    background: rgba(255,255,255,0.15);
+    padding: 1rem;
+    border-radius: 10px;
+    margin-top: 1rem;
+    backdrop-filter: blur(10px);
+}
+
+.profile-info {
+    color: white;
+    line-height: 1.6;
+}
+
+.profile-title {
+    font-size: 1.1rem;
+    font-weight: 700;
+    margin-bottom: 0.5rem;
+    color: white;
+}
+
+.social-links {
+    display: flex;
+    gap: 1rem;
+    margin-top: 1rem;
+}
+
+.social-link {
+    background: rgba(255,255,255,0.2);
+    color: white;
+    padding: 0.5rem 1rem;
+    border-radius: 8px;
+    text-decoration: none;
+    font-size: 0.9rem;
+    transition: all 0.3s ease;
+}
+
+.social-link:hover {
+    background: rgba(255,255,255,0.35);
+    transform: scale(1.05);
+}
+
+/* Status Badge */
+.status-badge {
+    display: inline-block;
+    background: #10b981;
+    color: white;
+    padding: 0.25rem 0.75rem;
+    border-radius: 15px;
+    font-size: 0.8rem;
+    font-weight: 600;
+    margin-left: 0.5rem;
+}
+
+/* Responsive */
+@media (max-width: 768px) {
+    .brand-name {
+        font-size: 1.5rem;
+    }
+    .nav-links {
+        width: 100%;
+        justify-content: center;
+    }
+}
+"""
+
+def _go_to(page):
+    """Navigation button callback"""
+    st.session_state.current_page = page
+    st.session_state.show_profile = False
+
+
+def _show_profile():
+    """Profile button callback"""
+    st.session_state.show_profile = True
+
+
+def _logout():
+    """Logout button callback"""
+    st.session_state.is_logged_in = False
+    st.toast("✅ Logged out successfully!", icon="🚪")
+
 
 def create_header():
     """
     Creates a beautiful, professional header with navigation
     """
     
-    # Custom CSS for the header
-    st.markdown("""
-    <style>    
-         /* Header Container */
-        .header-container {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 1.5rem 2rem;
-        border-radius: 0;  /* Remove rounded corners for full-width */
-        margin-bottom: 2rem;
-        margin-top: -5rem;  /* Pull it to the very top */
-        box-shadow: 0 4px 15px rgba(102, 126, 234, 0.3);
-        position: sticky;  /* Make it stick to top when scrolling */
-        top: 0;
-        z-index: 999;
-    }       
-        /* Brand Section */
-        .brand-section {
-            display: flex;
-            align-items: center;
-            gap: 1rem;
-            margin-bottom: 1rem;
-        }
-        
-        .brand-logo {
-            font-size: 2.5rem;
-            animation: rotate 3s linear infinite;
-        }
-        
-        @keyframes rotate {
-            0% { transform: rotate(0deg); }
-            100% { transform: rotate(360deg); }
-        }
-        
-        .brand-name {
-            font-size: 2rem;
-            font-weight: 800;
-            color: white;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.2);
-            letter-spacing: 1px;
-        }
-        
-        .brand-tagline {
-            color: rgba(255,255,255,0.9);
-            font-size: 0.95rem;
-            font-style: italic;
-            margin-top: -0.5rem;
-        }
-        
-        /* Navigation Bar */
-        .nav-bar {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            flex-wrap: wrap;
-            gap: 1rem;
-        }
-        
-        .nav-links {
-            display: flex;
-            gap: 1.5rem;
-            flex-wrap: wrap;
-        }
-        
-        .nav-link {
-            color: white;
-            text-decoration: none;
-            font-weight: 600;
-            font-size: 1rem;
-            padding: 0.5rem 1rem;
-            border-radius: 8px;
-            transition: all 0.3s ease;
-            background: rgba(255,255,255,0.1);
-            backdrop-filter: blur(10px);
-        }
-        
-        .nav-link:hover {
-            background: rgba(255,255,255,0.25);
-            transform: translateY(-2px);
-            box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-        }
-        
-        .nav-link.active {
-            background: rgba(255,255,255,0.3);
-            box-shadow: 0 4px 8px rgba(0,0,0,0.15);
-        }
-        
-        /* User Section */
-        .user-section {
-            display: flex;
-            gap: 1rem;
-            align-items: center;
-        }
-        
-        .user-badge {
-            background: rgba(255,255,255,0.2);
-            padding: 0.5rem 1rem;
-            border-radius: 20px;
-            color: white;
-            font-weight: 600;
-            font-size: 0.9rem;
-            backdrop-filter: blur(10px);
-        }
-        
-        /* Profile Section */
-        .profile-section {
-            background: rgba(255,255,255,0.15);
-            padding: 1rem;
-            border-radius: 10px;
-            margin-top: 1rem;
-            backdrop-filter: blur(10px);
-        }
-        
-        .profile-info {
-            color: white;
-            line-height: 1.6;
-        }
-        
-        .profile-title {
-            font-size: 1.1rem;
-            font-weight: 700;
-            margin-bottom: 0.5rem;
-            color: white;
-        }
-        
-        .social-links {
-            display: flex;
-            gap: 1rem;
-            margin-top: 1rem;
-        }
-        
-        .social-link {
-            background: rgba(255,255,255,0.2);
-            color: white;
-            padding: 0.5rem 1rem;
-            border-radius: 8px;
-            text-decoration: none;
-            font-size: 0.9rem;
-            transition: all 0.3s ease;
-        }
-        
-        .social-link:hover {
-            background: rgba(255,255,255,0.35);
-            transform: scale(1.05);
-        }
-        
-        /* Status Badge */
-        .status-badge {
-            display: inline-block;
-            background: #10b981;
-            color: white;
-            padding: 0.25rem 0.75rem;
-            border-radius: 15px;
-            font-size: 0.8rem;
-            font-weight: 600;
-            margin-left: 0.5rem;
-        }
-        
-        /* Responsive */
-        @media (max-width: 768px) {
-            .brand-name {
-                font-size: 1.5rem;
-            }
-            .nav-links {
-                width: 100%;
-                justify-content: center;
-            }
-        }
-    </style>
-    """, unsafe_allow_html=True)
-    
     # Initialize session state for navigation
     if 'current_page' not in st.session_state:
         st.session_state.current_page = 'Home'
@@ -191,51 +207,36 @@ def create_header():
         st.session_state.show_profile = False
     
     # Navigation buttons
+    # Callbacks update the page before the rerun, so one click = one script run
     # All buttons same width
-    col1, col2, col3, col4, col5, col6 = st.columns(6)
+    col1, col2, col3, col4, col5, col6, col7 = st.columns(7)
     
     with col1:
         # About Ehtisham Button
-        if st.button("Ehtisham", use_container_width=True, key="about_btn"):
-            st.session_state.show_profile = True
+        st.button("Ehtisham", use_container_width=True, key="about_btn", on_click=_show_profile)
     
     with col2:
-        if st.button(" Home", use_container_width=True, key="home_btn"):
-            st.session_state.current_page = 'Home'
-            st.session_state.show_profile = False
-            st.rerun()
+        st.button(" Home", use_container_width=True, key="home_btn", on_click=_go_to, args=('Home',))
     
     with col3:
-        if st.button("About", use_container_width=True, key="about_app_btn"):
-            st.session_state.current_page = 'About'
-            st.session_state.show_profile = False
-            st.rerun()
+        st.button("About", use_container_width=True, key="about_app_btn", on_click=_go_to, args=('About',))
     
     with col4:
-        if st.button("Careers", use_container_width=True, key="careers_btn"):
-            st.session_state.current_page = 'Careers'
-            st.session_state.show_profile = False
-            st.rerun()
+        st.button("Careers", use_container_width=True, key="careers_btn", on_click=_go_to, args=('Careers',))
     
 
     with col5:
-        if st.button("Contact", use_container_width=False, key="contact_btn"):
-            st.session_state.current_page = 'Contact'
-            st.session_state.show_profile = False
-            st.rerun()
+        st.button("Contact", use_container_width=False, key="contact_btn", on_click=_go_to, args=('Contact',))
 
     
     with col6:
+        st.button("Analytics", use_container_width=True, key="analytics_btn", on_click=_go_to, args=('Analytics',))
+
+    with col7:
         if not st.session_state.is_logged_in:
-            if st.button("Login", use_container_width=True, key="login_btn"):
-                st.session_state.current_page = 'Login'
-                st.session_state.show_profile = False
-                st.rerun()
+            st.button("Login", use_container_width=True, key="login_btn", on_click=_go_to, args=('Login',))
         else:
-            if st.button("🚪 Logout", use_container_width=True, key="logout_btn"):
-                st.session_state.is_logged_in = False
-                st.toast("✅ Logged out successfully!", icon="🚪")
-                st.rerun()
+            st.button("🚪 Logout", use_container_width=True, key="logout_btn", on_click=_logout)
     
     # Profile Section (Expandable)
     if st.session_state.show_profile:
@@ -376,6 +377,7 @@ def render_page_content(page):
                     # Simple demo login (in production, use proper authentication)
                     if username == "ehtisham" and password == "demo":
                         st.session_state.is_logged_in = True
+                        st.session_state.username = username
                         st.session_state.current_page = 'Home'
                         st.success("✅ Login successful! Welcome back, Ehtisham!")
                         st.rerun()
@@ -386,6 +388,9 @@ def render_page_content(page):
             
             st.markdown("---")
             st.caption("Don't have an account? [Sign up here](#)")
+    elif page == 'Analytics':
+        dashboard.show_dashboard()
+
     elif page=='Careers':
         st.markdown("### 🚀 Careers at Ehtisham Solutions")
         st.markdown("""
@@ -0,0 +1,278 @@
+"""
+Output Panel Component for AI Code Generator
+Import in your main file: from components import output
+Use: output.show_output()
+
+Draws the current result from st.session_state on every rerun, so the
+action buttons never make the generated code disappear.
+"""
+
+import time
+
+import streamlit as st
+from codegen import analytics, backends, exporters, followups, prompts, results, validation
+from components import sidebar
+
+
+def get_result():
+    """Returns the result shown in the output panel (or None)"""
+    return st.session_state.get('current_result')
+
+
+def set_result(result):
+    """Makes result the one shown in the output panel"""
+    st.session_state.current_result = result
+
+
+# Seconds between redraws of the badges while local checks are still running
+VALIDATION_POLL = 1.5
+
+# Seconds between redraws of the code while it streams in
+LIVE_REDRAW = 0.2
+
+BADGES = {
+    'pass': ":green[✅ {}]",
+    'warn': ":orange[⚠️ {}]",
+    'fail': ":red[❌ {}]",
+    'skip': ":gray[⏳ {}]"
+}
+
+
+def result_files(result, code):
+    """(path, code) pairs of a result: a project's files, or one code file"""
+    settings = result['settings']
+    return results.get_files(result) or [(f"code.{sidebar.get_file_extension(settings['language'])}", code)]
+
+
+def live_code(code_area, extractor, language, interval=LIVE_REDRAW):
+    """
+    Returns the on_chunk callback that shows code in code_area while it streams
+
+    Every chunk is parsed as it arrives, but the code is redrawn at most once
+    per interval: each redraw sends the whole text to the browser, so drawing
+    on every chunk would cost time quadratic in the length of the answer.
+    The final code is drawn by the output panel once the stream ends.
+
+    Args:
+        code_area: st.empty() placeholder for the code
+        extractor: extract.FenceExtractor fed with the accumulated text
+        language: Sidebar language
+        interval: Minimum seconds between redraws
+    """
+    last_draw = [float("-inf")]
+
+    def show_chunk(text):
+        # Only the new part is parsed; prose before the first fence stays hidden
+        extractor.update(text)
+        if not text:
+            # The stream broke; a blocking retry replaces what was shown
+            code_area.empty()
+            last_draw[0] = float("-inf")
+        elif extractor.has_code() and time.monotonic() - last_draw[0] >= interval:
+            last_draw[0] = time.monotonic()
+            code_area.code(extractor.code_so_far(language), language=language.lower())
+
+    return show_chunk
+
+
+def start_validation(result, code):
+    """Start the local checks for a result in the background (cached by code hash)"""
+    settings = result['settings']
+    if not settings.get('validate_code', True):
+        return None
+    return validation.submit(result_files(result, code), run_tests_too=settings.get('include_tests', False))
+
+
+def draw_checks(checks):
+    """Draw validation checks as one line of badges"""
+    if not checks:
+        return
+    st.markdown(
+        " ".join(BADGES[check['status']].format(check['name']) for check in checks),
+        help="\n\n".join(f"**{check['name']}**: {check['detail']}" for check in checks)
+    )
+
+
+@st.fragment(run_every=VALIDATION_POLL)
+def poll_checks(key):
+    """Redraw the badges of running checks until every one has finished"""
+    checks = validation.wait(key, timeout=0)
+    if checks is None or validation.peek(key):
+        # A full rerun stops this timer and draws the final badges in its place
+        st.rerun()
+    draw_checks(checks)
+
+
+def show_checks(result, code):
+    """Draw the local validation results as badges (never waits for them)"""
+    key = start_validation(result, code)
+    if key is None:
+        return
+    if validation.peek(key):
+        draw_checks(validation.wait(key, timeout=0))
+    else:
+        poll_checks(key)
+
+
+def show_error(error):
+    """Count a failed model call and show it with troubleshooting tips"""
+    analytics.get_analytics().record_error()
+    st.error(f"❌ Error: {str(error)}")
+    st.info("💡 **Tips:**\n- Check your internet connection\n- Verify API key is valid\n- Try simplifying your prompt")
+
+
+def run_action(result, code, kind):
+    """
+    Fetch a follow-up for the stored result and keep it with the result
+
+    Args:
+        result: Stored result dictionary
+        code: The result's code
+        kind: One of 'explain', 'review', 'improve'
+
+    Returns:
+        The follow-up text, or None if the model call failed (already shown)
+    """
+    text = results.get_analysis(result, kind)
+    if text is None:
+        settings = result['settings']
+        try:
+            text = followups.get(
+                backends.get_backend(),
+                settings['model_version'],
+                code,
+                kind,
+                generation_config=prompts.generation_config(settings)
+            )
+        except Exception as e:
+            show_error(e)
+            return None
+        results.set_analysis(result, kind, text)
+    return text
+
+
+@st.fragment
+def show_output():
+    """
+    Renders the stored result with its actions and analyses
+
+    Runs as a fragment, so the action buttons rerun only this panel.
+    """
+    result = get_result()
+    if not result:
+        return
+
+    code = results.get_code(result)
+    if code is None:
+        st.info("🧹 This result was cleared from memory to make room. Load it again from the history.")
+        return
+
+    settings = result['settings']
+    stats = result['stats']
+    language = settings['language'].lower()
+
+    st.markdown("### 📄 Generated Code")
+    st.code(code, language=language, line_numbers=True)
+
+    if stats.get('similar'):
+        col_note, col_fresh = st.columns([4, 1])
+        with col_note:
+            st.caption(
+                f"♻️ Reused the answer to a similar request ({stats['similar']:.0%} alike): "
+                f"“{stats['similar_prompt'][:80]}”"
+            )
+        with col_fresh:
+            if st.button("🔄 Generate fresh", use_container_width=True, help="Ask the model instead of reusing"):
+                st.session_state.regenerate = True
+                st.rerun()
+    elif stats.get('tier') == "cache":
+        st.caption(f"🛟 The models are unavailable right now: showing an earlier answer from {stats['served_by']}")
+    elif stats.get('cached'):
+        st.caption("⚡ Served from cache: this exact request was answered recently")
+    elif stats.get('file_count'):
+        st.caption(
+            f"🗂️ Planned {stats['file_count']} files in {stats['plan_latency']:.2f}s · "
+            f"all generated in parallel, complete in {stats['latency']:.2f}s"
+        )
+    elif stats.get('latency') is not None:
+        st.caption(
+            f"⏱️ First token in {stats['ttft']:.2f}s · "
+            f"complete in {stats['latency']:.2f}s"
+            + (f" · waited {stats['queue_wait']:.1f}s in queue" if stats.get('queue_wait', 0) >= 0.1 else "")
+            + (" · shared with an identical request" if stats.get('coalesced') else "")
+            + (" · streaming failed, used standard mode" if stats.get('fallback') else "")
+            + (f" · served by fallback model {stats['served_by']}" if stats.get('tier') == "fallback" else "")
+            + (" · answered by a hedged request" if stats.get('tier') == "hedge" else "")
+            + (" · succeeded after retrying" if stats.get('tier') == "retry" else "")
+        )
+
+    show_checks(result, code)
+
+    # Action Buttons
+    st.markdown("#### 🔧 Actions")
+    col1, col2, col3, col4, col5 = st.columns(5)
+
+    with col1:
+        # Sidebar export settings as they are now, not as they were at generation time
+        export_format = st.session_state.get('export_format', settings['export_format'])
+        include_readme = st.session_state.get('include_readme', settings['include_readme'])
+        file_ext = sidebar.get_file_extension(settings['language'])
+
+        # Formats other than a plain file are built only on request, then cached
+        artifact = exporters.peek(result, export_format, file_ext, include_readme)
+        if artifact is None and export_format == "Single File":
+            artifact = exporters.get_artifact(result, code, export_format, file_ext, include_readme)
+        if artifact is None and st.button(
+            "📦 Prepare",
+            use_container_width=True,
+            help=f"Build the {export_format} export"
+        ):
+            artifact = exporters.get_artifact(result, code, export_format, file_ext, include_readme)
+        if artifact is not None:
+            st.download_button(
+                label="⬇️ Download",
+                data=artifact['data'],
+                file_name=artifact['file_name'],
+                mime=artifact['mime'],
+                use_container_width=True,
+                help=f"Download as {export_format}"
+            )
+
+    with col2:
+        if st.button("📋 Copy", use_container_width=True):
+            st.toast("✅ Code copied!", icon="📋")
+
+    with col3:
+        if st.button("🧠 Explain", use_container_width=True):
+            with st.spinner("Generating explanation..."):
+                run_action(result, code, 'explain')
+
+    with col4:
+        if st.button("🔍 Review", use_container_width=True):
+            with st.spinner("Reviewing..."):
+                run_action(result, code, 'review')
+
+    with col5:
+        if st.button("⚡ Improve", use_container_width=True):
+            with st.spinner("Improving..."):
+                run_action(result, code, 'improve')
+
+    # Other code blocks and the model's remarks from the same answer
+    for extra_language, extra_code in results.get_extras(result):
+        st.code(extra_code, language=extra_language or language)
+    notes = results.get_notes(result)
+    if notes:
+        with st.expander("📝 Model notes"):
+            st.markdown(notes)
+
+    # Analyses stay visible on later reruns
+    explanation = results.get_analysis(result, 'explain')
+    if explanation is not None:
+        st.info(f"**📖 Explanation:**\n\n{explanation}")
+    review = results.get_analysis(result, 'review')
+    if review is not None:
+        st.warning(f"**🔍 Review:**\n\n{review}")
+    improved = results.get_analysis(result, 'improve')
+    if improved is not None:
+        st.markdown("**⚡ Improved:**")
+        st.code(improved, language=language)
@@ -0,0 +1,141 @@
+"""
+Profiler Component for AI Code Generator
+Import in your main file: from components import profiler
+Use: profiler.start_rerun()                  # right after page.configure_page()
+     with profiler.section("sidebar"):
+         settings = sidebar.create_sidebar()
+     profiler.show_panel()                   # last thing in main.py
+
+Turned on with "⏱️ Profile Reruns" in the sidebar's Advanced Settings (or
+CODEGEN_PROFILE=1). Each rerun then records wall time per section, the size
+of st.session_state, and a cProfile of the whole rerun. The last
+CODEGEN_PROFILE_RUNS (default 5) profiles can be dumped as one pstats file.
+When profiling is off nothing is measured: each call only looks up the
+session's flag or its (absent) running profile.
+
+Elements sent per section are not counted: Streamlit has no public hook for
+the messages a script sends, and wrapping its internal queue is not worth
+the breakage on an upgrade. The cProfile shows which st.* calls ran.
+"""
+
+import contextlib
+import cProfile
+import io
+import os
+import pickle
+import pstats
+import time
+from collections import deque
+
+import streamlit as st
+
+PROFILE_RUNS = int(os.environ.get("CODEGEN_PROFILE_RUNS", 5))
+PROFILE_DIR = os.path.join(".codegen", "profiles")
+
+# Functions listed from the last rerun's profile
+TOP_FUNCTIONS = 15
+
+
+def is_enabled():
+    """Returns True when this session profiles its reruns"""
+    return st.session_state.get('profiling', os.environ.get("CODEGEN_PROFILE") == "1")
+
+
+def start_rerun():
+    """Begin measuring this rerun (no-op unless profiling is on)"""
+    # A rerun cut short (st.rerun, an exception) leaves its profiler running
+    leftover = st.session_state.pop('_profiler_run', None)
+    if leftover is not None:
+        leftover['profile'].disable()
+    if not is_enabled():
+        return
+
+    profile = cProfile.Profile()
+    st.session_state._profiler_run = {
+        'sections': [],
+        'started': time.perf_counter(),
+        'profile': profile
+    }
+    profile.enable()
+
+
+@contextlib.contextmanager
+def section(name):
+    """Time a block of the script as one row of the breakdown"""
+    run = st.session_state.get('_profiler_run')
+    if run is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        run['sections'].append({'section': name, 'ms': (time.perf_counter() - start) * 1000})
+
+
+def session_state_size():
+    """Returns (keys, approximate pickled bytes) of st.session_state"""
+    total = 0
+    keys = 0
+    for key in list(st.session_state.keys()):
+        if str(key).startswith("_profiler"):
+            continue
+        keys += 1
+        try:
+            total += len(pickle.dumps(st.session_state[key], protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            # Unpicklable values (widgets' callbacks, locks) are left out
+            pass
+    return keys, total
+
+
+def _top_functions(profile):
+    buffer = io.StringIO()
+    pstats.Stats(profile, stream=buffer).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+    return buffer.getvalue()
+
+
+def dump_profiles(profiles, session_id):
+    """Combine profiles into one pstats file and return its path"""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stats = pstats.Stats(profiles[0])
+    for profile in profiles[1:]:
+        stats.add(profile)
+    path = os.path.join(PROFILE_DIR, f"rerun-{session_id[:8]}-{time.strftime('%Y%m%d-%H%M%S')}.pstats")
+    stats.dump_stats(path)
+    return path
+
+
+def show_panel():
+    """Stop measuring and draw this rerun's breakdown (no-op unless profiling is on)"""
+    run = st.session_state.pop('_profiler_run', None)
+    if run is None:
+        return
+    run['profile'].disable()
+    total_ms = (time.perf_counter() - run['started']) * 1000
+
+    history = st.session_state.setdefault('_profiler_history', deque(maxlen=PROFILE_RUNS))
+    history.append(run['profile'])
+    keys, state_bytes = session_state_size()
+
+    with st.expander(f"⏱️ Rerun profile: {total_ms:.0f} ms", expanded=False):
+        rows = run['sections'] + [{'section': "total", 'ms': total_ms}]
+        st.dataframe(
+            [{'Section': row['section'], 'Wall time (ms)': round(row['ms'], 1)} for row in rows],
+            hide_index=True,
+            use_container_width=True
+        )
+        st.caption(f"session_state: {keys} keys, about {state_bytes / 1024:.1f} KB pickled")
+        st.code(_top_functions(run['profile']), language="text")
+
+        if st.button(f"💾 Dump last {len(history)} rerun(s) as pstats", key="_profiler_dump"):
+            path = dump_profiles(list(history), st.session_state.get('session_id', "session"))
+            with open(path, "rb") as f:
+                st.download_button(
+                    "⬇️ Download profile",
+                    data=f.read(),
+                    file_name=os.path.basename(path),
+                    mime="application/octet-stream",
+                    key="_profiler_download"
+                )
+            st.caption(f"Saved to {path} (open with python -m pstats or snakeviz)")
@@ -5,8 +5,11 @@ Import in your main file: import sidebar
 Use: settings = sidebar.create_sidebar()
 """
 
+import os
+import uuid
+
 import streamlit as st
-from datetime import datetime
+from codegen import analytics, blobs, cache, gateway, history, prompts, results, similar, warmup
 
 def get_file_extension(language):
     """Returns file extension for given programming language"""
@@ -31,12 +34,37 @@ def get_file_extension(language):
 
 def initialize_session_state():
     """Initialize all session state variables"""
-    if 'code_history' not in st.session_state:
-        st.session_state.code_history = []
-    if 'current_code' not in st.session_state:
-        st.session_state.current_code = ""
-    if 'favorite_prompts' not in st.session_state:
-        st.session_state.favorite_prompts = []
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    if 'current_result' not in st.session_state:
+        st.session_state.current_result = None
+    if 'history_page' not in st.session_state:
+        st.session_state.history_page = 0
+    if 'usage' not in st.session_state:
+        st.session_state.usage = analytics.new_session_counters()
+
+
+def current_user():
+    """Returns whose history to use: the logged-in user, else this session"""
+    if st.session_state.get('is_logged_in') and st.session_state.get('username'):
+        return st.session_state.username
+    return f"session:{st.session_state.session_id}"
+
+# Number of history entries shown per page in the sidebar
+HISTORY_PAGE_SIZE = 5
+
+# Maximum number of search results listed in the sidebar
+HISTORY_SEARCH_LIMIT = 10
+
+# Quick Templates (prompts.TEMPLATES) in the order and with the icons shown
+TEMPLATE_ICONS = {
+    "User Authentication": "🔐",
+    "Data Analysis": "📊",
+    "REST API": "🌐",
+    "File Handler": "📁",
+    "Algorithm": "🧮",
+    "Database CRUD": "🗄️"
+}
 
 def create_sidebar():
     """
@@ -143,7 +171,7 @@ def create_sidebar():
             settings['include_tests'] = st.checkbox(
                 "🧪 Unit Tests", 
                 value=False,
-                help="Generate unit tests"
+                help="Generate unit tests (run locally only if the server sets CODEGEN_RUN_TESTS=1)"
             )
         
         with col2:
@@ -195,13 +223,14 @@ def create_sidebar():
         
         with col1:
             if st.button("🔄 New Session", use_container_width=True, help="Start fresh"):
-                st.session_state.current_code = ""
+                st.session_state.current_result = None
+                blobs.get_store().release_session(st.session_state.session_id)
                 st.toast("✅ New session started!", icon="🔄")
         
         with col2:
             if st.button("🗑️ Clear History", use_container_width=True, help="Clear all history"):
-                st.session_state.code_history = []
-                st.session_state.favorite_prompts = []
+                history.get_store().clear(current_user())
+                st.session_state.history_page = 0
                 st.toast("✅ History cleared!", icon="🗑️")
         
         st.markdown("---")
@@ -209,30 +238,7 @@ def create_sidebar():
         # ========== GENERATION HISTORY ==========
         st.markdown("### 📚 Generation History")
         
-        if st.session_state.code_history:
-            st.caption(f"📊 Total: **{len(st.session_state.code_history)}** generations")
-            
-            # Show last 5 generations
-            for idx, item in enumerate(reversed(st.session_state.code_history[-5:])):
-                actual_idx = len(st.session_state.code_history) - idx
-                with st.expander(f"#{actual_idx}: {item['prompt'][:35]}...", expanded=False):
-                    st.caption(f"🔤 **Language:** {item['language']}")
-                    st.caption(f"📦 **Type:** {item['type']}")
-                    st.caption(f"🕒 **Time:** {item['timestamp']}")
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        if st.button(f"📂 Load", key=f"load_{actual_idx}", use_container_width=True):
-                            st.session_state.current_code = item['code']
-                            st.toast(f"✅ Loaded generation #{actual_idx}", icon="📂")
-                            st.rerun()
-                    with col2:
-                        if st.button(f"⭐ Save", key=f"save_{actual_idx}", use_container_width=True):
-                            if item not in st.session_state.favorite_prompts:
-                                st.session_state.favorite_prompts.append(item)
-                                st.toast("⭐ Added to favorites!", icon="⭐")
-        else:
-            st.info("🔍 No history yet\n\nGenerate some code to see it here!")
+        show_history()
         
         st.markdown("---")
         
@@ -243,13 +249,15 @@ def create_sidebar():
             "Export Format",
             ["Single File", "Markdown Document", "ZIP with Tests", 
              "Jupyter Notebook", "GitHub Gist Format"],
+            key="export_format",
             help="How to export the generated code"
         )
         
         settings['include_readme'] = st.checkbox(
             "📖 Include README", 
             value=False,
-            help="Generate README.md with the code"
+            key="include_readme",
+            help="Generate README.md with the code (Markdown, ZIP, Notebook and Gist formats)"
         )
         
         st.markdown("---")
@@ -257,30 +265,7 @@ def create_sidebar():
         # ========== STATISTICS ==========
         st.markdown("### 📊 Session Statistics")
         
-        col1, col2 = st.columns(2)
-        with col1:
-            st.metric(
-                "Generations", 
-                len(st.session_state.code_history),
-                help="Total code generated this session"
-            )
-        with col2:
-            if st.session_state.code_history:
-                last_lang = st.session_state.code_history[-1]['language']
-                st.metric(
-                    "Last Language", 
-                    last_lang[:8],
-                    help=f"Last used: {last_lang}"
-                )
-            else:
-                st.metric("Last Language", "N/A")
-        
-        # Most used language
-        if st.session_state.code_history:
-            languages = [item['language'] for item in st.session_state.code_history]
-            most_used = max(set(languages), key=languages.count)
-            count = languages.count(most_used)
-            st.caption(f"🏆 Most used: **{most_used}** ({count}x)")
+        show_statistics()
         
         st.markdown("---")
         
@@ -289,6 +274,7 @@ def create_sidebar():
             settings['model_version'] = st.selectbox(
                 "AI Model",
                 ["gemini-1.5-flash", "gemini-1.5-pro", "gemini-2.0-flash-exp"],
+                index=2,
                 help="Select AI model version"
             )
             
@@ -298,6 +284,45 @@ def create_sidebar():
                 help="Show code as it generates"
             )
             
+            settings['prefetch_actions'] = st.checkbox(
+                "Prefetch Actions", 
+                value=False,
+                help="Prepare Explain, Review and Improve in the background right after generating"
+            )
+            
+            settings['multi_file'] = st.checkbox(
+                "Multi-file Projects", 
+                value=True,
+                help="Plan Full Program and Component requests as several files generated in parallel"
+            )
+            
+            settings['validate_code'] = st.checkbox(
+                "Validate Code", 
+                value=True,
+                help="Check syntax locally (Python, SQL, JSON, HTML); the generated unit tests also run "
+                     "if the server sets CODEGEN_RUN_TESTS=1"
+            )
+            
+            settings['reuse_similar'] = st.checkbox(
+                "Reuse Similar Answers", 
+                value=False,
+                help="Answer a request that is worded differently but asks the same thing from an earlier "
+                     "generation. Off by default: a near-identical wording can still ask for something else"
+            )
+            
+            st.checkbox(
+                "⏱️ Profile Reruns", 
+                value=os.environ.get("CODEGEN_PROFILE") == "1",
+                key="profiling",
+                help="Time every part of the page on each rerun and keep cProfile data of the last few reruns"
+            )
+            
+            settings['hedge_requests'] = st.checkbox(
+                "Hedge Slow Requests", 
+                value=False,
+                help="Send a duplicate request when the model is slower than usual and keep the first answer (uses more quota; not with streaming)"
+            )
+            
             settings['safe_mode'] = st.checkbox(
                 "Safe Mode", 
                 value=True,
@@ -314,18 +339,19 @@ def create_sidebar():
         
         # ========== TEMPLATES ==========
         with st.expander("📋 Quick Templates"):
-            st.markdown("""
-            **Click to use:**
-            - 🔐 User Authentication
-            - 📊 Data Analysis Script
-            - 🌐 REST API Endpoint
-            - 📁 File I/O Handler
-            - 🧮 Algorithm Implementation
-            - 🗄️ Database CRUD Operations
-            """)
+            st.selectbox(
+                "Template",
+                list(TEMPLATE_ICONS),
+                format_func=lambda name: f"{TEMPLATE_ICONS[name]} {name}",
+                key="template_choice",
+                help="Pick a common task to start from"
+            )
             
-            if st.button("Load Template", use_container_width=True):
-                st.toast("Template feature coming soon!", icon="📋")
+            st.button("Load Template", use_container_width=True, on_click=_load_template)
+            
+            warmed = warmup.status()
+            if warmed['warmed'] or warmed['skipped']:
+                st.caption(f"⚡ Ready instantly with default settings in {', '.join(warmed['languages'])}")
         
         st.markdown("---")
         
@@ -361,9 +387,159 @@ def create_sidebar():
     return settings
 
 
+def _history_item(store, user, item, label):
+    """Renders one history entry with its Load / Save buttons"""
+    with st.expander(f"{label}: {item['prompt'][:35]}...", expanded=False):
+        st.caption(f"🔤 **Language:** {item['language']}")
+        st.caption(f"📦 **Type:** {item['type']}")
+        st.caption(f"🕒 **Time:** {item['timestamp']}")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button(f"📂 Load", key=f"load_{item['id']}", use_container_width=True):
+                entry = store.get(user, item['id'])
+                st.session_state.current_result = results.new_result(
+                    entry['code'],
+                    entry['prompt'],
+                    prompts.resolve_settings({'language': entry['language'], 'code_type': entry['type']}),
+                    session=st.session_state.session_id
+                )
+                st.toast(f"✅ Loaded generation {label}", icon="📂")
+                st.rerun()
+        with col2:
+            favorite_label = "🌟 Saved" if item['favorite'] else "⭐ Save"
+            if st.button(favorite_label, key=f"save_{item['id']}", use_container_width=True):
+                if store.toggle_favorite(user, item['id']):
+                    st.toast("⭐ Added to favorites!", icon="⭐")
+                else:
+                    st.toast("Removed from favorites", icon="⭐")
+                st.rerun(scope="fragment")
+
+
+@st.fragment
+def show_history():
+    """
+    Generation history panel
+
+    Runs as a fragment: searching, Save and paging only rerun this panel,
+    while Load reruns the whole app so the output panel picks up the code.
+    """
+    store = history.get_store()
+    user = current_user()
+    total = store.count(user)
+
+    if total:
+        query = st.text_input(
+            "🔎 Search history",
+            key="history_query",
+            placeholder="e.g. linked list python",
+            help="Searches prompts, generated code, language and type"
+        )
+
+        if query.strip():
+            matches = store.search(user, query, limit=HISTORY_SEARCH_LIMIT)
+            st.caption(f"🔎 **{len(matches)}** match{'es' if len(matches) != 1 else ''}")
+            for item in matches:
+                _history_item(store, user, item, f"🔎 {item['timestamp'][:10]}")
+            return
+
+        st.caption(f"📊 Total: **{total}** generations")
+    
+        # One page of summaries at a time; code is only read on Load
+        pages = (total + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE
+        page_no = min(st.session_state.history_page, pages - 1)
+        items = store.page(user, offset=page_no * HISTORY_PAGE_SIZE, limit=HISTORY_PAGE_SIZE)
+    
+        for idx, item in enumerate(items):
+            actual_idx = total - page_no * HISTORY_PAGE_SIZE - idx
+            _history_item(store, user, item, f"#{actual_idx}")
+    
+        if pages > 1:
+            col1, col2, col3 = st.columns([1, 2, 1])
+            with col1:
+                if st.button("◀", key="history_newer", disabled=page_no == 0, use_container_width=True):
+                    st.session_state.history_page = page_no - 1
+                    st.rerun(scope="fragment")
+            with col2:
+                st.caption(f"Page {page_no + 1} of {pages}")
+            with col3:
+                if st.button("▶", key="history_older", disabled=page_no >= pages - 1, use_container_width=True):
+                    st.session_state.history_page = page_no + 1
+                    st.rerun(scope="fragment")
+    else:
+        st.info("🔍 No history yet\n\nGenerate some code to see it here!")
+
+
+@st.fragment
+def show_statistics():
+    """Session statistics panel (fragment, independent of the other widgets)"""
+    # Running counters, updated once per generation by record_generation()
+    usage = st.session_state.usage
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric(
+            "Generations", 
+            usage['generations'],
+            help="Total code generated this session"
+        )
+    with col2:
+        if usage['last_language']:
+            last_lang = usage['last_language']
+            st.metric(
+                "Last Language", 
+                last_lang[:8],
+                help=f"Last used: {last_lang}"
+            )
+        else:
+            st.metric("Last Language", "N/A")
+    
+    # Most used language
+    if usage['languages']:
+        most_used, count = usage['languages'].most_common(1)[0]
+        st.caption(f"🏆 Most used: **{most_used}** ({count}x)")
+    
+    # Response cache (shared by all sessions)
+    cache_stats = cache.get_cache().stats()
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric(
+            "Cache Hits",
+            cache_stats['hits'],
+            help="Requests answered from the response cache"
+        )
+    with col2:
+        st.metric(
+            "Cache Misses",
+            cache_stats['misses'],
+            help="Requests sent to the AI model"
+        )
+    if cache_stats['hits'] or cache_stats['misses']:
+        st.caption(f"⚡ Hit rate: **{cache_stats['hit_rate']:.0%}** ({cache_stats['size']} cached)")
+    similar_stats = similar.get_index().stats()
+    if similar_stats['reused']:
+        st.caption(f"♻️ Similar requests reused: **{similar_stats['reused']}**")
+
+    # Shared request queue for the API key (all sessions)
+    queue_stats = gateway.get_gateway().stats()
+    st.caption(
+        f"🚦 Queue: **{queue_stats['queue_depth']}** waiting · "
+        f"avg wait {queue_stats['mean_wait']:.1f}s · "
+        f"{queue_stats['coalesced']} duplicate(s) shared"
+    )
+
+    # Shared result memory (all sessions)
+    blob_stats = blobs.get_store().stats()
+    if blob_stats['blobs']:
+        st.caption(
+            f"💾 Results in memory: **{blob_stats['stored_bytes'] / 1024:.0f} KB** "
+            f"(saved {blob_stats['saved_bytes'] / 1024:.0f} KB by compression and sharing)"
+        )
+
+
 def save_to_history(prompt, code, language, code_type):
     """
-    Save generated code to history
+    Save generated code to the persistent history store
     
     Args:
         prompt: The user's prompt
@@ -371,19 +547,32 @@ def save_to_history(prompt, code, language, code_type):
         language: Programming language
         code_type: Type of code generated
     """
-    history_item = {
-        'prompt': prompt,
-        'code': code,
-        'language': language,
-        'type': code_type,
-        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
-    
-    st.session_state.code_history.append(history_item)
+    initialize_session_state()
+    history.get_store().add(
+        user=current_user(),
+        session=st.session_state.session_id,
+        prompt=prompt,
+        code=code,
+        language=language,
+        code_type=code_type
+    )
+    st.session_state.history_page = 0
+
+
+def record_generation(language, code_type, model, latency, cached=False):
+    """
+    Count a generation in this session's and the server-wide statistics
     
-    # Keep only last 50 items to save memory
-    if len(st.session_state.code_history) > 50:
-        st.session_state.code_history = st.session_state.code_history[-50:]
+    Args:
+        language: Programming language
+        code_type: Type of code generated
+        model: Model name that served it
+        latency: Seconds until the response was complete
+        cached: Whether the response cache answered it
+    """
+    initialize_session_state()
+    analytics.update_session_counters(st.session_state.usage, language, code_type)
+    analytics.get_analytics().record(language, code_type, model, latency, cached=cached)
 
 
 def get_template_prompt(template_name):
@@ -396,12 +585,10 @@ def get_template_prompt(template_name):
     Returns:
         String with the template prompt
     """
-    templates = {
-        "User Authentication": "Create a user authentication system with password hashing, login, and session management",
-        "Data Analysis": "Create a script to read CSV data, perform statistical analysis, and create visualizations",
-        "REST API": "Build a REST API endpoint with GET, POST, PUT, DELETE methods and error handling",
-        "File Handler": "Create a file I/O handler class that can read, write, and process different file formats",
-        "Algorithm": "Implement an efficient sorting algorithm with time complexity analysis",
-        "Database CRUD": "Create a database handler class with Create, Read, Update, Delete operations"
-    }
-    return templates.get(template_name, "")
\ No newline at end of file
+    return prompts.TEMPLATES.get(template_name, "")
+
+
+def _load_template():
+    """Load Template callback: fills the requirement box before it is drawn"""
+    st.session_state.prompt_input = get_template_prompt(st.session_state.template_choice)
+    st.toast(f"✅ Loaded the {st.session_state.template_choice} template", icon="📋")
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""
+Style Bundle Component for AI Code Generator
+Import in your main file: from components import styles
+Use: styles.inject()   # once per run, right after page.show_page()
+
+Collects the CSS of every component into one deduplicated, minified
+stylesheet that is built once per process. Streamlit drops any element a
+rerun does not emit again, so the bundle is still sent on every run, but as
+a single small element; .streamlit/config.toml lowers the message cache
+threshold so repeat runs send only a reference to it.
+"""
+
+import functools
+import re
+
+import streamlit as st
+from components import header, page
+
+# App-level styles
+APP_CSS = """
+/* Remove default padding */
+.main > div {
+    padding-top: 0rem;
+}
+
+/* Info cards styling */
+.info-card {
+    background: linear-gradient(135deg, #667eea15 0%, #764ba215 100%);
+    padding: 1rem;
+    border-radius: 10px;
+    border-left: 4px solid #667eea;
+    margin: 0.5rem 0;
+}
+
+/* Main title styling */
+.main-title {
+    font-size: 2.5rem;
+    font-weight: 700;
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    -webkit-background-clip: text;
+    -webkit-text-fill-color: transparent;
+    text-align: center;
+    margin: 2rem 0 1rem 0;
+}
+
+.subtitle {
+    text-align: center;
+    color: #666;
+    font-size: 1.2rem;
+    margin-bottom: 2rem;
+}
+
+/* Button styling */
+.stButton>button {
+    border-radius: 10px;
+    font-weight: 600;
+    transition: all 0.3s ease;
+}
+
+/* Code container */
+.code-container {
+    background: #1e1e1e;
+    border-radius: 10px;
+    padding: 1rem;
+    margin: 1rem 0;
+}
+"""
+
+
+def minify_css(css):
+    """Strip comments and insignificant whitespace from a stylesheet"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};:,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def split_rules(css):
+    """Split minified CSS into its top-level rules (@media blocks stay whole)"""
+    rules = []
+    depth = 0
+    start = 0
+    for index, char in enumerate(css):
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                rules.append(css[start:index + 1])
+                start = index + 1
+    return rules
+
+
+@functools.lru_cache(maxsize=1)
+def bundle():
+    """
+    Build the stylesheet for the whole app
+
+    Returns:
+        Minified CSS with exact duplicate rules removed (first one kept)
+    """
+    rules = []
+    for sheet in (page.PAGE_CSS, header.HEADER_CSS, APP_CSS):
+        rules.extend(split_rules(minify_css(sheet)))
+    return "".join(dict.fromkeys(rules))
+
+
+def inject():
+    """Emits the bundled stylesheet as a single element"""
+    st.markdown(f"<style>{bundle()}</style>", unsafe_allow_html=True)
@@ -1,81 +1,43 @@
 #Import Important Libraries
 import streamlit as st
-import google.generativeai as genai
 import os
-from components import header, sidebar, footer, page
+from components import header, sidebar, footer, page, output, profiler, styles
+from codegen import backends, cache, extract, followups, gateway, project, prompts, resilience, results, similar, warmup
+
+# Page config must be the first Streamlit command of every run
+page.configure_page()
+
+# Per-section timings for this rerun when "Profile Reruns" is on
+profiler.start_rerun()
+
 # Load API key
 
 # Get API key from Streamlit secrets
 api_key = st.secrets["GOOGLE_API_KEY"]
 
-# Configure API
-genai.configure(api_key=api_key)
+# Shared model backend (configured once per process, reused across reruns)
+backend = backends.get_backend(api_key)
+
+# Pre-generate the Quick Templates in the background (once per process)
+warmup.start(backend)
 
 # DEBUG: Verify it's loaded
 st.sidebar.success(f"✅ API Key loaded: {api_key[:10]}...")
 
-# Initialize model
-model = genai.GenerativeModel('gemini-2.0-flash-exp')
 
-
-settings=page.show_page()
-# Custom CSS for better UI
-st.markdown("""
-<style>
-    /* Remove default padding */
-    .main > div {
-        padding-top: 0rem;
-    }
-    
-    /* Info cards styling */
-    .info-card {
-        background: linear-gradient(135deg, #667eea15 0%, #764ba215 100%);
-        padding: 1rem;
-        border-radius: 10px;
-        border-left: 4px solid #667eea;
-        margin: 0.5rem 0;
-    }
-    
-    /* Main title styling */
-    .main-title {
-        font-size: 2.5rem;
-        font-weight: 700;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        text-align: center;
-        margin: 2rem 0 1rem 0;
-    }
-    
-    .subtitle {
-        text-align: center;
-        color: #666;
-        font-size: 1.2rem;
-        margin-bottom: 2rem;
-    }
-    
-    /* Button styling */
-    .stButton>button {
-        border-radius: 10px;
-        font-weight: 600;
-        transition: all 0.3s ease;
-    }
-    
-    /* Code container */
-    .code-container {
-        background: #1e1e1e;
-        border-radius: 10px;
-        padding: 1rem;
-        margin: 1rem 0;
-    }
-</style>
-""", unsafe_allow_html=True)
+with profiler.section("page"):
+    page.show_page()
+# Custom CSS for better UI (built once, one element per rerun)
+with profiler.section("styles"):
+    styles.inject()
 
 # ========== HEADER ==========
-current_page = header.create_header()
+with profiler.section("header"):
+    current_page = header.create_header()
 
 # ========== SIDEBAR ==========
-settings = sidebar.create_sidebar()
+with profiler.section("sidebar"):
+    settings = sidebar.create_sidebar()
 
 # ========== MAIN CONTENT AREA ==========
 
@@ -112,26 +74,6 @@ if current_page == 'Chatbot' or current_page == 'Home':
     
     st.markdown("<br>", unsafe_allow_html=True)
     
-import streamlit as st
-import google.generativeai as genai
-
-# ========== DEFAULT SETTINGS ==========
-settings = {
-    "language": "Python",
-    "code_type": "Function",
-    "framework": "None",
-    "libraries": [],
-    "include_comments": True,
-    "include_docstrings": False,
-    "include_examples": False,
-    "include_tests": False,
-    "error_handling": True,
-    "type_hints": False,
-    "optimize_code": True,
-    "logging": False,
-    "code_style": "PEP8"
-}
-
 # ========== UI SECTION ==========
 
 st.markdown("<p style='font-size:20px;'>.</p>", unsafe_allow_html=True)
@@ -139,7 +81,7 @@ st.markdown("<p style='font-size:20px;'>.</p>", unsafe_allow_html=True)
 # Text area input
 st.markdown("### 📝 Describe Your Code Requirement")
 
-prompt = st.text_area(label="")
+prompt = st.text_area(label="", key="prompt_input")
 
 # GENERATE BUTTON
 st.markdown("<br>", unsafe_allow_html=True)
@@ -155,129 +97,208 @@ with col2:
 st.markdown("---")
 
 # ========== CODE GENERATION LOGIC ==========
-if generate_btn:
-    if prompt.strip() == "":
-        st.warning("⚠️ Please describe what code you want to generate!")
-    else:
-        with st.spinner("✨ Generating your code... This may take a few seconds"):
+# "Generate fresh" in the output panel asks for a rerun that skips both caches
+force_fresh = st.session_state.pop('regenerate', False)
+
+if generate_btn or force_fresh:
+    with profiler.section("generation"):
+        if prompt.strip() == "":
+            st.warning("⚠️ Please describe what code you want to generate!")
+        else:
             try:
-                # Initialize model
-                model = genai.GenerativeModel("gemini-2.0-flash-exp")
-
-                # Build full prompt
-                full_prompt = f"""Generate {settings['language']} code for the following requirement:
-
-{prompt}
-
-Code Type: {settings['code_type']}"""
-
-                if settings["framework"] != "None":
-                    full_prompt += f"\nFramework: {settings['framework']}"
-
-                if settings["libraries"]:
-                    full_prompt += f"\nRequired Libraries: {', '.join(settings['libraries'])}"
-
-                # Build options dynamically
-                options = []
-                if settings["include_comments"]: options.append("detailed inline comments")
-                if settings["include_docstrings"]: options.append("comprehensive docstrings")
-                if settings["include_examples"]: options.append("usage examples")
-                if settings["include_tests"]: options.append("unit tests")
-                if settings["error_handling"]: options.append("proper error handling")
-                if settings["type_hints"]: options.append("type hints/annotations")
-                if settings["optimize_code"]: options.append("performance optimizations")
-                if settings["logging"]: options.append("logging statements")
-
-                if options:
-                    full_prompt += "\n\nInclude:\n- " + "\n- ".join(options)
-
-                # Style Guide
-                if settings["code_style"] not in ["None", "Auto-detect"]:
-                    full_prompt += f"\n\nFollow {settings['code_style']} style guidelines."
-
-                full_prompt += "\n\nProvide clean, production-ready, well-documented code."
+                # Build full prompt and generation config from the sidebar settings
+                built = prompts.build_prompt(prompt, settings)
+                full_prompt = built['text']
+                model_name = settings['model_version']
+                if built['trimmed']:
+                    st.warning(f"✂️ Requirement trimmed to fit the {settings['max_tokens']}-token budget")
+
+                # Generate code (streamed into the code area when enabled)
+                code_area = st.empty()
+                extractor = extract.FenceExtractor()
+                show_chunk = output.live_code(code_area, extractor, settings['language'])
+
+                response_cache = cache.get_cache()
+                cache_key = cache.make_key(full_prompt, model_name, built['generation_config'])
+                cached_code = None if force_fresh else response_cache.get(cache_key)
+
+                # Near-duplicate of an earlier request with the same settings
+                similar_match = None
+                reuse_similar = settings['reuse_similar'] and similar.is_enabled()
+                if cached_code is None and not force_fresh and reuse_similar \
+                        and not project.is_project_request(settings):
+                    similar_match = similar.get_index().lookup(prompt, settings)
+
+                # Shared request layer: coalesces duplicates, enforces the key's limits
+                gw = gateway.get_gateway()
+                queue_note = st.empty()
+                queue_depth = gw.stats()['queue_depth']
+                if cached_code is None and queue_depth:
+                    queue_note.info(f"🚦 Busy right now: {queue_depth} request(s) queued ahead of yours")
+
+                # Hedged attempts and project files run on worker threads, which
+                # cannot draw on the page or read st.session_state
+                hedging = settings['hedge_requests'] and not settings['streaming']
+                session_id = st.session_state.session_id
+
+                def call_model(model, is_hedge):
+                    return gw.generate(
+                        backend,
+                        full_prompt,
+                        model,
+                        built['generation_config'],
+                        session=session_id,
+                        prompt_tokens=built['prompt_tokens'],
+                        stream=settings['streaming'],
+                        on_chunk=None if hedging else show_chunk,
+                        coalesce=not is_hedge
+                    )
 
-                # Generate code
-                response = model.generate_content(full_prompt)
+                def cached_answer(model):
+                    key = cache.make_key(full_prompt, model, built['generation_config'])
+                    return response_cache.get(key, allow_stale=True, counted=False)
+
+                # Full Program / Component: plan the files, then generate them in parallel
+                project_files = None
+                if cached_code is None and project.is_project_request(settings):
+                    def call_part(part_prompt, part_config, part_tokens):
+                        return resilience.generate(
+                            lambda model, is_hedge: gw.generate(
+                                backend,
+                                part_prompt,
+                                model,
+                                part_config,
+                                session=session_id,
+                                prompt_tokens=part_tokens,
+                                coalesce=not is_hedge
+                            ),
+                            model_name,
+                            hedge=settings['hedge_requests']
+                        )
 
-                # Handle Gemini output safely
-                generated_code = getattr(response, 'text', None)
-                if not generated_code:
+                    progress = st.progress(0.0, text="🗺️ Planning the project files...")
                     try:
-                        generated_code = response.candidates[0].content.parts[0].text
-                    except Exception:
-                        generated_code = "⚠️ No code was returned. Please try again."
+                        planned = project.generate_project(
+                            call_part,
+                            prompt,
+                            settings,
+                            on_file=lambda path, done, total: progress.progress(
+                                done / total, text=f"📄 Generated {path} ({done}/{total})"
+                            )
+                        )
+                        project_files = planned['files']
+                        for path, error in planned['failed'].items():
+                            st.warning(f"⚠️ Could not generate {path}: {error}")
+                    except project.ProjectPlanError:
+                        # No usable plan: generate the whole thing in one call instead
+                        project_files = None
+                    progress.empty()
+
+                if cached_code is not None:
+                    result = {'text': cached_code, 'cached': True, 'fallback': False, 'ttft': 0.0, 'latency': 0.0}
+                elif similar_match is not None:
+                    result = {
+                        'text': similar_match['text'],
+                        'cached': True,
+                        'fallback': False,
+                        'ttft': 0.0,
+                        'latency': 0.0,
+                        'similar': similar_match['similarity'],
+                        'similar_prompt': similar_match['prompt']
+                    }
+                elif project_files:
+                    result = {
+                        'text': project.combine(project_files, settings['language']),
+                        'cached': False,
+                        'latency': planned['latency'],
+                        'plan_latency': planned['plan_latency'],
+                        'file_count': len(project_files),
+                        'served_by': model_name
+                    }
+                else:
+                    # Retries, model fallbacks, then a cached answer; hedging can't share a stream
+                    with st.spinner("✨ Generating your code... This may take a few seconds"):
+                        result = resilience.generate(
+                            call_model,
+                            model_name,
+                            cached=cached_answer,
+                            hedge=hedging
+                        )
+                queue_note.empty()
+
+                if cached_code is None and similar_match is None and not project_files \
+                        and result['text'] and result['tier'] != "cache":
+                    served_key = cache.make_key(full_prompt, result['served_by'], built['generation_config'])
+                    response_cache.set(served_key, result['text'])
+                    if reuse_similar:
+                        similar.get_index().add(prompt, settings, result['text'])
+
+                # Split the answer into the code file, other code blocks and prose
+                if project_files:
+                    parts = {'code': result['text'], 'extras': [], 'notes': ""}
+                elif not result.get('fallback') and extractor.consumed == len(result['text']):
+                    parts = extract.split_output(extractor.finish(), settings['language'])
+                else:
+                    parts = extract.split_output(extract.extract(result['text']), settings['language'])
+                generated_code = parts['code'] if parts['code'].strip() else "⚠️ No code was returned. Please try again."
+
+                # Save to history
+                sidebar.save_to_history(
+                    prompt=prompt[:100],
+                    code=generated_code,
+                    language=settings['language'],
+                    code_type=settings['code_type']
+                )
+
+                # Update the running statistics
+                sidebar.record_generation(
+                    language=settings['language'],
+                    code_type=settings['code_type'],
+                    model=result.get('served_by', model_name),
+                    latency=result['latency'],
+                    cached=bool(result.get('cached'))
+                )
+
+                # Store in session; the output panel below draws it on every rerun
+                code_area.empty()
+                output.set_result(results.new_result(
+                    generated_code,
+                    prompt,
+                    settings,
+                    stats={key: result.get(key) for key in ('ttft', 'latency', 'cached', 'fallback', 'queue_wait', 'coalesced', 'tier', 'served_by', 'plan_latency', 'file_count', 'similar', 'similar_prompt')},
+                    session=session_id,
+                    files=project_files,
+                    extras=parts['extras'],
+                    notes=parts['notes']
+                ))
+
+                # Syntax checks and tests run locally while the page finishes
+                output.start_validation(output.get_result(), generated_code)
+
+                # Start Explain / Review / Improve in the background
+                if settings['prefetch_actions'] and result['text']:
+                    followups.prefetch(backend, model_name, generated_code, built['generation_config'])
 
-                # Display code
-                st.success("✅ Code generated successfully!")
-                st.code(generated_code, language=settings["language"].lower())
+                st.success("🎉 Code generated successfully!")
 
-            except Exception as e:
-                st.error(f"❌ An error occurred while generating code: {str(e)}")
+            except prompts.PromptTooLarge as e:
+                st.warning(f"⚠️ {e}")
 
-                    
-                    # Save to history
-                sidebar.save_to_history(
-                        prompt=prompt[:100],
-                        code=generated_code,
-                        language=settings['language'],
-                        code_type=settings['code_type']
-                    )
-                    
-                    # Store in session
-                st.session_state.current_code = generated_code
-                    
-                    # Success
-                st.success("🎉 Code generated successfully!")
-                    
-                    # Display code
-                st.markdown("### 📄 Generated Code")
-                st.code(generated_code, language=settings['language'].lower(), line_numbers=True)
-                    
-                    # Action Buttons
-                st.markdown("#### 🔧 Actions")
-                col1, col2, col3, col4, col5 = st.columns(5)
-                    
-                with col1:
-                        file_ext = sidebar.get_file_extension(settings['language'])
-                        st.download_button(
-                            label="⬇️ Download",
-                            data=generated_code,
-                            file_name=f"code.{file_ext}",
-                            mime="text/plain",
-                            use_container_width=True
-                        )
-                    
-                with col2:
-                        if st.button("📋 Copy", use_container_width=True):
-                            st.toast("✅ Code copied!", icon="📋")
-                    
-                with col3:
-                        if st.button("🧠 Explain", use_container_width=True):
-                            with st.spinner("Generating explanation..."):
-                                explain = model.generate_content(f"Explain this code simply:\n\n{generated_code}")
-                                st.info(f"**📖 Explanation:**\n\n{explain.text}")
-                    
-                with col4:
-                        if st.button("🔍 Review", use_container_width=True):
-                            with st.spinner("Reviewing..."):
-                                review = model.generate_content(f"Review this code for quality, bugs, and improvements:\n\n{generated_code}")
-                                st.warning(f"**🔍 Review:**\n\n{review.text}")
-                    
-                with col5:
-                        if st.button("⚡ Improve", use_container_width=True):
-                            with st.spinner("Improving..."):
-                                improved = model.generate_content(f"Improve this code:\n\n{generated_code}")
-                                st.markdown("**⚡ Improved:**")
-                                st.code(improved.text, language=settings['language'].lower())
-                    
             except Exception as e:
-                    st.error(f"❌ Error: {str(e)}")
-                    st.info("💡 **Tips:**\n- Check your internet connection\n- Verify API key is valid\n- Try simplifying your prompt")
+                output.show_error(e)
 
 elif current_page != 'Home' and current_page != 'Chatbot':
     # Show other pages
-    header.render_page_content(current_page)
+    with profiler.section("page content"):
+        header.render_page_content(current_page)
+
+# ========== OUTPUT PANEL ==========
+with profiler.section("output"):
+    output.show_output()
 
 # ========== FOOTER ==========
-footer.show_footer()
\ No newline at end of file
+with profiler.section("footer"):
+    footer.show_footer()
+
+# ========== PROFILER ==========
+profiler.show_panel()
\ No newline at end of file
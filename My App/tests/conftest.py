@@ -0,0 +1,66 @@
+"""
+Shared fixtures for the AI Code Generator tests
+Run from the "My App" folder: python -m pytest tests
+
+Everything runs offline against backends.StubBackend. Each test gets its own
+working folder and fresh process-wide singletons (backend, gateway, caches,
+history), so no state leaks between tests.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+# No paid or background model calls from any test
+os.environ["CODEGEN_BACKEND"] = "stub"
+os.environ["CODEGEN_WARMUP"] = "0"
+
+from codegen import backends, blobs, cache, gateway, history, similar
+
+MAIN_SCRIPT = os.path.join(APP_DIR, "main.py")
+
+# Files the planner of project_responder() asks for
+PROJECT_FILES = ("app/models.py", "app/main.py")
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(tmp_path, monkeypatch):
+    """Run in an empty folder with new singletons"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("CODEGEN_HISTORY_DB", str(tmp_path / "history.db"))
+    monkeypatch.delenv("CODEGEN_CACHE_DB", raising=False)
+    for module, name in ((backends, "_backend"), (blobs, "_store"), (cache, "_cache"),
+                         (gateway, "_gateway"), (history, "_store"), (similar, "_index")):
+        monkeypatch.setattr(module, name, None)
+    yield
+
+
+def project_responder(prompt, model_name):
+    """Stub answers for a planned project: a manifest, then one fenced file per call"""
+    if "Reply with JSON only" in prompt:
+        return json.dumps({'files': [
+            {'path': path, 'purpose': f"part {i}", 'interface': ""} for i, path in enumerate(PROJECT_FILES)
+        ]})
+    for path in PROJECT_FILES:
+        if f"Write ONLY the file `{path}`" in prompt:
+            return f"Here is the file.\n```python\n# contents of {path}\nVALUE = 1\n```\n"
+    return "```python\ndef single_call():\n    return 1\n```\n"
+
+
+@pytest.fixture
+def app_test():
+    """AppTest of main.py with the stub backend (skipped without Streamlit)"""
+    testing = pytest.importorskip("streamlit.testing.v1")
+
+    def create(backend):
+        backends.set_backend(backend)
+        at = testing.AppTest.from_file(MAIN_SCRIPT, default_timeout=30)
+        at.secrets["GOOGLE_API_KEY"] = "test-offline-key"
+        return at
+
+    return create
@@ -0,0 +1,60 @@
+"""Tests for codegen.analytics: totals, the latency histogram and the per-minute ring buffers"""
+
+from codegen import analytics
+
+# A fixed minute boundary, so tests never straddle a real one
+T0 = 1_700_000_040.0
+
+
+def test_latency_percentiles_use_bucket_upper_bounds():
+    stats = analytics.Analytics()
+    for latency in (0.05, 0.3, 0.3, 3.0):
+        stats.record("Python", "Function", "m", latency, now=T0)
+    assert stats.percentile(50) == 0.5
+    assert stats.percentile(99) == 4.0
+    assert analytics.Analytics().percentile(50) is None
+
+
+def test_cache_hits_are_counted_but_kept_out_of_latency():
+    stats = analytics.Analytics()
+    stats.record("Python", "Function", "m", 3.0, now=T0)
+    for _ in range(5):
+        stats.record("Python", "Function", "m", 0.0, cached=True, now=T0)
+    data = stats.snapshot()
+    assert data['total'] == 6 and data['cached'] == 5
+    assert data['mean_latency'] == 3.0
+    assert stats.percentile(50) == 4.0
+    counts, latencies = stats.per_minute(now=T0)
+    assert counts[-1] == 6 and latencies[-1] == 3.0
+
+
+def test_minutes_of_only_cache_hits_have_no_latency():
+    stats = analytics.Analytics(window_minutes=3)
+    stats.record("Python", "Function", "m", 0.0, cached=True, now=T0)
+    assert stats.per_minute(now=T0) == ([0, 0, 1], [None, None, None])
+    assert stats.snapshot()['mean_latency'] is None
+
+
+def test_ring_buffer_recycles_slots_and_ignores_scrolled_out_minutes():
+    stats = analytics.Analytics(window_minutes=3)
+    stats.record("Go", "Script", "m", 1.0, now=T0)
+    stats.record("Go", "Script", "m", 3.0, now=T0)
+    stats.record("Go", "Script", "m", 2.0, now=T0 + 60)
+    assert stats.per_minute(now=T0 + 60) == ([0, 2, 1], [None, 2.0, 2.0])
+
+    # Three minutes later the first minute's slot is reused and its counts are gone
+    stats.record("Go", "Script", "m", 4.0, now=T0 + 180)
+    assert stats.per_minute(now=T0 + 180) == ([1, 0, 1], [2.0, None, 4.0])
+
+    # A late sample for a minute that has left the window only hits the totals
+    stats.record("Go", "Script", "m", 1.0, now=T0)
+    assert stats.per_minute(now=T0 + 180)[0] == [1, 0, 1]
+    assert stats.total == 5
+
+
+def test_session_counters():
+    counters = analytics.new_session_counters()
+    analytics.update_session_counters(counters, "Python", "Class")
+    analytics.update_session_counters(counters, "Go", "Class")
+    assert counters['generations'] == 2 and counters['last_language'] == "Go"
+    assert counters['code_types']['Class'] == 2
@@ -0,0 +1,66 @@
+"""Tests for codegen.batch: reading jobs, running them and resuming a cut-short run"""
+
+import json
+
+from codegen import backends, batch
+
+
+def write_lines(path, lines):
+    path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+
+
+def read_records(path, skip=0):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()[skip:]]
+
+
+def test_read_jobs_merges_top_level_and_nested_settings(tmp_path):
+    source = tmp_path / "jobs.jsonl"
+    write_lines(source, [
+        json.dumps({'id': "a", 'prompt': "sort a list", 'language': "Go"}),
+        "",
+        json.dumps({'prompt': "parse json", 'settings': {'temperature': 0.2}}),
+    ])
+    jobs = batch.read_jobs(str(source))
+    assert [(job_id, prompt) for job_id, prompt, _ in jobs] == [("a", "sort a list"), ("3", "parse json")]
+    assert jobs[0][2]['language'] == "Go"
+    assert jobs[1][2]['temperature'] == 0.2
+
+
+def test_completed_ids_skips_failures_and_torn_lines(tmp_path):
+    output = tmp_path / "out.jsonl"
+    write_lines(output, [
+        json.dumps({'id': "a", 'ok': True}),
+        json.dumps({'id': "b", 'ok': False}),
+        '{"id": "c", "ok": tr',
+    ])
+    assert batch.completed_ids(str(output)) == {"a"}
+    assert batch.completed_ids(str(tmp_path / "missing.jsonl")) == set()
+
+
+def test_rerun_only_generates_unfinished_jobs(tmp_path, capsys):
+    source = tmp_path / "jobs.jsonl"
+    output = tmp_path / "out.jsonl"
+    write_lines(source, [json.dumps({'id': job_id, 'prompt': f"task {job_id}"}) for job_id in "abc"])
+    # An earlier run finished "a", failed "b" and was killed while writing "c"
+    write_lines(output, [
+        json.dumps({'id': "a", 'ok': True, 'code': "done"}),
+        json.dumps({'id': "b", 'ok': False, 'error': "boom"}),
+        '{"id": "c", "ok"',
+    ])
+    prompts_seen = []
+
+    def responder(prompt, model_name):
+        prompts_seen.append(prompt)
+        return "```python\ndef f():\n    return 1\n```\n"
+
+    backends.set_backend(backends.StubBackend(responder=responder))
+    assert batch.main([str(source), "-o", str(output), "--workers", "2"]) == 0
+
+    assert "Resuming: 1 already completed" in capsys.readouterr().out
+    assert sorted(prompt.split("\n\n")[1].splitlines()[0] for prompt in prompts_seen) == ["task b", "task c"]
+    assert batch.completed_ids(str(output)) == {"a", "b", "c"}
+    # Appended after the three lines already in the file
+    finished = read_records(output, skip=3)
+    assert sorted(record['id'] for record in finished) == ["b", "c"]
+    assert [record['ok'] for record in finished] == [True, True]
+    assert all(record['code'].strip() == "def f():\n    return 1" for record in finished)
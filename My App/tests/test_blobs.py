@@ -0,0 +1,47 @@
+"""Tests for codegen.blobs: sharing, budgets and session release"""
+
+import os
+
+from codegen import blobs
+
+
+def test_identical_text_is_stored_once():
+    store = blobs.BlobStore()
+    first = store.put("print('hi')\n" * 100, session="a")
+    second = store.put("print('hi')\n" * 100, session="b")
+    assert first == second
+    stats = store.stats()
+    assert stats['blobs'] == 1
+    assert stats['saved_bytes'] > 0
+    assert store.get(first) == "print('hi')\n" * 100
+
+
+def test_session_budget_forgets_oldest_references():
+    store = blobs.BlobStore(session_budget=1500)
+    ids = [store.put(os.urandom(400).hex(), session="a") for _ in range(5)]
+    assert store.get(ids[0]) is None  # only that session held it
+    assert store.get(ids[-1]) is not None
+    assert store._session_bytes["a"] == sum(store._sessions["a"].values()) <= 1500
+
+
+def test_release_frees_blobs_no_one_else_holds():
+    store = blobs.BlobStore()
+    own = store.put("only mine", session="a")
+    shared = store.put("shared", session="a")
+    store.put("shared", session="b")
+
+    store.release_session("a")
+
+    assert store.get(own) is None
+    assert store.get(shared) == "shared"
+    assert store.stats()['sessions'] == 1
+    store.release_session("b")
+    assert store.stats()['blobs'] == 0 and store.stats()['stored_bytes'] == 0
+
+
+def test_global_budget_evicts_least_recently_used():
+    store = blobs.BlobStore(global_budget=1500)
+    ids = [store.put(os.urandom(500).hex()) for _ in range(4)]
+    assert store.get(ids[0]) is None
+    assert store.get(ids[-1]) is not None
+    assert store.stats()['stored_bytes'] <= 1500
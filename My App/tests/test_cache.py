@@ -0,0 +1,78 @@
+"""Tests for codegen.cache: keys, TTL, stale answers, LRU bound and the SQLite tier"""
+
+from codegen import cache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_make_key_ignores_insignificant_whitespace():
+    assert cache.make_key("sort  a list\n", "m") == cache.make_key("  sort a list", "m")
+    assert cache.make_key("sort a list", "m") != cache.make_key("sort a list", "other")
+    assert cache.make_key("p", "m", {'temperature': 0.1}) != cache.make_key("p", "m", {'temperature': 0.2})
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "time", clock)
+    responses = cache.ResponseCache(ttl=60)
+    responses.set("k", "answer")
+    clock.now += 59
+    assert responses.get("k") == "answer"
+    clock.now += 2
+    assert responses.get("k") is None
+    assert responses.stats()['misses'] == 1
+
+
+def test_expired_entries_stay_as_last_resort_answers(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "time", clock)
+    responses = cache.ResponseCache(ttl=60)
+    responses.set("k", "answer")
+    clock.now += 120
+    # A normal lookup misses but must not throw the stale answer away
+    assert responses.get("k") is None
+    assert responses.get("k", allow_stale=True, counted=False) == "answer"
+    assert responses.get("k") is None
+
+
+def test_expired_rows_survive_a_restart_for_stale_lookups(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "time", clock)
+    path = str(tmp_path / "cache.db")
+    cache.ResponseCache(ttl=60, db_path=path).set("k", "answer")
+    clock.now += 120
+    restarted = cache.ResponseCache(ttl=60, db_path=path)
+    assert restarted.get("k") is None
+    assert restarted.get("k", allow_stale=True) == "answer"
+
+
+def test_uncounted_lookups_leave_the_hit_rate_alone():
+    responses = cache.ResponseCache()
+    responses.set("k", "answer")
+    assert responses.get("k") == "answer"
+    assert responses.get("k", counted=False) == "answer"
+    assert responses.get("missing", allow_stale=True, counted=False) is None
+    stats = responses.stats()
+    assert (stats['hits'], stats['misses'], stats['hit_rate']) == (1, 0, 1.0)
+
+
+def test_lru_bound():
+    responses = cache.ResponseCache(max_entries=2)
+    responses.set("a", "1")
+    responses.set("b", "2")
+    responses.get("a")
+    responses.set("c", "3")
+    assert responses.get("b") is None
+    assert responses.get("a") == "1" and responses.get("c") == "3"
+
+
+def test_sqlite_tier_survives_a_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache.ResponseCache(db_path=path).set("k", "answer")
+    assert cache.ResponseCache(db_path=path).get("k") == "answer"
@@ -0,0 +1,77 @@
+"""Tests for codegen.exporters: the export formats and their cache keys"""
+
+import io
+import json
+import os
+import subprocess
+import sys
+import zipfile
+
+from codegen import exporters, prompts, results
+
+CODE = "def add(a, b):\n    return a + b\n"
+
+
+def new_result(prompt="Add two numbers", code=CODE, **settings):
+    return results.new_result(code, prompt, prompts.resolve_settings(settings), session="s")
+
+
+def test_zip_contains_code_tests_and_readme():
+    artifact = exporters.get_artifact(new_result(), CODE, "ZIP with Tests", "py", include_readme=True)
+    names = zipfile.ZipFile(io.BytesIO(artifact['data'])).namelist()
+    assert "project/code.py" in names and "project/README.md" in names
+    assert any(name.startswith("project/tests/") for name in names)
+
+
+def test_notebook_is_valid_nbformat_4():
+    artifact = exporters.get_artifact(new_result(), CODE, "Jupyter Notebook", "py")
+    notebook = json.loads(artifact['data'])
+    assert notebook['nbformat'] == 4
+    assert any(CODE.strip() in "".join(cell['source']) for cell in notebook['cells'] if cell['cell_type'] == "code")
+
+
+def test_same_code_different_prompt_gets_its_own_artifact():
+    first = new_result("Add two numbers")
+    second = new_result("Sum a pair of integers")
+    assert first['code_id'] == second['code_id']
+    markdown = [
+        exporters.get_artifact(result, CODE, "Markdown Document", "py", include_readme=True)['data']
+        for result in (first, second)
+    ]
+    assert b"Add two numbers" in markdown[0] and b"Sum a pair" not in markdown[0]
+    assert b"Sum a pair of integers" in markdown[1]
+
+
+def test_built_artifacts_are_reused():
+    result = new_result()
+    assert exporters.peek(result, "GitHub Gist Format", "py") is None
+    built = exporters.get_artifact(result, CODE, "GitHub Gist Format", "py")
+    assert exporters.peek(result, "GitHub Gist Format", "py") is built
+
+
+def run_exported_tests(archive_data, folder):
+    """Run an exported project's tests the way `pytest --pdb` or IPython would:
+    with the standard library `code` module already imported"""
+    zipfile.ZipFile(io.BytesIO(archive_data)).extractall(folder)
+    runner = "import code, sys, pytest; sys.exit(pytest.main(['-q', '-p', 'no:cacheprovider', 'project/tests']))"
+    return subprocess.run([sys.executable, "-c", runner], cwd=folder, capture_output=True, text=True, timeout=60)
+
+
+def test_zip_tests_load_code_py_instead_of_the_stdlib_module(tmp_path):
+    artifact = exporters.get_artifact(new_result(), CODE, "ZIP with Tests", "py")
+    run = run_exported_tests(artifact['data'], str(tmp_path))
+    assert run.returncode == 0, run.stdout + run.stderr
+    assert "2 passed" in run.stdout
+
+
+def test_zip_tests_load_project_modules_from_their_package(tmp_path):
+    files = {
+        "app/__init__.py": "",
+        "app/models.py": "class Item:\n    pass\n",
+        "app/main.py": "from . import models\n\n\ndef make():\n    return models.Item()\n",
+    }
+    result = results.new_result(CODE, "A tiny app", prompts.resolve_settings({}), session="s", files=files)
+    artifact = exporters.get_artifact(result, CODE, "ZIP with Tests", "py")
+    run = run_exported_tests(artifact['data'], str(tmp_path))
+    assert run.returncode == 0, run.stdout + run.stderr
+    assert "5 passed" in run.stdout
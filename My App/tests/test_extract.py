@@ -0,0 +1,70 @@
+"""Tests for codegen.extract: the incremental fence extractor and output split"""
+
+from codegen import extract
+
+ANSWER = (
+    "Here is the function:\n"
+    "```python\n"
+    "def add(a, b):\n"
+    "    return a + b\n"
+    "```\n"
+    "Run it with:\n"
+    "```bash\n"
+    "python add.py\n"
+    "```\n"
+    "It adds two numbers.\n"
+)
+
+
+def test_chunking_does_not_change_the_segments():
+    whole = extract.extract(ANSWER)
+    for size in (1, 3, 7, 64):
+        extractor = extract.FenceExtractor()
+        for start in range(0, len(ANSWER), size):
+            extractor.feed(ANSWER[start:start + size])
+        assert extractor.finish() == whole
+
+
+def test_update_only_reads_the_new_part():
+    extractor = extract.FenceExtractor()
+    for end in range(1, len(ANSWER) + 1, 5):
+        extractor.update(ANSWER[:end])
+    extractor.update(ANSWER)
+    assert extractor.consumed == len(ANSWER)
+    assert extractor.finish() == extract.extract(ANSWER)
+
+
+def test_update_restarts_on_shorter_text():
+    extractor = extract.FenceExtractor()
+    extractor.update("```python\ndef old():\n")
+    extractor.update("")
+    extractor.update("```python\ndef new():\n    pass\n```\n")
+    assert extract.split_output(extractor.finish(), "Python")['code'] == "def new():\n    pass\n"
+
+
+def test_split_output_separates_code_extras_and_notes():
+    parts = extract.split_output(extract.extract(ANSWER), "Python")
+    assert parts['code'] == "def add(a, b):\n    return a + b\n"
+    assert parts['extras'] == [("bash", "python add.py\n")]
+    assert parts['notes'] == "Here is the function:\nRun it with:\nIt adds two numbers."
+
+
+def test_output_without_fences_is_all_code():
+    parts = extract.split_output(extract.extract("print('hi')\n"), "Python")
+    assert parts == {'code': "print('hi')\n", 'extras': [], 'notes': ""}
+
+
+def test_longer_fences_and_inner_backticks():
+    text = "````markdown\n```python\nx = 1\n```\n````\n"
+    segments = extract.extract(text)
+    assert [segment['kind'] for segment in segments] == ["code"]
+    assert segments[0]['language'] == "markdown"
+    assert segments[0]['text'] == "```python\nx = 1\n```\n"
+
+
+def test_live_code_while_streaming():
+    extractor = extract.FenceExtractor()
+    extractor.update("Intro\n```py\ndef f():\n    ret")
+    assert extractor.has_code()
+    assert extractor.code_so_far("Python") == "def f():\n    ret"
+    assert extractor.code_so_far("Go") == ""
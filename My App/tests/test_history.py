@@ -0,0 +1,53 @@
+"""Tests for codegen.history: dedupe, paging, favorites and search"""
+
+import time
+
+import pytest
+
+from codegen import history
+
+
+@pytest.fixture
+def store(tmp_path):
+    return history.HistoryStore(str(tmp_path / "history.db"))
+
+
+def test_identical_code_is_stored_once_and_moves_to_the_top(store):
+    first = store.add("u", "s1", "add numbers", "def add(a, b): return a + b", "Python", "Function")
+    store.add("u", "s1", "reverse text", "def rev(s): return s[::-1]", "Python", "Function")
+    time.sleep(0.01)
+    again = store.add("u", "s2", "sum two values", "def add(a, b): return a + b", "Python", "Function")
+
+    assert again == first
+    assert store.count("u") == 2
+    newest = store.page("u", limit=1)[0]
+    assert newest['id'] == first and newest['prompt'] == "sum two values"
+
+
+def test_dedupe_is_per_user(store):
+    store.add("u1", "s", "p", "same code", "Python", "Function")
+    store.add("u2", "s", "p", "same code", "Python", "Function")
+    assert store.count("u1") == store.count("u2") == 1
+
+
+def test_paging_and_favorites(store):
+    ids = [store.add("u", "s", f"prompt {i}", f"code {i}", "Go", "Script") for i in range(7)]
+    assert len(store.page("u", offset=0, limit=5)) == 5
+    assert len(store.page("u", offset=5, limit=5)) == 2
+    assert store.toggle_favorite("u", ids[3]) is True
+    assert [item['id'] for item in store.page("u", favorites_only=True)] == [ids[3]]
+    assert store.toggle_favorite("u", ids[3]) is False
+
+
+def test_search_matches_prompt_and_code_prefixes(store):
+    store.add("u", "s", "binary search tree", "class Node: pass", "Python", "Class")
+    store.add("u", "s", "http server", "import http.server", "Python", "Script")
+    assert [item['prompt'] for item in store.search("u", "binary sea")] == ["binary search tree"]
+    assert store.search("other", "binary") == []
+    assert store.search("u", "   ") == []
+
+
+def test_get_returns_the_code_only_to_its_user(store):
+    entry_id = store.add("u", "s", "p", "print(1)", "Python", "Script")
+    assert store.get("u", entry_id)['code'] == "print(1)"
+    assert store.get("someone else", entry_id) is None
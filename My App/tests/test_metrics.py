@@ -0,0 +1,93 @@
+"""Tests for codegen.metrics: one outcome per request, Prometheus text and the JSON log"""
+
+import json
+
+import pytest
+
+from codegen import backends, metrics, streaming
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    fresh = metrics.Metrics()
+    monkeypatch.setattr(metrics, "_metrics", fresh)
+    return fresh
+
+
+class BrokenStream(backends.StubBackend):
+    """Streams break after the first chunk; the blocking call answers or fails"""
+
+    def __init__(self, blocking_error=None):
+        super().__init__(chunk_size=8, fail_after_chunks=1)
+        self.blocking_error = blocking_error
+
+    def generate(self, prompt, model_name, generation_config=None):
+        if self.blocking_error:
+            raise self.blocking_error
+        return super().generate(prompt, model_name, generation_config)
+
+
+def samples(text, name):
+    """{labels: value} for every sample line of one metric"""
+    found = {}
+    for line in text.splitlines():
+        if line.startswith(name + "{"):
+            labels, value = line[len(name):].rsplit(" ", 1)
+            found[labels] = float(value)
+    return found
+
+
+def test_stream_retried_on_the_blocking_path_counts_once(registry):
+    result = streaming.generate(BrokenStream(), "prompt", "m", stream=True)
+    assert result['fallback'] and result['text']
+
+    assert dict(registry.calls) == {("m", "stub", "ok", ""): 1}
+    assert registry.latency["m"].count == 1
+    assert dict(registry.fallbacks) == {"m": 1}
+
+
+def test_failed_retry_counts_one_error(registry):
+    with pytest.raises(backends.BackendError):
+        streaming.generate(BrokenStream(backends.BackendError("quota")), "prompt", "m", stream=True)
+    assert dict(registry.calls) == {("m", "stub", "error", "BackendError"): 1}
+    assert registry.latency["m"].count == 1
+    assert registry.ttft["m"].count == 0
+
+
+def test_render_is_prometheus_text(registry):
+    registry.observe("m", "stub", 0.05, 0.3, prompt_tokens=100, output_tokens=300, finish_reason="STOP")
+    registry.observe("m", "stub", None, 1.5, error=backends.TransientBackendError("busy"), fallback=True)
+    text = registry.render()
+
+    assert text.endswith("\n")
+    assert "# TYPE codegen_model_latency_seconds histogram" in text
+    assert samples(text, "codegen_model_calls_total") == {
+        '{model="m",backend="stub",outcome="error",error="TransientBackendError"}': 1,
+        '{model="m",backend="stub",outcome="ok",error=""}': 1,
+    }
+    assert samples(text, "codegen_model_tokens_total") == {
+        '{model="m",kind="output"}': 300, '{model="m",kind="prompt"}': 100
+    }
+    assert samples(text, "codegen_model_stream_fallbacks_total") == {'{model="m"}': 1}
+    # Buckets are cumulative and end with +Inf holding the count
+    buckets = samples(text, "codegen_model_latency_seconds_bucket")
+    assert buckets['{model="m",le="0.25"}'] == 0
+    assert buckets['{model="m",le="0.5"}'] == 1
+    assert buckets['{model="m",le="+Inf"}'] == 2
+    assert samples(text, "codegen_model_latency_seconds_count") == {'{model="m"}': 2}
+    assert samples(text, "codegen_model_ttft_seconds_count") == {'{model="m"}': 1}
+
+
+def test_label_values_are_escaped(registry):
+    registry.observe('say "hi"\n', "stub", 0.1, 0.1)
+    assert 'model="say \\"hi\\"\\n"' in registry.render()
+
+
+def test_log_file_gets_one_json_line_per_request(registry, tmp_path):
+    path = tmp_path / "logs" / "metrics.jsonl"
+    registry.log_to_file(str(path))
+    streaming.generate(BrokenStream(), "prompt", "m", stream=True)
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1
+    record = json.loads(lines[0])
+    assert (record['model'], record['outcome'], record['fallback'], record['streamed']) == ("m", "ok", True, False)
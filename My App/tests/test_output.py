@@ -0,0 +1,65 @@
+"""Tests for components.output inside the app"""
+
+import pytest
+
+from codegen import analytics, backends, extract
+
+
+def failing_followups(prompt, model_name):
+    if prompt.startswith(("Explain this code", "Review this code", "Improve this code")):
+        raise backends.BackendError("quota exceeded")
+    return "```python\ndef f():\n    return 1\n```\n"
+
+
+def test_failed_follow_up_shows_an_error_instead_of_a_traceback(app_test):
+    at = app_test(backends.StubBackend(responder=failing_followups))
+    at.run()
+    at.text_area(key="prompt_input").input("a function returning one")
+    next(button for button in at.button if button.label == "🚀 Generate Code").click().run()
+    errors_before = analytics.get_analytics().errors
+
+    next(button for button in at.button if button.label == "🧠 Explain").click().run()
+
+    assert not at.exception
+    assert [error.value for error in at.error] == ["❌ Error: quota exceeded"]
+    assert any("Tips" in info.value for info in at.info)
+    assert analytics.get_analytics().errors == errors_before + 1
+    # The generated code is still shown
+    assert "def f():\n    return 1" in [block.value.strip() for block in at.code]
+
+
+class FakeArea:
+    """Records what an st.empty() placeholder was asked to draw"""
+
+    def __init__(self):
+        self.drawn = []
+
+    def code(self, body, language=None):
+        self.drawn.append(body)
+
+    def empty(self):
+        self.drawn.append(None)
+
+
+def test_live_code_redraws_at_most_once_per_interval(monkeypatch):
+    output = pytest.importorskip("components.output")
+    clock = [100.0]
+    monkeypatch.setattr(output.time, "monotonic", lambda: clock[0])
+    area = FakeArea()
+    extractor = extract.FenceExtractor()
+    show_chunk = output.live_code(area, extractor, "Python", interval=0.2)
+
+    text = "```python\n"
+    for i in range(50):
+        text += f"x{i} = {i}\n"
+        show_chunk(text)
+        clock[0] += 0.01
+    # Every chunk is parsed, but only one redraw per 0.2 s of streaming
+    assert extractor.consumed == len(text)
+    assert len(area.drawn) == 3
+    assert area.drawn[0] == "x0 = 0"
+
+    # A broken stream clears the code at once and the retry draws immediately
+    show_chunk("")
+    show_chunk("```python\ny = 1\n")
+    assert area.drawn[-2:] == [None, "y = 1"]
@@ -0,0 +1,34 @@
+"""Tests for components.profiler inside the app"""
+
+from codegen import backends
+
+
+def profile_panels(at):
+    return [block for block in at.expander if block.label.startswith("⏱️ Rerun profile")]
+
+
+def test_env_default_keeps_profiling_on_across_reruns(app_test, monkeypatch):
+    monkeypatch.setenv("CODEGEN_PROFILE", "1")
+    at = app_test(backends.StubBackend())
+    for _ in range(3):
+        at.run()
+        assert not at.exception
+        assert profile_panels(at)
+
+
+def test_profiling_is_off_by_default(app_test, monkeypatch):
+    monkeypatch.delenv("CODEGEN_PROFILE", raising=False)
+    at = app_test(backends.StubBackend())
+    at.run()
+    at.run()
+    assert not profile_panels(at)
+
+
+def test_panel_breaks_the_rerun_down_by_section(app_test, monkeypatch):
+    monkeypatch.setenv("CODEGEN_PROFILE", "1")
+    at = app_test(backends.StubBackend())
+    at.run()
+    table = profile_panels(at)[0].dataframe[0].value
+    assert list(table.columns) == ["Section", "Wall time (ms)"]
+    assert {"page", "header", "sidebar"} <= set(table["Section"])
+    assert table["Section"].iloc[-1] == "total"
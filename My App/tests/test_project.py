@@ -0,0 +1,85 @@
+"""Tests for codegen.project: manifest parsing and the planned fan-out"""
+
+import threading
+
+import pytest
+
+from codegen import backends, gateway, project, resilience
+from conftest import PROJECT_FILES, project_responder
+
+SETTINGS = {'language': "Python", 'code_type': "Full Program", 'multi_file': True}
+
+
+def test_parse_manifest_drops_unsafe_and_duplicate_paths():
+    text = """```json
+    {"files": [{"path": "app/main.py"}, {"path": "../etc/passwd"}, {"path": "/abs.py"},
+               {"path": "app/./main.py"}, {"path": "app/util.py", "purpose": "helpers"}]}
+    ```"""
+    entries = project.parse_manifest(text)
+    assert [entry['path'] for entry in entries] == ["app/main.py", "app/util.py"]
+    assert entries[1]['purpose'] == "helpers"
+
+
+def test_parse_manifest_rejects_answers_without_files():
+    with pytest.raises(project.ProjectPlanError):
+        project.parse_manifest("I would split this into two files.")
+    with pytest.raises(project.ProjectPlanError):
+        project.parse_manifest('{"files": []}')
+
+
+def test_file_prompts_name_the_file_role_not_the_project_type():
+    entries = [{'path': path, 'purpose': "", 'interface': ""}
+               for path in ("app/main.py", "tests/test_main.py", "config.toml")]
+    code_types = [
+        project.file_prompt("A todo app", SETTINGS, entries, entry)['text'].split("Code Type: ")[1].splitlines()[0]
+        for entry in entries
+    ]
+    assert code_types == ["Source File", "Test File", "Configuration File"]
+
+
+def test_generate_project_through_gateway_workers():
+    backend = backends.StubBackend(responder=project_responder)
+    gw = gateway.get_gateway()
+    session_id = "session-1"
+    threads = set()
+
+    def call_part(part_prompt, part_config, part_tokens):
+        # Same shape as main.py: plain values only, no Streamlit state in workers
+        threads.add(threading.current_thread().name)
+        return resilience.generate(
+            lambda model, is_hedge: gw.generate(
+                backend, part_prompt, model, part_config,
+                session=session_id, prompt_tokens=part_tokens, coalesce=not is_hedge
+            ),
+            "gemini-1.5-flash"
+        )
+
+    progress = []
+    planned = project.generate_project(
+        call_part, "A todo app", SETTINGS, workers=2,
+        on_file=lambda path, done, total: progress.append((done, total))
+    )
+
+    assert planned['failed'] == {}
+    assert list(planned['files']) == list(PROJECT_FILES)
+    assert planned['files']["app/models.py"] == "# contents of app/models.py\nVALUE = 1\n"
+    assert progress == [(1, 2), (2, 2)]
+    assert backend.calls == 1 + len(PROJECT_FILES)
+    assert len(threads) > 1  # the files were generated off the calling thread
+
+
+def test_project_request_end_to_end(app_test):
+    backend = backends.StubBackend(responder=project_responder)
+    at = app_test(backend)
+    at.run()
+    next(radio for radio in at.radio if radio.label == "Select what to generate:").set_value("Full Program")
+    at.text_area(key="prompt_input").input("A todo app with a data model")
+    next(button for button in at.button if button.label == "🚀 Generate Code").click().run()
+
+    assert not at.exception
+    assert not [warning.value for warning in at.warning if "Could not generate" in warning.value]
+    # One planning call plus one call per file, never the single-call fallback
+    assert backend.calls == 1 + len(PROJECT_FILES)
+    shown = "\n".join(block.value for block in at.code)
+    for path in PROJECT_FILES:
+        assert f"===== {path} =====" in shown
@@ -0,0 +1,53 @@
+"""Tests for codegen.prompts: prompt text, generation config and the token budget"""
+
+import pytest
+
+from codegen import prompts
+
+
+def test_prompt_carries_the_settings():
+    built = prompts.build_prompt("parse a date", {
+        'language': "Go", 'framework': "Gin", 'libraries': ["time"], 'include_tests': True,
+        'code_style': "Google", 'indent_style': "Tabs", 'temperature': 0.3, 'max_tokens': 1024
+    })
+    text = built['text']
+    assert text.startswith("Generate Go code for the following requirement:\n\nparse a date")
+    for expected in ("Framework: Gin", "Required Libraries: time", "- unit tests",
+                     "Follow Google style guidelines.", "Indent with tabs."):
+        assert expected in text
+    assert built['generation_config'] == {'temperature': 0.3, 'max_output_tokens': 1024}
+    # Head, requirement and tail are estimated separately, so rounding may differ by one each
+    assert abs(built['prompt_tokens'] - prompts.estimate_tokens(text)) <= 2
+    assert not built['trimmed']
+
+
+def test_defaults_fill_missing_settings():
+    assert "Code Type: Function" in prompts.build_prompt("x", {})['text']
+    assert "Framework:" not in prompts.build_prompt("x", {})['text']
+
+
+def test_oversize_requirement_is_trimmed_to_the_budget():
+    requirement = "word " * 500  # about 625 tokens
+    built = prompts.build_prompt(requirement, {'max_tokens': 512})
+    assert built['trimmed']
+    assert built['prompt_tokens'] <= 512
+    assert built['text'].count(prompts.TRIM_MARKER.strip()) == 1
+
+
+def test_far_oversize_requirement_is_rejected():
+    with pytest.raises(prompts.PromptTooLarge) as caught:
+        prompts.build_prompt("word " * 2000, {'max_tokens': 512})
+    assert caught.value.budget == 512 and caught.value.tokens > 1024
+
+
+def test_trim_can_be_turned_off():
+    with pytest.raises(prompts.PromptTooLarge):
+        prompts.build_prompt("word " * 500, {'max_tokens': 512}, trim=False)
+
+
+def test_count_tokens_falls_back_to_the_estimate():
+    class Broken:
+        def count_tokens(self, text, model_name):
+            raise RuntimeError("offline")
+
+    assert prompts.count_tokens("abcdefgh", Broken(), "m") == 2
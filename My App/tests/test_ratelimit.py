@@ -0,0 +1,88 @@
+"""Tests for codegen.ratelimit: token buckets, fair queuing and single-flight"""
+
+import threading
+import time
+
+import pytest
+
+from codegen import ratelimit
+
+
+def test_token_bucket_bursts_then_refuses():
+    bucket = ratelimit.TokenBucket(rate=1.0, capacity=3)
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+    assert 0 < bucket.delay() <= 1.0
+
+
+def test_token_bucket_debit_goes_into_debt():
+    bucket = ratelimit.TokenBucket(rate=10.0, capacity=10)
+    bucket.debit(15)
+    assert bucket.delay(1) == pytest.approx(0.6, abs=0.05)
+
+
+def test_fair_limiter_alternates_sessions():
+    # One request per 0.2 s: everything after the first grant queues for its turn
+    limiter = ratelimit.FairLimiter(requests_per_minute=60)
+    limiter.requests = ratelimit.TokenBucket(rate=5.0, capacity=1)
+    order = []
+    lock = threading.Lock()
+
+    def request(session):
+        limiter.acquire(session)
+        with lock:
+            order.append(session)
+
+    def start(session):
+        thread = threading.Thread(target=request, args=(session,))
+        thread.start()
+        time.sleep(0.03)
+        return thread
+
+    threads = [start("busy") for _ in range(4)] + [start("quiet")]
+    for thread in threads:
+        thread.join(5)
+
+    # The quiet session is served right after the busy session's next request
+    assert order == ["busy", "busy", "quiet", "busy", "busy"]
+    assert limiter.stats()['granted'] == 5
+    assert limiter.stats()['queue_depth'] == 0
+
+
+def test_single_flight_shares_one_call():
+    flights = ratelimit.SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "answer"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flights.do("k", slow)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flights.do("k", slow))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert sorted(results) == [("answer", False)] + [("answer", True)] * 3
+    assert flights.coalesced == 3 and flights.in_flight() == 0
+
+
+def test_single_flight_shares_errors_and_forgets_them():
+    flights = ratelimit.SingleFlight()
+
+    def failing():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        flights.do("k", failing)
+    assert flights.do("k", lambda: "next") == ("next", False)
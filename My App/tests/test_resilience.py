@@ -0,0 +1,74 @@
+"""Tests for codegen.resilience: retries, fallbacks, the cache tier and hedging"""
+
+import random
+import time
+
+import pytest
+
+from codegen import backends, resilience
+
+
+def no_sleep(seconds):
+    pass
+
+
+def flaky(failures, error=backends.TransientBackendError):
+    """A call that fails `failures[model]` times per model, then answers"""
+    calls = []
+
+    def call(model, is_hedge):
+        calls.append(model)
+        if failures.get(model, 0) > calls.count(model) - 1:
+            raise error(f"{model} failed")
+        return {'text': f"from {model}"}
+
+    return call, calls
+
+
+def test_retries_then_succeeds():
+    call, calls = flaky({"m": 2})
+    result = resilience.generate(call, "m", fallbacks=[], attempts=3, sleep=no_sleep)
+    assert result['tier'] == "retry" and result['attempts'] == 3 and result['served_by'] == "m"
+
+
+def test_falls_back_to_the_next_model():
+    call, calls = flaky({"m": 5})
+    result = resilience.generate(call, "m", fallbacks=["backup"], attempts=2, sleep=no_sleep)
+    assert result['tier'] == "fallback" and result['text'] == "from backup"
+    assert calls == ["m", "m", "backup"]
+
+
+def test_non_retryable_errors_skip_to_the_fallback():
+    call, calls = flaky({"m": 5}, error=ValueError)
+    result = resilience.generate(call, "m", fallbacks=["backup"], attempts=3, sleep=no_sleep)
+    assert calls == ["m", "backup"] and result['tier'] == "fallback"
+
+
+def test_cached_answer_is_the_last_tier():
+    call, _ = flaky({"m": 5, "backup": 5})
+    result = resilience.generate(
+        call, "m", fallbacks=["backup"], attempts=1, sleep=no_sleep,
+        cached=lambda model: "old answer" if model == "backup" else None
+    )
+    assert result['tier'] == "cache" and result['text'] == "old answer"
+
+
+def test_raises_the_last_error_without_a_cache():
+    call, _ = flaky({"m": 5})
+    with pytest.raises(backends.TransientBackendError):
+        resilience.generate(call, "m", fallbacks=[], attempts=2, sleep=no_sleep)
+
+
+def test_backoff_is_bounded_full_jitter():
+    rng = random.Random(1)
+    delays = [resilience.backoff_delay(attempt, 0.5, 4.0, rng) for attempt in range(10) for _ in range(20)]
+    assert all(0 <= delay <= 4.0 for delay in delays)
+
+
+def test_hedge_wins_when_the_first_call_is_slow():
+    def call(model, is_hedge):
+        time.sleep(0.01 if is_hedge else 0.5)
+        return {'text': "hedge" if is_hedge else "primary"}
+
+    result = resilience.generate(call, "hedge-test", fallbacks=[], hedge=True, hedge_after=0.05)
+    assert result['tier'] == "hedge" and result['text'] == "hedge"
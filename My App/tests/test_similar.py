@@ -0,0 +1,86 @@
+"""Tests for codegen.similar: normalization, scope and the MinHash/LSH index"""
+
+import pytest
+
+from codegen import prompts, similar
+
+PROMPT = "Write a function to reverse a linked list"
+REWORDED = "reverse linked list function in python"
+
+
+def test_normalize_drops_stop_words_language_and_plurals():
+    assert similar.normalize("Please write Python classes that sort lists", "Python") == ["sort", "list"]
+
+
+def test_normalize_keeps_verbs_negations_and_order():
+    assert similar.normalize("Write to a CSV file") == ["write", "csv", "file"]
+    assert similar.normalize("a number that isn't prime") == ["number", "not", "prime"]
+    assert similar.normalize("convert celsius to fahrenheit") == ["convert", "celsius", "fahrenheit"]
+
+
+def test_rewording_is_found():
+    index = similar.SimilarIndex()
+    index.add(PROMPT, {'language': "Python"}, "def reverse(head): ...")
+    match = index.lookup(REWORDED, {'language': "Python"})
+    assert match is not None and match['text'] == "def reverse(head): ..."
+    assert match['similarity'] >= index.threshold
+    assert index.lookup("connect to a postgres database", {'language': "Python"}) is None
+
+
+@pytest.mark.parametrize("stored, asked", [
+    ("Write a function to convert fahrenheit to celsius", "Write a function to convert celsius to fahrenheit"),
+    ("Check whether a number is not prime", "Check whether a number is prime"),
+    ("Write a function that reads a CSV file and skips rows that are not valid",
+     "Write a function that reads a CSV file and skips rows that are valid"),
+    ("Implement a binary search tree", "Implement binary search"),
+    ("Write a function to read a CSV file", "Write a function to write to a CSV file"),
+    ("read a CSV file", "write to a CSV file"),
+])
+def test_different_requests_are_not_reused(stored, asked):
+    index = similar.SimilarIndex()
+    index.add(stored, {}, "stored answer")
+    assert index.lookup(asked, {}) is None
+    assert index.lookup(stored, {})['text'] == "stored answer"
+
+
+def test_short_prompts_need_enough_shared_shingles():
+    index = similar.SimilarIndex(threshold=0.0)
+    index.add("parse json", {}, "answer")
+    assert index.lookup("parse json", {}) is None
+
+
+def test_reuse_is_off_by_default():
+    assert prompts.resolve_settings({})['reuse_similar'] is False
+
+
+@pytest.mark.parametrize("setting, value", [
+    ('language', "Go"),
+    ('code_type', "Class"),
+    ('framework', "Flask"),
+    ('libraries', ["numpy"]),
+    ('include_tests', True),
+    ('code_style', "Google"),
+    ('indent_style', "Tabs"),
+    ('model_version', "gemini-1.5-pro"),
+    ('temperature', 0.2),
+    ('max_tokens', 4096)
+])
+def test_answers_are_not_shared_across_prompt_settings(setting, value):
+    index = similar.SimilarIndex()
+    index.add(PROMPT, {}, "answer")
+    assert index.lookup(PROMPT, {}) is not None
+    assert similar.scope_of({setting: value}) != similar.scope_of({})
+    assert index.lookup(PROMPT, {setting: value}) is None
+
+
+def test_scope_ignores_settings_that_do_not_change_the_answer():
+    assert similar.scope_of({'export_format': "ZIP with Tests", 'streaming': True}) == similar.scope_of({})
+
+
+def test_index_is_bounded():
+    index = similar.SimilarIndex(max_entries=2)
+    for topic in ("reverse a linked list", "parse a csv file", "merge two sorted arrays"):
+        index.add(topic, {}, topic)
+    assert index.stats()['size'] == 2
+    assert index.lookup("reverse a linked list", {}) is None
+    assert index.lookup("merge two sorted arrays", {})['text'] == "merge two sorted arrays"
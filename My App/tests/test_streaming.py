@@ -0,0 +1,108 @@
+"""Tests for codegen.streaming: chunk delivery and the blocking fallback"""
+
+import itertools
+import time
+
+from codegen import backends, extract, streaming
+
+FIRST = "Sure:\n```python\ndef alpha():\n    return x\n```\n"
+RETRIED = "Here you go:\n```python\ndef beta(values):\n    return sorted(values)\n```\nDone.\n"
+
+
+class ChunkedBackend(backends.Backend):
+    """Fake backend streaming fixed chunks with a pause before each one"""
+
+    name = "chunked"
+
+    def __init__(self, chunks, pause=0.0):
+        self.chunks = chunks
+        self.pause = pause
+        self.generate_calls = 0
+
+    def generate(self, prompt, model_name, generation_config=None):
+        self.generate_calls += 1
+        return "".join(self.chunks)
+
+    def stream(self, prompt, model_name, generation_config=None):
+        for chunk in self.chunks:
+            time.sleep(self.pause)
+            yield chunk
+
+
+CHUNKS = ["```python\n", "def f():\n", "", "    return 1\n", "```\n"]
+
+
+def test_stream_hands_over_each_chunk_as_it_arrives():
+    backend = ChunkedBackend(CHUNKS, pause=0.02)
+    seen = []
+    result = streaming.generate(backend, "p", "m", stream=True, on_chunk=seen.append)
+    assert seen == ["```python\n", "```python\ndef f():\n", "```python\ndef f():\n    return 1\n", "".join(CHUNKS)]
+    assert result['streamed'] and result['chunks'] == 4 and result['text'] == "".join(CHUNKS)
+    assert result['ttft'] < result['latency']
+    assert backend.generate_calls == 0
+
+
+def test_stream_off_makes_one_blocking_call():
+    backend = ChunkedBackend(CHUNKS)
+    seen = []
+    result = streaming.generate(backend, "p", "m", stream=False, on_chunk=seen.append)
+    assert seen == ["".join(CHUNKS)]
+    assert not result['streamed'] and result['ttft'] == result['latency']
+    assert backend.generate_calls == 1
+
+
+def test_stream_output_toggle_in_the_app(app_test):
+    at = app_test(ChunkedBackend(CHUNKS))
+    at.run()
+    next(box for box in at.checkbox if box.label == "Stream Output").check()
+    at.text_area(key="prompt_input").input("a function returning one")
+    next(button for button in at.button if button.label == "🚀 Generate Code").click().run()
+    assert not at.exception
+    assert "def f():\n    return 1" in [block.value.strip() for block in at.code]
+
+
+def changing_responder():
+    """The stream gets FIRST, the blocking retry a longer, different RETRIED"""
+    answers = itertools.chain([FIRST], itertools.repeat(RETRIED))
+    return lambda prompt, model_name: next(answers)
+
+
+def test_chunks_accumulate():
+    backend = backends.StubBackend(chunk_size=7, responder=lambda prompt, model_name: RETRIED)
+    seen = []
+    result = streaming.generate(backend, "p", "m", stream=True, on_chunk=seen.append)
+    assert result['streamed'] and not result['fallback']
+    assert seen[-1] == RETRIED == result['text']
+    assert all(seen[i + 1].startswith(seen[i]) for i in range(len(seen) - 1))
+
+
+def test_broken_stream_restarts_consumers():
+    backend = backends.StubBackend(chunk_size=10, fail_after_chunks=2, responder=changing_responder())
+    seen = []
+    result = streaming.generate(backend, "p", "m", stream=True, on_chunk=seen.append)
+    assert result['fallback'] and result['text'] == RETRIED
+    assert seen == [FIRST[:10], FIRST[:20], "", RETRIED]
+
+
+def test_extractor_follows_the_retried_answer():
+    backend = backends.StubBackend(chunk_size=10, fail_after_chunks=3, responder=changing_responder())
+    extractor = extract.FenceExtractor()
+    result = streaming.generate(backend, "p", "m", stream=True, on_chunk=extractor.update)
+    assert extractor.consumed == len(result['text'])
+    parts = extract.split_output(extractor.finish(), "Python")
+    assert parts['code'] == "def beta(values):\n    return sorted(values)\n"
+    assert parts['notes'] == "Here you go:\nDone."
+
+
+def test_broken_stream_in_the_app_shows_the_retried_answer(app_test):
+    backend = backends.StubBackend(chunk_size=10, fail_after_chunks=3, responder=changing_responder())
+    at = app_test(backend)
+    at.run()
+    next(box for box in at.checkbox if box.label == "Stream Output").check()
+    at.text_area(key="prompt_input").input("sort some values")
+    next(button for button in at.button if button.label == "🚀 Generate Code").click().run()
+
+    assert not at.exception
+    shown = [block.value.strip() for block in at.code]
+    assert "def beta(values):\n    return sorted(values)" in shown
+    assert not [code for code in shown if "alpha" in code]
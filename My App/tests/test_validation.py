@@ -0,0 +1,76 @@
+"""Tests for codegen.validation: the checks and the background pool"""
+
+import sys
+import time
+import types
+from collections import OrderedDict
+
+import pytest
+
+from codegen import validation
+
+
+@pytest.fixture
+def fresh_pool(monkeypatch):
+    monkeypatch.setattr(validation, "_executor", None)
+    monkeypatch.setattr(validation, "_results", OrderedDict())
+    yield
+    if validation._executor is not None:
+        validation._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def test_check_python_reports_the_failing_line():
+    assert validation.check_python("def f():\n    return 1\n", "a.py")['status'] == "pass"
+    check = validation.check_python("def f(:\n    pass\n", "a.py")
+    assert check['status'] == "fail" and "line 1" in check['detail']
+
+
+def test_check_sql_warns_on_unknown_tables():
+    assert validation.check_sql("CREATE TABLE t (id INTEGER);\nSELECT id FROM t;", "q.sql")['status'] == "pass"
+    assert validation.check_sql("SELECT id FROM missing;", "q.sql")['status'] == "warn"
+
+
+def test_check_html_finds_unclosed_tags():
+    assert validation.check_html("<div><span>x</span></div>", "i.html")['status'] == "pass"
+    assert validation.check_html("<div><section>x</div>", "i.html")['status'] == "warn"
+
+
+def test_wait_with_zero_timeout_never_blocks(fresh_pool, monkeypatch):
+    monkeypatch.setenv("CODEGEN_RUN_TESTS", "1")
+    files = [("code.py", "import time\ntime.sleep(0)\n\ndef test_slow():\n    time.sleep(3)\n")]
+    key = validation.submit(files, run_tests_too=True)
+    start = time.monotonic()
+    checks = validation.wait(key, timeout=0)
+    assert time.monotonic() - start < 0.5
+    assert {check['name']: check['status'] for check in checks}['tests'] == "skip"
+    assert not validation.peek(key)
+
+
+def test_workers_do_not_rerun_the_main_script(fresh_pool, tmp_path, monkeypatch):
+    # Under Streamlit, __main__ is the app script; a worker must not execute it
+    marker = tmp_path / "main-ran"
+    script = tmp_path / "app.py"
+    script.write_text(f"open({str(marker)!r}, 'w').close()\nraise SystemExit('app script ran in a worker')\n")
+    app_main = types.ModuleType("__main__")
+    app_main.__file__ = str(script)
+    monkeypatch.setitem(sys.modules, "__main__", app_main)
+
+    key = validation.submit([("code.py", "x = 1\n")])
+    assert sys.modules["__main__"] is app_main
+    checks = validation.wait(key, timeout=60)
+    assert [check['status'] for check in checks] == ["pass"]
+    assert not marker.exists()
+
+
+def test_generated_tests_only_run_when_allowed(fresh_pool, tmp_path, monkeypatch):
+    marker = tmp_path / "tests-ran"
+    files = [("code.py", f"def test_touch():\n    open({str(marker)!r}, 'w').close()\n")]
+    monkeypatch.delenv("CODEGEN_RUN_TESTS", raising=False)
+    checks = validation.wait(validation.submit(files, run_tests_too=True), timeout=60)
+    assert {check['name']: check['status'] for check in checks} == {"code.py: syntax": "pass", "tests": "skip"}
+    assert not marker.exists()
+
+    monkeypatch.setenv("CODEGEN_RUN_TESTS", "1")
+    checks = validation.wait(validation.submit(files, run_tests_too=True), timeout=60)
+    assert {check['name']: check['status'] for check in checks}["tests"] == "pass"
+    assert marker.exists()
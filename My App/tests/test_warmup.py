@@ -0,0 +1,19 @@
+"""Tests for codegen.warmup"""
+
+from codegen import backends, prompts, warmup
+
+
+def test_start_is_opt_in(monkeypatch):
+    monkeypatch.delenv("CODEGEN_WARMUP", raising=False)
+    monkeypatch.setattr(warmup, "_thread", None)
+    warmup.start(backends.StubBackend())
+    assert warmup._thread is None
+
+
+def test_warm_skips_templates_already_cached():
+    backend = backends.StubBackend()
+    first = warmup.warm(backend, ["Python"], workers=2)
+    assert first == {'warmed': len(prompts.TEMPLATES), 'skipped': 0, 'failed': 0}
+    second = warmup.warm(backend, ["Python"], workers=2)
+    assert second == {'warmed': 0, 'skipped': len(prompts.TEMPLATES), 'failed': 0}
+    assert backend.calls == len(prompts.TEMPLATES)